@@ -0,0 +1,186 @@
+// covviz charts: the plots of the areas, drawn in the browser as SVG, instead of shipping one PNG per area.
+// The data comes from one small JSON per area, written by dataPlotting.write_all_chart_data(), e.g.
+//
+//     <div class="covviz-chart" data-src="../pics/charts/Kreis_05370.json"></div>
+//     <script type="text/javascript" src="charts.js"></script>
+//
+// All such elements get drawn when they scroll into view. Elements added later: covvizCharts(parentElement),
+// see choice.html with charts=1, which makes them with covvizChartPlaceholder() instead of its images.
+
+const COVVIZ_W = 1000, COVVIZ_H = 600;
+const COVVIZ_MARGIN = {left: 80, right: 150, top: 40, bottom: 60};
+// incidence borders #1…6, the same colors and dashes as in dataPlotting.INCIDENCE_BORDER_STYLES
+const COVVIZ_BORDERS = [["#e68f73", "2,7"], ["#db7b63", "3,6"], ["#d16654", "4,5"],
+                        ["#c74132", "4,3"], ["#bd241c", "6,3"], ["#b20909", "7,1"]];
+const COVVIZ_INCIDENCE = "#2020D0", COVVIZ_CUMULATIVE = "#50C0FF", COVVIZ_DAILY = "#B0B0B0",
+      COVVIZ_RED = "#FF8080", COVVIZ_ROLLING = "#FFD010", COVVIZ_RED_DAYS = 5;
+
+let covvizCount = 0; // for unique ids of the gradients, with many charts on one page
+
+function covvizEscape(text) {
+	return String(text).replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/>/g, "&gt;").replace(/"/g, "&quot;");
+}
+
+function covvizDates(data) {
+	// consecutive days from data.start, unless the JSON lists the dates explicitly
+	if (data.dates) {
+		return data.dates.map((d) => new Date(d));
+	}
+	const start = new Date(data.start);
+	return data.cumulative.map((_, i) => new Date(start.getTime() + i * 86400000));
+}
+
+function covvizNiceStep(max, ticks) {
+	// step of about `ticks` ticks up to max, rounded to 1, 2, 5 times a power of ten, at least 1
+	const raw = Math.max(max, 1) / ticks,
+	      power = Math.pow(10, Math.floor(Math.log10(raw))),
+	      step = [1, 2, 5, 10].map((m) => m * power).find((s) => s >= raw);
+	return Math.max(1, step);
+}
+
+function covvizPath(values, x, y) {
+	let path = "", pen = "M";
+	values.forEach((v, i) => {
+		if (v === null || v === undefined || isNaN(v)) {
+			pen = "M";
+		} else {
+			path += pen + x(i).toFixed(1) + "," + y(v).toFixed(1);
+			pen = "L";
+		}
+	});
+	return path;
+}
+
+function covvizChartSVG(data) {
+	const n = data.cumulative.length,
+	      m = COVVIZ_MARGIN, w = COVVIZ_W - m.left - m.right, h = COVVIZ_H - m.top - m.bottom,
+	      dates = covvizDates(data),
+	      x = (i) => m.left + (n > 1 ? i / (n - 1) : 0) * w;
+
+	// y axes: daily cases (left), incidence (right), cumulative (right, further out)
+	const dailyMax = Math.max(1, ...data.daily.slice(1)) * 1.2,
+	      incidenceMax = Math.max(1, ...data.incidence),
+	      borders = data.limits, // [number, per 100k, in cases] of the incidence borders which are shown
+	      incidenceTop = Math.max(incidenceMax, borders[borders.length - 1][1]) * 1.2,
+	      cumulativeTop = Math.max(1, data.cumulative[n - 1]) * 1.02;
+	const yDaily = (v) => m.top + h - v / dailyMax * h,
+	      yIncidence = (v) => m.top + h - v / incidenceTop * h,
+	      yCumulative = (v) => m.top + h - v / cumulativeTop * h;
+
+	let svg = `<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 ${COVVIZ_W} ${COVVIZ_H}" font-family="sans-serif" font-size="12">`;
+
+	// background gradient, indicating the prevalence relative to the maximum of all areas of the same type
+	const share = Math.min(1, data.prevalence_100k / Math.max(data.max_overall_prevalence_100k, 1e-9)),
+	      bg = data.district ? "#f03b20" : "#de2d26", gradient = "covviz-gradient-" + (covvizCount++);
+	if (data.gradient) {
+		svg += `<defs><linearGradient id="${gradient}" x1="0" y1="1" x2="0" y2="0"><stop offset="0" stop-color="${bg}" stop-opacity="0"/>` +
+		       `<stop offset="1" stop-color="${bg}" stop-opacity="${(0.4 * share).toFixed(3)}"/></linearGradient></defs>` +
+		       `<rect x="${m.left}" y="${m.top}" width="${w}" height="${h}" fill="url(#${gradient})"/>`;
+	}
+
+	// month starts as x grid, every 5th day as minor grid
+	dates.forEach((d, i) => {
+		if (d.getUTCDate() === 1) {
+			svg += `<line x1="${x(i)}" x2="${x(i)}" y1="${m.top}" y2="${m.top + h}" stroke="#bbb"/>`;
+			const label = String(d.getUTCMonth() + 1).padStart(2, "0") + "/" + d.getUTCFullYear();
+			svg += `<text transform="translate(${x(i)},${m.top + h + 12}) rotate(40)">${label}</text>`;
+		} else if (d.getUTCDate() % 5 === 1) {
+			svg += `<line x1="${x(i)}" x2="${x(i)}" y1="${m.top}" y2="${m.top + h}" stroke="#ddd" stroke-dasharray="3,3"/>`;
+		}
+	});
+
+	// incidence grid and axis (right), daily axis (left), cumulative axis (right, outer)
+	const incidenceStep = covvizNiceStep(incidenceTop, 6), dailyStep = covvizNiceStep(dailyMax, 6), cumulativeStep = covvizNiceStep(cumulativeTop, 6);
+	for (let v = 0; v <= incidenceTop; v += incidenceStep) {
+		svg += `<line x1="${m.left}" x2="${m.left + w}" y1="${yIncidence(v)}" y2="${yIncidence(v)}" stroke="${COVVIZ_INCIDENCE}" stroke-opacity="0.3"/>`;
+		svg += `<text x="${m.left + w + 6}" y="${yIncidence(v) + 4}" fill="${COVVIZ_INCIDENCE}">${v.toLocaleString("en")}</text>`;
+	}
+	for (let v = 0; v <= dailyMax; v += dailyStep) {
+		svg += `<text x="${m.left - 6}" y="${yDaily(v) + 4}" text-anchor="end">${v.toLocaleString("en")}</text>`;
+	}
+	for (let v = 0; v <= cumulativeTop; v += cumulativeStep) {
+		svg += `<text x="${m.left + w + 70}" y="${yCumulative(v) + 4}" fill="${COVVIZ_CUMULATIVE}">${v.toLocaleString("en")}</text>`;
+	}
+	svg += `<rect x="${m.left}" y="${m.top}" width="${w}" height="${h}" fill="none" stroke="#000"/>`;
+
+	// rolling mean (filled), raw daily cases (last days red), cumulative (dotted), incidence (with yellow background)
+	const rolling = covvizPath(data.rolling_mean14, x, yDaily);
+	if (rolling) {
+		const first = data.rolling_mean14.findIndex((v) => v !== null), last = n - 1 - [...data.rolling_mean14].reverse().findIndex((v) => v !== null);
+		svg += `<path d="${rolling}L${x(last)},${yDaily(0)}L${x(first)},${yDaily(0)}Z" fill="${COVVIZ_ROLLING}" fill-opacity="0.5"/>`;
+		svg += `<path d="${rolling}" fill="none" stroke="${COVVIZ_ROLLING}" stroke-width="3"/>`;
+	}
+	svg += `<path d="${covvizPath(data.daily, x, yDaily)}" fill="none" stroke="${COVVIZ_DAILY}"/>`;
+	svg += `<path d="${covvizPath(data.daily.map((v, i) => i >= n - COVVIZ_RED_DAYS ? v : null), x, yDaily)}" fill="none" stroke="${COVVIZ_RED}"/>`;
+	svg += `<path d="${covvizPath(data.cumulative, x, yCumulative)}" fill="none" stroke="${COVVIZ_CUMULATIVE}" stroke-width="2" stroke-dasharray="2,3"/>`;
+	const incidence = covvizPath(data.incidence, x, yIncidence);
+	svg += `<path d="${incidence}" fill="none" stroke="yellow" stroke-opacity="0.4" stroke-width="7"/>`;
+	svg += `<path d="${incidence}" fill="none" stroke="${COVVIZ_INCIDENCE}" stroke-width="1.5"/>`;
+
+	// incidence borders, the 1st one always, the higher ones only if nearly reached
+	borders.forEach((limit) => {
+		const [color, dashes] = COVVIZ_BORDERS[limit[0] - 1];
+		svg += `<line x1="${m.left}" x2="${m.left + w}" y1="${yIncidence(limit[1])}" y2="${yIncidence(limit[1])}" stroke="${color}" stroke-width="1.5" stroke-dasharray="${dashes}"/>`;
+	});
+
+	// marker for the 'expectation day'
+	const cx = x(Math.round(data.center)), cy = m.top + h - 4;
+	svg += `<path d="M${cx - 8},${cy - 14}L${cx + 8},${cy - 14}L${cx},${cy}Z" fill="green"/>`;
+
+	// title, and legend
+	svg += `<text x="${m.left + w / 2}" y="${m.top - 12}" text-anchor="middle" font-size="15">${covvizEscape(data.title)}</text>`;
+	const legend = [["green", `marker for 'expectation day': ${data.center_date}`],
+	                [COVVIZ_CUMULATIVE, "cumulative total cases reported at RiskLayer"],
+	                [COVVIZ_DAILY, `raw daily cases (weekend-flawed), red: last ${COVVIZ_RED_DAYS}`],
+	                [COVVIZ_ROLLING, "centered moving average, 14 days cases"],
+	                [COVVIZ_INCIDENCE, "Inicid. per 100k pop. for prior 7 days of date"]]
+	                .concat(borders.slice().reverse().map((limit) => [COVVIZ_BORDERS[limit[0] - 1][0],
+	                        `incid. border ${limit[1]}/week/100k pop.: ${limit[2].toLocaleString("en", {minimumFractionDigits: 2, maximumFractionDigits: 2})}`]));
+	svg += `<rect x="${m.left + 8}" y="${m.top + 8}" width="330" height="${34 + legend.length * 15}" fill="#fafafa" fill-opacity="0.7" stroke="#ccc"/>`;
+	svg += `<text x="${m.left + 16}" y="${m.top + 22}" font-size="10">source data: ©RiskLayer up to ${data.source_up_to} – plot: ${data.generated}</text>`;
+	legend.forEach(([color, text], i) => {
+		const ly = m.top + 40 + i * 15;
+		svg += `<line x1="${m.left + 16}" x2="${m.left + 40}" y1="${ly - 4}" y2="${ly - 4}" stroke="${color}" stroke-width="3"/>`;
+		svg += `<text x="${m.left + 46}" y="${ly}" font-size="10">${covvizEscape(text)}</text>`;
+	});
+	return svg + "</svg>";
+}
+
+function covvizChart(element) {
+	const src = element.getAttribute("data-src");
+	fetch(src)
+		.then((response) => response.json())
+		.then((data) => { element.innerHTML = covvizChartSVG(data); })
+		.catch((error) => { console.log("could not draw chart", src, error); element.textContent = "(no chart data: " + src + ")"; });
+}
+
+function covvizChartPlaceholder() {
+	// stands in for a `new Image()` (see choice.html): setting its src to an area's PNG, e.g. "../pics/Kreis_05370.png",
+	// makes it the placeholder for that area's chart, "../pics/charts/Kreis_05370.json", without loading the PNG
+	const element = document.createElement("div");
+	element.className = "covviz-chart";
+	Object.defineProperty(element, "src", {
+		get: () => element.getAttribute("data-src"),
+		set: (png) => element.setAttribute("data-src", png.replace(/([^\/]*)\.png$/, "charts/$1.json"))
+	});
+	return element;
+}
+
+function covvizCharts(root) {
+	// draws each chart when it comes into view, so that a page with 100 charts only fetches what is looked at
+	const elements = [...root.querySelectorAll(".covviz-chart:not([data-covviz])")];
+	elements.forEach((element) => element.setAttribute("data-covviz", "pending"));
+	if (!("IntersectionObserver" in window)) {
+		elements.forEach(covvizChart);
+		return;
+	}
+	const observer = new IntersectionObserver((entries) => {
+		entries.filter((entry) => entry.isIntersecting).forEach((entry) => {
+			observer.unobserve(entry.target);
+			covvizChart(entry.target);
+		});
+	}, {rootMargin: "400px"});
+	elements.forEach((element) => observer.observe(element));
+}
+
+document.addEventListener("DOMContentLoaded", () => covvizCharts(document));
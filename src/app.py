@@ -59,9 +59,9 @@ def CSV_download_and_inspect_verbose(url=dataFiles.RISKLAYER_URL01):
     dataFiles.inspectNewestData(ts, alreadyRepaired=True)
     # raise Exception("Simulated Error")
     bnn=pandas.read_csv(BNN_FILE)
-    ts, bnn, ts_sorted, Bundeslaender_sorted, dates, datacolumns = dataMangling.additionalColumns(ts,bnn)
-    daily.showSomeExtremeValues(ts_sorted, datacolumns, n=15)
-    daily.showBundeslaenderRanked(Bundeslaender_sorted, datacolumns, rankedBy="incidence_1mio_last7days")
+    dm = dataMangling.mangle(ts, bnn, haupt=None)
+    daily.showSomeExtremeValues(dm.ts_sorted, dm.datacolumns, n=15, ranks=dm.district_rankings)
+    daily.showBundeslaenderRanked(dm.Bundeslaender_sorted, dm.datacolumns, rankedBy="incidence_1mio_last7days", ranks=dm.fed_rankings)
     processingTime=timeit.default_timer() - before - downloadTime
     print(title("END. Timing: downloading=%.2f seconds, processing=%.1f seconds" %(downloadTime, processingTime)))
 
@@ -31,18 +31,14 @@ from dataFiles import DATA_PATH, PICS_PATH, PAGES_PATH, WWW_REPO_DATA, WWW_REPO_
 #         ts_sorted[datecol]=ts_sorted[datecol].astype(int)
         
     
-def add_incidence_prevalence(ts_sorted, datacolumns):
+def report_table(table, datacolumns, lastDatecolumns, firstColumns):
     """
-    TODO: can probably also go into dataMangling?
+    the columns shown in the rankings: `table` without its older date columns, plus the `dataMangling.ranking_metrics()`.
+    Leaves `table` unchanged, and keeps its row order, so that the rank arrays of `dataMangling.rankings()` fit.
     """
-    ts_sorted["incidence_1mio_last14days"]=1000000*ts_sorted["new_last14days"]/ts_sorted["Population"]
-    ts_sorted["incidence_1mio_last7days"] =1000000*ts_sorted["new_last7days"]/ts_sorted["Population"]
-    ts_sorted["prevalence_1mio"]=1000000*ts_sorted[datacolumns[-1]]/ts_sorted["Population"]
+    report = table.drop(columns=datacolumns[:-lastDatecolumns]).assign(**dataMangling.ranking_metrics(table, datacolumns))
+    return newColOrder(report, datacolumns[-lastDatecolumns:], firstColumns=firstColumns)
 
-
-def add_daily(ts_sorted, datacolumns):
-    ts_sorted["new cases"] = ts_sorted[datacolumns[-1]] - ts_sorted[datacolumns[-2]]
-    
 COLUMN_ORDER = ["prevalence_1mio", "new cases", "new_last7days", "incidence_1mio_last7days", "new_last14days", "incidence_1mio_last14days", "centerday", "Reff_4_7_last"]
     
 def newColOrder(df, datacolumns, firstColumns=["ADMIN", "Population", "Bundesland"]):
@@ -64,27 +60,26 @@ def title(text):
     sep="*"*len(text+" * *")
     return "\n%s\n* %s *\n%s" %(sep, text, sep)
 
-def showSomeExtremeValues(ts_sorted, datacolumns, n=15):
-    add_incidence_prevalence(ts_sorted, datacolumns)
-    add_daily(ts_sorted, datacolumns)
-    ts_sorted = newColOrder(ts_sorted, datacolumns)
+def showSomeExtremeValues(ts_sorted, datacolumns, n=15, ranks=None):
+    """`ranks` are the rank arrays of `ts_sorted`, e.g. `dm.district_rankings`; if None, they get made here"""
+    if ranks is None:
+        ranks = dataMangling.rankings(ts_sorted, datacolumns)
+    report = report_table(ts_sorted, datacolumns, 2, firstColumns=["ADMIN", "Population", "Bundesland"])
 
     for col in ("new cases", "incidence_1mio_last7days", "incidence_1mio_last14days", "Reff_4_7_last"):
         print(title("sorted by    %s   descending:" % col))
-        ts_sorted.sort_values(col, ascending=False, inplace=True) 
-        print (ts_sorted.drop(datacolumns[:-2], axis=1).head(n=n).to_string( float_format='%.1f'))
+        print (report.iloc[ranks[col][:n]].to_string( float_format='%.1f'))
         
     # raise Exception("Simulated Error")
     
     
-def showBundeslaenderRanked(Bundeslaender_sorted, datacolumns, rankedBy="incidence_1mio_last7days"):
+def showBundeslaenderRanked(Bundeslaender_sorted, datacolumns, rankedBy="incidence_1mio_last7days", ranks=None):
+    """`ranks` are the rank arrays of `Bundeslaender_sorted`, e.g. `dm.fed_rankings`; if None, they get made here"""
     print(title("Bundesländer ranked by '%s':" % rankedBy))
-    add_incidence_prevalence(Bundeslaender_sorted, datacolumns)
-    add_daily(Bundeslaender_sorted, datacolumns)
-    #Bundeslaender_sorted["Bundesland"]=Bundeslaender_sorted.index
-    Bundeslaender_sorted = newColOrder(Bundeslaender_sorted , datacolumns, firstColumns=["Population"]) # ["Bundesland"])
-    Bundeslaender_sorted.sort_values(rankedBy, ascending=False, inplace=True)
-    print (Bundeslaender_sorted.drop(datacolumns[:-5], axis=1).to_string( float_format='%.2f'))
+    if ranks is None:
+        ranks = dataMangling.rankings(Bundeslaender_sorted, datacolumns)
+    report = report_table(Bundeslaender_sorted, datacolumns, 5, firstColumns=["Population"]) # ["Bundesland"])
+    print (report.iloc[ranks[rankedBy]].to_string( float_format='%.2f'))
     
     
 def loadAndShowSomeExtremeValues():
@@ -92,8 +87,8 @@ def loadAndShowSomeExtremeValues():
     dm = dataMangling.dataMangled()
     # print (ts_sorted.columns)
     
-    showSomeExtremeValues(dm.ts_sorted, dm.datacolumns)
-    showBundeslaenderRanked(dm.Bundeslaender_sorted, dm.datacolumns)
+    showSomeExtremeValues(dm.ts_sorted, dm.datacolumns, ranks=dm.district_rankings)
+    showBundeslaenderRanked(dm.Bundeslaender_sorted, dm.datacolumns, ranks=dm.fed_rankings)
 
 ## download and process:
 
@@ -111,38 +106,53 @@ def download_all(showExtremes=True):
     return new_CSV, new_master_state 
     
 
-def generate_all_pages(withSyntheticData=False):
+def generate_all_pages(withSyntheticData=False, charts=False):
+    """
+    with `charts`, the pages draw the charts in the browser, see `dataPages.plot_HTML()`;
+    then also the hotspot pages get regenerated like that, because there are no new PNGs for them
+    """
     
     # haupt = dataFiles.load_master_sheet_haupt(timestamp="") # timestamp="" means newest
     dm = dataMangling.dataMangled(withSynthetic=withSyntheticData, haupt=None)
+    dm.materialize_all() # all districts and federal states at once, the pages then only use the cache
     print()
 
     distances = districtDistances.load_distances()
     cmap = dataTable.colormap()
 
     print()
-    Bundeslaender_filenames = dataPages.Bundeslaender_alle(dm, distances, cmap, km=50)
+    Bundeslaender_filenames = dataPages.Bundeslaender_alle(dm, distances, cmap, km=50, charts=charts)
     print (Bundeslaender_filenames)
     
-    fn = dataPages.Deutschland(dm, cmap)
+    fn = dataPages.Deutschland(dm, cmap, charts=charts)
     print ("\n" + fn)
+
+    if charts:
+        dataPages.generate_hotspot_files(charts=True)
     
     return True
     
 
-def generate_all_plots(withSyntheticData=True):
+def generate_all_plots(withSyntheticData=True, skipUnchanged=True, charts=False):
+    """
+    with `skipUnchanged`, the PNGs of areas which did not change are kept, see `dataPlotting.plot_skipping_unchanged()`;
+    with `charts`, no PNGs but only the data for the charts drawn in the browser, see `dataPlotting.write_all_chart_data()`;
+    the pages made by `generate_all_pages(charts=True)` then do not show any PNG of an area
+    """
 
     dm = dataMangling.dataMangled(withSynthetic=withSyntheticData)
+    dm.materialize_all() # before the plotting processes get forked, so that they all inherit the warm cache
     print()
     
+    if charts:
+        done = dataPlotting.write_all_chart_data(dm)
+        print ("chart data done: %d items\n" % len(done))
+        return True
+
     print ("Plotting takes a bit of time. Patience please. Thanks.")
-    done = dataPlotting.plot_all_Bundeslaender(dm, ifPrint=False)
-    print ("plot_all_Bundeslaender: %d items" % len(done))
-    
-    listOfAGSs = dm.ts["AGS"].tolist()
-    print ("Plotting %d images, for each Kreis. Patience please: " % len(listOfAGSs))
-    done = dataPlotting.plot_Kreise_parallel(dm, listOfAGSs, ifPrint=True)
-    print ("plot_Kreise done: %d items" % len(done))
+    # the federal states, Germany, and each Kreis, all in one work queue on all cores
+    done = dataPlotting.plot_all(dm, ifPrint=False, skipUnchanged=skipUnchanged)
+    print ("plot_all done: %d items, %d of them unchanged" % (len(done), sum(record.skipped for record in done)))
     print()
 
     return True
@@ -160,7 +170,7 @@ def copy_all():
             shutil.rmtree(d)
         except:  
             pass # ignore error if folder did not exist
-        dst = shutil.copytree(s, d)
+        dst = shutil.copytree(s, d, ignore=shutil.ignore_patterns(dataPlotting.PLOTS_MANIFEST)) # the manifest is only for the next plotting run
         print (dst)
         os.remove(os.path.join(d, ".gitignore"))
 
@@ -187,7 +197,7 @@ def git_commit_and_push(path=WWW_REPO_PATH, script=WWW_REPO_PATH_GIT_SCRIPT):
 
 
 def daily_update(regenerate_pages_regardless_if_new_data=True, regenerate_plots_regardless_if_new_data=True,
-                 publish=False, showExtremes=True, withSyntheticData=False, downloadNewData=True):
+                 publish=False, showExtremes=True, withSyntheticData=False, downloadNewData=True, charts=False):
     print ("Started at", ("%s" % datetime.datetime.now()) [:19],"\n")
     
     new_CSV = success1 = success2 = success3 = success4 = success5 = False
@@ -203,14 +213,14 @@ def daily_update(regenerate_pages_regardless_if_new_data=True, regenerate_plots_
     line = "\n" + ("*"*50) + "\n"
         
     if new_CSV or regenerate_pages_regardless_if_new_data:
-        success2 = generate_all_pages(withSyntheticData=withSyntheticData)
+        success2 = generate_all_pages(withSyntheticData=withSyntheticData, charts=charts)
     else:
         print (line+"ALERT: no new pages generated"+line)
         
     if not regenerate_plots_regardless_if_new_data and not new_CSV:
         print (line+"ALERT: no new plots generated"+line)
     else:
-        success3 = generate_all_plots()
+        success3 = generate_all_plots(charts=charts)
         
     if publish: 
         success4 = copy_all()
@@ -16,14 +16,14 @@
 
 """
 
-import os, shutil, hashlib, time, datetime, sys
+import os, shutil, hashlib, time, datetime, sys, pickle, json, glob, tempfile, io, csv, urllib.request
 
 # new strange ssl problem & workaround by simply switching off verification March 2021
 import ssl
 
 ssl._create_default_https_context = ssl._create_unverified_context
 
-import pandas, wget, requests, numpy
+import pandas, requests, numpy
 import bs4 as bs
 import pandas as pd
 
@@ -36,6 +36,8 @@ WP_URL="https://de.wikipedia.org/"
 
 TS_FILE =  os.path.join(DATA_PATH, "GermanyValues_RiskLayer-20200425.csv")
 TS_NEWEST =  os.path.join(DATA_PATH, "GermanyValues_RiskLayer.csv")
+DIGEST_SUFFIX = ".digest.json" # next to a downloaded file, its SHA-256 as `downloadData()` has seen it, see `stored_digest()`
+DOWNLOAD_CHUNK_SIZE = 1 << 16
 PICS_PATH = os.path.join(DATA_PATH, "..", "pics")
 PAGES_PATH = os.path.join(DATA_PATH, "..", "pages")
 
@@ -74,6 +76,14 @@ OPENDATASOFT_URL01 = "https://public.opendatasoft.com/explore/dataset/covid-19-g
 OPENDATASOFT_URL02 = "https://public.opendatasoft.com/explore/dataset/covid-19-germany-landkreise/download/?format=csv&lang=en&use_labels_for_header=true&csv_separator=%3B"
 OPENDATASOFT_PATH = os.path.join(DATA_PATH, "covid-19-germany-landkreise.csv")
 DISTANCES_PATH = os.path.join(DATA_PATH, "distances.csv")
+MANGLED_CACHE_FILE = os.path.join(DATA_PATH, "mangled_cache.pickle")
+ARCHIVE_PATH = os.path.join(DATA_PATH, "archive")
+ARCHIVE_INDEX = "index.json"
+ARCHIVE_COLUMNS = "columns.float32"
+ARCHIVE_DTYPE = numpy.float32 # the date columns as parsed, see `TS_DATE_DTYPE`; with nan where a cell was not a number
+
+TS_DATE_DTYPE = numpy.float32
+"""dtype of the date columns when reading the timeseries CSV; float, because the RiskLayer message lines have no numbers there"""
 
 
 ########################### download, store, and repair timeseries data ########################################
@@ -94,22 +104,15 @@ def swap_specific_typo_cells(df, correct_type, wrong='o', correct='0'):
     """
 
     print("Searching for '%s' instead of '%s':" %(wrong, correct))
-    typos = df[df.astype(str).eq(wrong).any(1)]
-    affected_cols=[]
-    for i in typos.index:
-        print ("row index", i)
-        cols=df.columns[df.loc[i].astype(str)==wrong].tolist()
-        # print(cols)
-        for col in cols:
-            print(col, ":", df.loc[i,col], end=" --> ")
-            df.loc[i,col]=correct
-            print(df.loc[i,col])
-        affected_cols.extend(cols)
+    mask = df.astype(str).eq(wrong) # one mask over the whole frame, instead of going through the rows
+    rows, cols = numpy.nonzero(mask.values)
+    for i, col in zip(df.index[rows], df.columns[cols]):
+        print ("row index", i, col, ":", df.loc[i,col], "-->", correct)
+    affected_cols = df.columns[mask.any(axis=0).values].tolist()
 
     if affected_cols:
         print ("Done. Now casting affected columns %s to %s" % (affected_cols, correct_type))
-        for col in affected_cols:
-            df[col]=df[col].astype(correct_type)
+        df[affected_cols] = df[affected_cols].mask(mask[affected_cols], correct).astype(correct_type)
 
     return df, affected_cols
 
@@ -132,7 +135,7 @@ def testing_swap_specific_typo_cells():
     swap_specific_typo_cells(df, correct_type=type(df.loc[1, "01.06.2020"]), wrong='601.0', correct=601.0)
 
 
-def show_problematic_columns(df, type_wanted=numpy.float64, how_many_different=2):
+def show_problematic_columns(df, type_wanted=TS_DATE_DTYPE, how_many_different=2):
     """
     if there is a typo in any cell, pandas might change the numerical/string type for the whole column
     """
@@ -154,86 +157,154 @@ def remove_unnecessary_columns(ts, wrong=["Population"]):
 
     return ts
 
-def repairData(ts):
+REPAIR_RULES = [
+    {"rule": "drop columns",         "columns": ["Population"],                     "since": "11/Sept/2020"},
+    {"rule": "rename header",        "wrong": "ï»¿AGS",      "correct": "AGS",        "since": "29/April/2020"},
+    {"rule": "rename header",        "wrong": "12.03.20203", "correct": "12.03.2020"},
+    {"rule": "overlong date header", "days_later": 1,                               "since": "18/Oct/2020"}, # e.g. '18.10.20202' is meant to be one day further
+    {"rule": "non-numeric cells",    "fill": "previous day",                        "since": "25/May/2020 'docs', 2/June/2020 'o'"},
+    {"rule": "interpolate column",   "column": "28.04.2020", "between": ["27.04.2020", "29.04.2020"],
+                                     "if_AGS": "05370", "dropped_below": 0.5,       "since": "29/April/2020"}, # Heinsberg: 1733.0  -->   1.739  -->  1743.0
+    {"rule": "implausible drop",     "dropped_below": 0.5},  # a cumulative value below half of the day before, and back up the day after
+]
+"""the repairs which `repairData()` applies, in this order; each is done by the function in `REPAIRS` for its 'rule'"""
+
+
+def date_columns_matrix(ts):
+    """the date columns of `ts` (all but the first two) as float matrix, with nan for everything which is not a number"""
+    data = ts[ts.columns[2:]]
+    text_columns = data.columns[data.dtypes.values == object]
+    if len(text_columns): # only those can contain something which is not a number
+        data = data.copy()
+        data[text_columns] = data[text_columns].apply(pandas.to_numeric, errors="coerce")
+    return data.values.astype(numpy.float64)
+
+
+def repair_drop_columns(ts, rule):
+    before = ts.columns.tolist()
+    ts = remove_unnecessary_columns(ts, wrong=rule["columns"])
+    return ts, [{"column": column} for column in before if column not in ts.columns]
+
+
+def repair_rename_header(ts, rule):
+    if rule["wrong"] not in ts.columns:
+        return ts, []
+    print(f"found and fixed bad column header: '{rule['wrong']}' -> '{rule['correct']}'")
+    ts = ts.rename(columns={rule["wrong"]: rule["correct"]})
+    return ts, [{"column": rule["wrong"], "new": rule["correct"]}]
+
+
+def repair_overlong_date_header(ts, rule):
+    columns = pandas.Index(ts.columns)
+    overlong = columns[2:][columns[2:].str.len() > 10]
+    renames = {}
+    for col in overlong:
+        day = datetime.datetime.strptime(col[:10], "%d.%m.%Y") + datetime.timedelta(days=rule["days_later"])
+        renames[col] = day.strftime("%d.%m.%Y")
+        print(f"found and fixed bad column header: '{col}' -> '{renames[col]}'")
+    return ts.rename(columns=renames), [{"column": col, "new": new} for col, new in renames.items()]
+
+
+def repair_non_numeric_cells(ts, rule):
+    """
+    cells which are not numbers: either text in the frame, or the cells which `read_as_CSV_or_as_SSV()`
+    had to leave empty (see `ts.attrs["unparseable"]`); they get the value of the day before (0 for the first day)
+    """
+    datacolumns = ts.columns[2:]
+    values = date_columns_matrix(ts)
+    mask = numpy.isnan(values) & ts[datacolumns].notna().values
+    positions = {column: i for i, column in enumerate(datacolumns)}
+    listed = [(ts.index.get_loc(index), positions[column], text) for index, column, text in ts.attrs.get("unparseable", [])
+              if column in positions and index in ts.index]
+    for row, col, _ in listed:
+        mask[row, col] = True
+    if not mask.any():
+        return ts, []
+    texts = {(row, col): text for row, col, text in listed}
+    rows, cols = numpy.nonzero(mask)
+    report = [{"index": ts.index[row], "column": datacolumns[col],
+               "text": texts.get((row, col), ts.iat[row, col + 2])} for row, col in zip(rows, cols)]
+
+    values[mask] = numpy.nan
+    filled = pandas.DataFrame(values).ffill(axis=1).fillna(0).values
+    values[mask] = filled[mask]
+    for entry, value in zip(report, values[mask]):
+        entry["new"] = value
+        print ("found typo '%s' in datafile at [%s, %s], overwritten with previous day value %s" % (entry["text"], entry["index"], entry["column"], value))
+    ts = pandas.concat([ts[ts.columns[:2]], pandas.DataFrame(values, index=ts.index, columns=datacolumns).astype(TS_DATE_DTYPE)], axis=1)
+    return ts, report
+
+
+def repair_interpolate_column(ts, rule):
+    column, (before, after) = rule["column"], rule["between"]
+    if not {column, before, after} <= set(ts.columns):
+        return ts, []
+    check = ts[ts["AGS"]==rule["if_AGS"]]
+    if not len(check) or float(check[column].iloc[0]) / float(check[before].iloc[0]) >= rule["dropped_below"]:
+        return ts, []
+    print ("huge drop of some values for %s, e.g. AGS %s (was a problem on %s)" % (column, rule["if_AGS"], rule.get("since")))
+    print ("temporary fix: interpolate %s from %s and %s." % (column, before, after))
+    ts[column] = (ts[after] + ts[before]) / 2
+    return ts, [{"column": column}]
+
+
+def repair_implausible_drop(ts, rule):
+    """single cumulative values which drop below `dropped_below` of the day before, and are back up the day after"""
+    datacolumns = ts.columns[2:]
+    values = date_columns_matrix(ts)
+    before, now, after = values[:, :-2], values[:, 1:-1], values[:, 2:]
+    with numpy.errstate(invalid='ignore'):
+        mask = (now < rule["dropped_below"] * before) & (after >= before)
+    if not mask.any():
+        return ts, []
+    rows, cols = numpy.nonzero(mask)
+    report = [{"index": ts.index[row], "column": datacolumns[col + 1], "text": now[row, col], "new": (before[row, col] + after[row, col]) / 2}
+              for row, col in zip(rows, cols)]
+    for entry in report:
+        print ("implausible drop at [%s, %s]: %s, interpolated to %s" % (entry["index"], entry["column"], entry["text"], entry["new"]))
+    now[mask] = (before[mask] + after[mask]) / 2
+    ts = pandas.concat([ts[ts.columns[:2]], pandas.DataFrame(values, index=ts.index, columns=datacolumns).astype(TS_DATE_DTYPE)], axis=1)
+    return ts, report
+
+
+REPAIRS = {"drop columns": repair_drop_columns,
+           "rename header": repair_rename_header,
+           "overlong date header": repair_overlong_date_header,
+           "non-numeric cells": repair_non_numeric_cells,
+           "interpolate column": repair_interpolate_column,
+           "implausible drop": repair_implausible_drop}
+"""rule name --> function(ts, rule) which returns the repaired ts, and a list of what it changed"""
+
+
+def repairData(ts, rules=REPAIR_RULES):
     """
     The CSV contains some data typos.
 
     This will get better when they automate the procedure to create the CSV, see their "Fragen und Antworten" sheet.
-    These problems are patched here:
+    The known problems are listed in `rules` (see `REPAIR_RULES`), each rule repairs the whole frame at once:
 
     12.03.20203
     ï»¿AGS
     1733.0  -->   1.739  -->  1743.0
     'docs'
     'o'
+
+    What has been changed is stored in `ts.attrs["repairs"]`, as list of {"rule", "since", "changes"}.
     """
 
     print ("\nRepair dirty risklayer data:")
 
     show_problematic_columns(ts)
 
-    ts=remove_unnecessary_columns(ts)
-
-    # try to filter known column name problems
-    newcols = []
-    for col in ts.columns:
-        col_fixed = col
-
-        if col_fixed == "12.03.20203":
-            col_fixed = "12.03.2020"
-
-        elif len(col_fixed) > 10:   # fixes dates like '18.10.20202', '19.10.20202' which are meant to be on day further
-            dt = datetime.datetime.strptime(col[:10], "%d.%M.%Y")
-            dt += datetime.timedelta(days=1)
-            col_fixed = dt.strftime("%d.%M.%Y")
-
-        elif col_fixed == 'ï»¿AGS': # (problem after 29/4/2020)
-            col_fixed = 'AGS'
-
-        if col != col_fixed:
-            print(f"found and fixed bad column header: '{col}' -> '{col_fixed}'")
-
-        newcols.append(col_fixed)
-
-    ts.columns = newcols
-
-    before = ts[ts["AGS"]=="05370"]["27.04.2020"]
-    after  = ts[ts["AGS"]=="05370"]["28.04.2020"]
-    # print (float(after) / float(before) )
-    if float(after) / float(before) < 0.5:
-        print ("huge drop of some values for 28.4.2020, e.g. Heinsberg: 1733.0  -->   1.739  -->  1743.0 (was a problem on 29/4/2020)")
-        print ("temporary fix: interpolate 28. from 27. and 29.")
-        ts["28.04.2020"]=(ts["29.04.2020"]+ts["27.04.2020"])/2
-
-
-    # print (ts.index.tolist()); exit()
-    colproblem, colgood= "10.03.2020", "09.03.2020"
-
-    typo='docs' # problem appeared in 25.05.2020 file:
-    ii=ts[ts[colproblem].astype(str)==typo].index.values.tolist()
-    # print(ii)
-    if ii:
-        print ("found typo '%s' in datafile at positions [%s, %s] (was a problem on 25/5/2020)" % (typo, ii, colproblem), end=" ")
-        if len(ii)>1:
-            raise Exception("ALARM: SEVERAL")
-        i=ii[0]
-        # print(ts.loc[i,"10.03.2020"])
-        ts.loc[i,colproblem]=ts.loc[i,colgood]
-        # print(ts.loc[i,"10.03.2020"])
-
-        # ts=ts.drop([401, 402, 403])
-        print ("overwritten with previous day value. Now cast whole column to 'float':", end=" ")
-        ts[colproblem]=ts[colproblem].astype(float)
-        print ("Done.")
-
-
-    # wrong, correct='o',0 # typo 'o' instead of 0
-    # df, cols = swap_specific_typo_cells(ts, correct_type=type(ts.loc[1, "01.06.2020"]), wrong=wrong, correct=correct)
-    # if cols:
-    #     print("found and fixed typo '%s' which had cast whole column/s %s to string. Corrected that now. (appeared on June 2nd 2020)" % (wrong, cols))
-    #     ts=df
-    # else:
-    #     print("They fixed that problem (which had appeared on June 2nd).")
+    report = []
+    attrs = dict(ts.attrs)
+    for rule in rules:
+        ts, changes = REPAIRS[rule["rule"]](ts, rule)
+        ts.attrs.update(attrs)
+        if changes:
+            report.append({"rule": rule["rule"], "since": rule.get("since"), "changes": changes})
+    ts.attrs["unparseable"] = [] # all repaired now
+    ts.attrs["repairs"] = report
 
     # perhaps there are still columns that need fixing:
     show_problematic_columns(ts)
@@ -242,6 +313,28 @@ def repairData(ts):
     return ts
 
 
+def test_repairData():
+    """
+    break the newest data in all the known ways, and see whether `repairData()` gets back to the original
+    """
+    ts, bnn = load_data(ifPrint=False)
+    broken = ts.copy()
+    broken = broken.rename(columns={"AGS": "ï»¿AGS", "12.03.2020": "12.03.20203", "19.10.2020": "18.10.20202"})
+    broken["Population"] = 0
+    broken = broken.astype({"10.03.2020": object, "02.06.2020": object})
+    broken.loc[broken.index[5], "10.03.2020"] = "docs"
+    broken.loc[broken.index[7], "02.06.2020"] = "o"
+    heinsberg = broken.index[broken["ï»¿AGS"]=="05370"][0]
+    broken.loc[heinsberg, "01.06.2021" if "01.06.2021" in broken.columns else "01.02.2021"] /= 1000
+    repaired = repairData(broken)
+    print ("columns equal:", repaired.columns.tolist() == ts.columns.tolist())
+    datacolumns = ts.columns[2:]
+    difference = numpy.abs(repaired[datacolumns].values - ts[datacolumns].values)
+    print ("cells changed:", int((difference > 0).sum()), "(the 3 broken cells, with neighbour values instead)")
+    for entry in repaired.attrs["repairs"]:
+        print (entry["rule"], entry["changes"])
+
+
 def pandas_settings_full_table():
     """
     simple hack to let pandas print a larger column
@@ -310,13 +403,66 @@ def hash_file(filename):
     """
     hash the file content, to be able to tell whether two files are identical.
     """
+    hasher = hashlib.sha256()
     with open(filename,"rb") as f:
-        allbytes = f.read() # read entire file as bytes
-        readable_hash = hashlib.sha256(allbytes).hexdigest();
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    readable_hash = hasher.hexdigest()
     # print(readable_hash)
     return readable_hash
 
 
+def store_digest(filename, digest):
+    """
+    remember the SHA-256 `digest` of `filename`, next to it, together with its size and modification time
+    """
+    stat = os.stat(filename)
+    with open(filename + DIGEST_SUFFIX, "w") as f:
+        json.dump({"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}, f)
+
+
+def stored_digest(filename):
+    """
+    the SHA-256 of `filename` as remembered by `store_digest()`; if that is missing, or if the file
+    has been changed since (other size or modification time), the file gets hashed again.
+    Returns None if the file does not exist.
+    """
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    try:
+        with open(filename + DIGEST_SUFFIX) as f:
+            stored = json.load(f)
+        if stored["size"] == stat.st_size and stored["mtime_ns"] == stat.st_mtime_ns:
+            return stored["sha256"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return hash_file(filename)
+
+
+def download_hashing(url, target=DATA_PATH):
+    """
+    streams the download of `url` into a temporary file in the folder `target` (so it can be renamed into place later),
+    and hashes it on the fly, in the same one pass over the bytes.
+    returns (temporary file name, SHA-256 hexdigest)
+    """
+    hasher, size = hashlib.sha256(), 0
+    with urllib.request.urlopen(url) as response, \
+         tempfile.NamedTemporaryFile(dir=target, prefix="download-", suffix=".part", delete=False) as f:
+        try:
+            for chunk in iter(lambda: response.read(DOWNLOAD_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+        except BaseException:
+            f.close()
+            os.remove(f.name)
+            raise
+    print ("downloaded %d bytes, sha256 %s" % (size, hasher.hexdigest()))
+    return f.name, hasher.hexdigest()
+
+
 def true_if_exist_and_equal(filenames):
     """
     checks that files exist, AND that they are equal in content.
@@ -335,6 +481,44 @@ def true_if_exist_and_equal(filenames):
     return len(unique)==1
 
 
+def store_cached(key, obj, filename=MANGLED_CACHE_FILE):
+    """
+    store the object on disk (pickled, highest protocol), together with the key it belongs to.
+    The key goes first into the file, so that `load_cached()` can find a mismatch without loading the object.
+    Written into a temporary file first, so that a crash never leaves a half written cache file.
+    The cache is only an optimization: if it cannot be written (read-only folder, disk full), that gets printed, not raised.
+    """
+    tmpname = filename + ".tmp"
+    try:
+        with open(tmpname, "wb") as f:
+            pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpname, filename)
+    except OSError as e:
+        print ("could not write cache file '%s', continuing without it:" % filename, type(e), e)
+        try:
+            os.remove(tmpname)
+        except OSError:
+            pass
+
+
+def load_cached(key=None, filename=MANGLED_CACHE_FILE):
+    """
+    load the object which `store_cached()` has stored for the same key (or for any key, if `key` is None).
+    returns None if there is no such file, if it was stored for a different key, or if it is not readable.
+    """
+    try:
+        with open(filename, "rb") as f:
+            if pickle.load(f) != key and key is not None:
+                return None
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e: # e.g. broken file, or stored with classes which have changed since
+        print ("cache file '%s' not usable, ignoring it:" % filename, type(e), e)
+        return None
+
+
 def test_comparison():
     """
     test the above
@@ -343,26 +527,71 @@ def test_comparison():
         print (filenames, true_if_exist_and_equal(filenames))
 
 
-def read_as_CSV_or_as_SSV(filename, encoding='utf-8'):
+def sniff_CSV(head, encoding=None):
+    """
+    look at the first bytes of a CSV file, returns (number of bytes to skip, encoding, delimiter):
+        * a BOM is skipped, also the BOM which had been decoded as cp1252 and then encoded again,
+          that's the 'ï»¿AGS' in the header (problem after 29/4/2020)
+        * encoding 'utf-8', if the head can be decoded as such, otherwise 'cp1252' (if not given)
+        * delimiter ',' or ';' or tab, whatever the header line has most of.
+          Happened first on August 3rd or 4th - suddenly not comma separated anymore but semicolon separated.
+    """
+    skip = 0
+    for bom in ('ï»¿'.encode('utf-8'), b'\xef\xbb\xbf'):
+        if head.startswith(bom):
+            skip = len(bom)
+            break
+    head = head[skip:]
+    if encoding is None:
+        try:
+            head[:head.rfind(b"\n") + 1 or len(head)].decode('utf-8') # only complete lines, the last one might be cut
+            encoding = 'utf-8'
+        except UnicodeDecodeError:
+            encoding = 'cp1252'
+    header = head.split(b"\n")[0]
+    delimiter = max([",", ";", "\t"], key=lambda sep: header.count(sep.encode()))
+    return skip, encoding, delimiter
+
+
+def read_as_CSV_or_as_SSV(filename, encoding=None):
     """
-    try CSV first - if that fails try reading in as SSV
-    Happened first on August 3rd or 4th - suddenly not comma separated anymore but semicolon separated.
+    read the timeseries CSV (file name or URL) in one single parse: delimiter (CSV or SSV, see Aug 4th),
+    encoding, and BOM are sniffed from the first bytes, see `sniff_CSV()`, instead of parsing twice.
+
+    AGS and ADMIN are read as text, the date columns (all the others) get the explicit dtype `TS_DATE_DTYPE`.
+    Cells which cannot be parsed as number (typos like 'docs' or 'o') do not leave the whole column as strings
+    any more, they become nan, and are listed in `ts.attrs["unparseable"]` as (row index, column, text),
+    for `repairData()`.
     """
-    ts = pandas.read_csv(filename, encoding=encoding)
+    if "://" in filename:
+        with urllib.request.urlopen(filename) as response:
+            raw = response.read()
+    else:
+        with open(filename, "rb") as f:
+            raw = f.read()
+    skip, encoding, delimiter = sniff_CSV(raw[:65536], encoding)
+    if delimiter != ",":
+        print ("\n\nALERT: source file not comma-separated but '%s'-separated (happened first on Aug 4th). Reading it like that." % delimiter)
+
+    header = next(csv.reader([raw[skip:].split(b"\n")[0].decode(encoding).strip()], delimiter=delimiter))
+    ts = pandas.read_csv(io.BytesIO(raw[skip:]), sep=delimiter, encoding=encoding, dtype={name: str for name in header[:2]})
     rows, cols = len(ts), len(ts.columns)
     print ("(rows, cols) = (%s, %s)" % (rows, cols), end=" ")
-
-    # TODO: this should not be necessary, as long as above no sep is given:
-    #  → https://pandas.pydata.org/pandas-docs/version/1.0.3/reference/api/pandas.read_csv.html?highlight=read_csv#pandas.read_csv
     if cols == 1:
-        print ("\n\nALERT: ERROR in source file: 1 column. Not comma-separated" \
-               " but semicolon-separated?? (Happened first on Aug 4th). Trying that now:")
-        ts=pandas.read_csv(filename, sep=";", encoding='utf-8')
-        rows, cols = len(ts), len(ts.columns)
-        print ("(rows, cols) = (%s, %s)" % (rows, cols), end=" ")
-    else:
-        print ("==> CSV format correct probably (issue on Aug 4th)", end =" ")
-
+        print ("\n\nALERT: ERROR in source file: 1 column. Neither comma- nor semicolon-separated??")
+
+    # only a column with a typo comes out as text; just its cells go through the number conversion
+    datacolumns = ts.columns[2:]
+    unparseable = []
+    for column in datacolumns[ts[datacolumns].dtypes.values == object]:
+        values = pandas.to_numeric(ts[column], errors="coerce")
+        for index in ts.index[values.isna() & ts[column].notna()]:
+            unparseable.append((index, column, ts.loc[index, column]))
+        ts[column] = values
+    ts = pandas.concat([ts[ts.columns[:2]], ts[datacolumns].astype(TS_DATE_DTYPE)], axis=1)
+    ts.attrs["unparseable"] = unparseable
+    if unparseable:
+        print ("\nALERT: %d cells are not numbers, e.g. %s, left empty for repairData()" % (len(unparseable), unparseable[:3]), end=" ")
 
     print ("==> looking good. Let's see if it reads in correctly ...\n")
     return ts
@@ -371,41 +600,68 @@ def read_as_CSV_or_as_SSV(filename, encoding='utf-8'):
 def downloadData(andStore=True,
                  url=RISKLAYER_URL01, target=DATA_PATH,
                  ts_file=TS_FILE, ts_newest=TS_NEWEST,
-                 encoding='utf-8'): # encoding='cp1252'):
+                 encoding=None, # None: sniffed, see `sniff_CSV()`
+                 keepDatedCSV=True, archive=ARCHIVE_PATH, skipIfUnchanged=True):
     """
-    download, and store in 2 files:
-     one timestamped, for possible later use
+    download (streamed, and hashed on the fly, see `download_hashing()`), and store:
+     into the snapshot archive, raw as parsed, see `archive_add_snapshot()` (if `archive` is not None)
+     timestamped as CSV, for possible later use (if `keepDatedCSV`; keep them until the archive has proven itself)
      one "always the newest", for generating plots & pages
 
     visual inspection of the data
-    returns (bool "that was newly stored data", timeseries)
+
+    The download is compared with the stored digest of the newest snapshot (see `stored_digest()`);
+    if it is unchanged and `skipIfUnchanged`, parsing, inspection, and storing are all skipped.
+    returns (bool "that was newly stored data", timeseries); the timeseries is None when skipped.
     """
     print (url)
-    filename = wget.download(url, out=target)
-    print ("downloaded:", filename)
-    ts = read_as_CSV_or_as_SSV(filename, encoding=encoding)
-    ts.rename(columns={"ISO": "AGS"}, inplace=True)
-
-    last_col = ts.columns[2:].tolist()[-1]
-    print ("newest column:", last_col)
-
-    d=last_col.split(".")
-    d.reverse()
-    last_date = "".join(d)
-    newfilename = ts_file.replace("20200425", last_date)
-    equal = true_if_exist_and_equal([filename, newfilename])
+    filename, digest = download_hashing(url, target=target)
+    equal = digest == stored_digest(ts_newest)
+    if equal and skipIfUnchanged:
+        os.remove(filename)
+        print ("unchanged since the last download (same sha256 as '%s'), so not parsing, inspecting, or storing it again." % ts_newest)
+        return False, None
+
+    try:
+        ts = read_as_CSV_or_as_SSV(filename, encoding=encoding)
+        ts.rename(columns={"ISO": "AGS"}, inplace=True)
+
+        last_col = ts.columns[2:].tolist()[-1]
+        print ("newest column:", last_col)
+
+        d=last_col.split(".")
+        d.reverse()
+        last_date = "".join(d)
+        newfilename = ts_file.replace("20200425", last_date)
+        if keepDatedCSV:
+            equal = digest == stored_digest(newfilename)
+
+        repaired = attribution_and_repair(ts.copy())
+    except BaseException:
+        os.remove(filename) # no half processed download left behind
+        raise
 
     if andStore:
-        print ("Saving into 2 files:")
-        shutil.move(filename, newfilename)
-        print (newfilename)
-        shutil.copy(newfilename, ts_newest)
+        if keepDatedCSV:
+            print ("Saving into 2 files:")
+            shutil.copy(filename, newfilename)
+            print (newfilename)
+        else:
+            print ("Saving into:")
+        os.replace(filename, ts_newest)
+        store_digest(ts_newest, digest)
         print (ts_newest)
+        if archive is not None and not equal:
+            try:
+                archive_add_snapshot(ts, last_date, path=archive)
+            except Exception as e: # the archive must never stop the daily update
+                print ("ALERT: could not archive the snapshot:", type(e), e)
     else:
+        os.remove(filename)
         warn = ("*" * 57 + "\n")*3
         print("\n" + warn + "ALERT: dev mode ... NOT storing this data\n"+ warn)
 
-    inspectNewestData(ts)
+    inspectNewestData(repaired, alreadyRepaired=True)
     # print ("TODO perhaps")
     # print (RISKLAYER_URL02)
     # print ("sheet", RISKLAYER_URL02_SHEET)
@@ -414,7 +670,41 @@ def downloadData(andStore=True,
     return not equal, ts
 
 
-def downloadDataNotStoring(url=RISKLAYER_URL01, encoding='utf-8'):
+def test_downloadData(ts_f=TS_NEWEST):
+    """
+    `downloadData()` against a local HTTP stand-in for the risklayer server, which serves a copy of `ts_f`;
+    everything goes into a temporary folder. The 2nd download of the same file must get skipped.
+    """
+    import http.server, threading, functools
+    with tempfile.TemporaryDirectory() as tmp:
+        served, target = os.path.join(tmp, "served"), os.path.join(tmp, "target")
+        os.mkdir(served), os.mkdir(target)
+        shutil.copy(ts_f, os.path.join(served, "GermanyValues.csv"))
+        class QuietHandler(http.server.SimpleHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=served))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = "http://127.0.0.1:%d/GermanyValues.csv" % server.server_address[1]
+            kwargs = dict(url=url, target=target, ts_newest=os.path.join(target, "newest.csv"), archive=None,
+                          ts_file=os.path.join(target, "dated-20200425.csv"))
+            new, ts = downloadData(**kwargs)
+            print ("\n1st download new:", new, "parsed:", ts is not None)
+            print ("stored digest right:", stored_digest(kwargs["ts_newest"]) == hash_file(ts_f))
+            new, ts = downloadData(**kwargs)
+            print ("2nd download (unchanged) new:", new, "skipped:", ts is None)
+            with open(os.path.join(served, "GermanyValues.csv"), "ab") as f:
+                f.write(b"\n")
+            new, ts = downloadData(**kwargs)
+            print ("\n3rd download (changed) new:", new, "parsed:", ts is not None)
+            print ("no temporary files left:", [f for f in sorted(os.listdir(target)) if not f.startswith("dated-")] == ["newest.csv", "newest.csv" + DIGEST_SUFFIX])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def downloadDataNotStoring(url=RISKLAYER_URL01, encoding=None):
     """
     good for readonly files system like on heroku
     """
@@ -426,6 +716,242 @@ def downloadDataNotStoring(url=RISKLAYER_URL01, encoding='utf-8'):
     return ts
 
 
+########################### snapshot archive ##############################################################
+
+def archive_index(path=ARCHIVE_PATH):
+    """
+    the index of the snapshot archive in folder `path`:
+        AGS, ADMIN: the rows of the column store, i.e. the districts, in the order of the first archived snapshot
+        stored: how many columns of the column store are in use; bytes after those are leftovers of an interrupted write
+        snapshots: list of {"name", "columns"}, ordered as added; "columns" is the column-offset table,
+                   [raw column name, column number in the store] for each date column of the snapshot.
+                   Optional, only where the raw table differed from the plain layout: "header" (first 2 column names),
+                   "ADMIN", "rows" (store row per raw row, -1 for a message line), "messages" ([text, {column: value}]
+                   for the RiskLayer message lines), "unparseable" ([raw row, column, text], see `read_as_CSV_or_as_SSV()`)
+    """
+    try:
+        with open(os.path.join(path, ARCHIVE_INDEX)) as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        return {"AGS": [], "ADMIN": [], "stored": 0, "snapshots": []}
+    if "stored" not in index:
+        raise Exception("archive '%s' is in the old format of repaired int32 snapshots; move it away, and rebuild it "
+                        "from the dated CSV copies with archive_csv_snapshots()" % path)
+    return index
+
+
+def archive_columns(path=ARCHIVE_PATH, index=None):
+    """
+    the column store of the snapshot archive, memory-mapped read-only: matrix (stored columns x rows) of float32,
+    each stored date column is one contiguous row of it. Its length comes from the index, not from the file size,
+    so that bytes of an interrupted `archive_add_snapshot()` after the indexed columns do not matter.
+    """
+    if index is None:
+        index = archive_index(path)
+    rows, stored = len(index["AGS"]), index["stored"]
+    if not rows or not stored:
+        return numpy.zeros((stored, rows), dtype=ARCHIVE_DTYPE)
+    filename = os.path.join(path, ARCHIVE_COLUMNS)
+    needed = stored * rows * numpy.dtype(ARCHIVE_DTYPE).itemsize
+    if os.path.getsize(filename) < needed:
+        raise Exception("column store '%s' is shorter than its index says (%d < %d bytes)" % (filename, os.path.getsize(filename), needed))
+    return numpy.memmap(filename, dtype=ARCHIVE_DTYPE, mode="r", shape=(stored, rows))
+
+
+def archive_add_snapshot(ts, name, path=ARCHIVE_PATH):
+    """
+    add the raw timeseries `ts` (as `read_as_CSV_or_as_SSV()` parsed it, NOT repaired) to the archive,
+    as snapshot with the given name (e.g. '20210428'). An existing snapshot with the same name gets replaced.
+
+    Stored as delta against the earlier snapshots: a date column which is bitwise the same as the column
+    of that name in the newest snapshot which has it, is not stored again, the column-offset table
+    just points to it. So a new day adds one column, and a revised back-day adds only that column.
+    The RiskLayer message lines, the cells which could not be parsed, and columns which `repairData()`
+    would drop, all stay in the snapshot; `archive_snapshot_as_ts()` repairs when loading.
+    """
+    os.makedirs(path, exist_ok=True)
+    index = archive_index(path)
+    header, datacolumns = ts.columns[:2].tolist(), ts.columns[2:].tolist()
+    AGS, ADMIN = ts.iloc[:, 0].tolist(), ts.iloc[:, 1]
+    info = ADMIN.isna().values
+    districts = [ags for ags, message in zip(AGS, info) if not message]
+    if not index["AGS"]:
+        index["AGS"], index["ADMIN"] = districts, ADMIN[~info].tolist()
+    if len(districts) != len(index["AGS"]) or set(districts) != set(index["AGS"]):
+        raise Exception("snapshot '%s' has other districts than the archive, cannot be stored there" % name)
+
+    row_of = {ags: i for i, ags in enumerate(index["AGS"])}
+    rows = [-1 if message else row_of[ags] for ags, message in zip(AGS, info)]
+    values = ts.iloc[:, 2:].values.astype(ARCHIVE_DTYPE)
+    matrix = numpy.empty((len(index["AGS"]), len(datacolumns)), dtype=ARCHIVE_DTYPE)
+    matrix[[row for row in rows if row >= 0]] = values[~info]
+
+    snapshot = {"name": name}
+    if header != ["AGS", "ADMIN"]:
+        snapshot["header"] = header
+    admin = [None] * len(index["AGS"])
+    for row, text in zip(rows, ADMIN):
+        if row >= 0:
+            admin[row] = text
+    if admin != index["ADMIN"]:
+        snapshot["ADMIN"] = admin
+    if rows != list(range(len(districts))) + [-1] * int(info.sum()):
+        snapshot["rows"] = rows
+    if info.any():
+        snapshot["messages"] = [[str(AGS[i]), {column: float(value) for column, value in zip(datacolumns, values[i]) if not numpy.isnan(value)}]
+                                for i in numpy.nonzero(info)[0]]
+    unparseable = ts.attrs.get("unparseable", [])
+    if unparseable:
+        snapshot["unparseable"] = [[int(ts.index.get_loc(i)), column, str(text)] for i, column, text in unparseable]
+
+    # the newest stored version of each column name, to compare with
+    store = archive_columns(path, index)
+    latest = {}
+    for earlier in index["snapshots"]:
+        latest.update(dict(earlier["columns"]))
+    snapshot["columns"], new = [], []
+    for j, column in enumerate(datacolumns):
+        offset = latest.get(column)
+        if offset is None or store[offset].tobytes() != matrix[:, j].tobytes(): # bytes, so that nan == nan
+            offset = index["stored"] + len(new)
+            new.append(j)
+        snapshot["columns"].append([column, offset])
+    del store # close the memory map before writing
+
+    # cut off what an interrupted earlier write might have left, then append; the index only points there once all is written
+    with open(os.path.join(path, ARCHIVE_COLUMNS), "ab") as f:
+        f.truncate(index["stored"] * len(index["AGS"]) * numpy.dtype(ARCHIVE_DTYPE).itemsize)
+        f.write(numpy.ascontiguousarray(matrix[:, new].T).tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    index["stored"] += len(new)
+    index["snapshots"] = [earlier for earlier in index["snapshots"] if earlier["name"] != name] + [snapshot]
+
+    tmpname = os.path.join(path, ARCHIVE_INDEX + ".tmp")
+    with open(tmpname, "w") as f:
+        json.dump(index, f)
+    os.replace(tmpname, os.path.join(path, ARCHIVE_INDEX))
+    print ("archived snapshot '%s': %d days, %d of them new in the store" % (name, len(datacolumns), len(new)))
+
+
+def archive_find(name, index):
+    for snapshot in index["snapshots"]:
+        if snapshot["name"] == name:
+            return snapshot
+    raise Exception("snapshot '%s' not in archive" % name)
+
+
+def archive_snapshot(name, path=ARCHIVE_PATH):
+    """
+    load the raw date values of a snapshot of the archive: returns (matrix, AGS, ADMIN, datacolumns), with
+    the matrix (districts x days) of float32 in the row order of the archive, nan where a cell could not be parsed.
+    Zero-copy (a read-only view into the memory-mapped column store) when the snapshot's columns are stored
+    one after the other, which they are unless back-days got revised; otherwise the columns get gathered.
+    """
+    index = archive_index(path)
+    snapshot = archive_find(name, index)
+    store = archive_columns(path, index)
+    datacolumns = [column for column, _ in snapshot["columns"]]
+    offsets = numpy.array([offset for _, offset in snapshot["columns"]], dtype=numpy.int64)
+    if len(offsets) and numpy.array_equal(offsets, numpy.arange(offsets[0], offsets[0] + len(offsets))):
+        matrix = store[offsets[0]:offsets[0] + len(offsets)].T
+    else:
+        matrix = store[offsets].T
+    return matrix, index["AGS"], snapshot.get("ADMIN", index["ADMIN"]), datacolumns
+
+
+def archive_snapshot_as_ts(name, path=ARCHIVE_PATH, repair=True):
+    """
+    a snapshot of the archive as timeseries table, rebuilt as `read_as_CSV_or_as_SSV()` had parsed it
+    (same rows, message lines, columns, and `ts.attrs["unparseable"]`); with `repair`, it then goes through
+    `attribution_and_repair()`, like `load_data()` gives it - so with today's repair rules. This copies the data.
+    """
+    index = archive_index(path)
+    snapshot = archive_find(name, index)
+    matrix, AGS, ADMIN, datacolumns = archive_snapshot(name, path)
+    messages = snapshot.get("messages", [])
+    rows = snapshot.get("rows", list(range(len(AGS))) + [-1] * len(messages))
+
+    values = numpy.full((len(rows), len(datacolumns)), numpy.nan, dtype=ARCHIVE_DTYPE)
+    first, second = [], []
+    texts = iter(messages)
+    for i, row in enumerate(rows):
+        if row >= 0:
+            values[i] = matrix[row]
+            first.append(AGS[row]), second.append(ADMIN[row])
+        else:
+            text, cells = next(texts)
+            for j, column in enumerate(datacolumns):
+                if column in cells:
+                    values[i, j] = cells[column]
+            first.append(text), second.append(numpy.nan)
+
+    header = snapshot.get("header", ["AGS", "ADMIN"])
+    ts = pandas.concat([pandas.DataFrame({header[0]: first, header[1]: second}),
+                        pandas.DataFrame(values, columns=datacolumns)], axis=1)
+    ts.attrs["unparseable"] = [(row, column, text) for row, column, text in snapshot.get("unparseable", [])]
+    if repair:
+        ts = attribution_and_repair(ts)
+    return ts
+
+
+def archive_csv_snapshots(pattern=TS_FILE.replace("20200425", "*"), path=ARCHIVE_PATH, removeCSV=False):
+    """
+    move the timestamped CSV copies, which `downloadData()` stored up to now, into the archive, oldest first
+    """
+    for filename in sorted(glob.glob(pattern)):
+        name = os.path.basename(filename).split("-")[-1].split(".")[0]
+        ts = read_as_CSV_or_as_SSV(filename)
+        ts.rename(columns={"ISO": "AGS"}, inplace=True)
+        archive_add_snapshot(ts, name, path=path)
+        if removeCSV:
+            os.remove(filename)
+
+
+def test_archive(days_back=5):
+    """
+    archive the raw newest data with the last `days_back` days cut off, then day by day the rest,
+    then one with a revised back-day, and one with the known typos; also an interrupted write in between.
+    Check that all snapshots come back unchanged, raw and repaired, and compare the disk footprint with the CSV copies
+    """
+    raw = read_as_CSV_or_as_SSV(TS_NEWEST)
+    raw.rename(columns={"ISO": "AGS"}, inplace=True)
+    path = tempfile.mkdtemp()
+    datacolumns = raw.columns[2:]
+    snapshots = {}
+    for back in range(days_back, -1, -1):
+        name = "back%d" % back
+        snapshots[name] = raw.drop(columns=datacolumns[len(datacolumns)-back:])
+        archive_add_snapshot(snapshots[name], name, path=path)
+
+    with open(os.path.join(path, ARCHIVE_COLUMNS), "ab") as f:
+        f.write(b"torn") # as if a run had crashed while appending
+    revised = raw.copy()
+    revised.loc[revised.index[0], datacolumns[-30]] += 1
+    snapshots["revised"] = revised
+    archive_add_snapshot(revised, "revised", path=path)
+    print ("revised back-day stored as 1 column:", archive_index(path)["stored"] == len(datacolumns) + 1)
+
+    typos = raw.rename(columns={"12.03.2020": "12.03.20203"})
+    typos.insert(2, "Population", numpy.float32(1000))
+    typos.loc[typos.index[5], "10.03.2020"] = numpy.nan
+    typos.attrs["unparseable"] = [(typos.index[5], "10.03.2020", "docs")]
+    snapshots["typos"] = typos
+    archive_add_snapshot(typos, "typos", path=path)
+
+    for name, snapshot in snapshots.items():
+        matrix, AGS, ADMIN, columns = archive_snapshot(name, path=path)
+        again = archive_snapshot_as_ts(name, path=path, repair=False)
+        same = again.equals(snapshot) and again.attrs["unparseable"] == snapshot.attrs.get("unparseable", [])
+        print (name, "raw equal:", same, "zero-copy:", isinstance(matrix.base, numpy.memmap) or isinstance(matrix, numpy.memmap))
+    repaired, newest = archive_snapshot_as_ts("typos", path=path), attribution_and_repair(raw.copy())
+    print ("typos repaired when loading, like the newest data:", repaired.columns.tolist() == newest.columns.tolist(),
+           int((repaired.iloc[:, 2:].values != newest.iloc[:, 2:].values).sum()), "cell different (the 'docs' one)")
+    archived = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+    print ("%d snapshots: archive %d bytes, as CSV copies %d bytes" % (len(snapshots), archived, len(snapshots) * os.path.getsize(TS_NEWEST)))
+    shutil.rmtree(path)
+
+
 ########################### load & prepare timeseries #######################################################
 
 def attribution_and_repair(ts):
@@ -441,7 +967,7 @@ def attribution_and_repair(ts):
     return ts
 
 
-def load_data(ts_f=TS_NEWEST, bnn_f=BNN_FILE, ifPrint=True, encoding='utf-8'):
+def load_data(ts_f=TS_NEWEST, bnn_f=BNN_FILE, ifPrint=True, encoding=None):
     """
     load timeseries and population sizes; incl attribution_and_repair(ts);
     """
@@ -505,14 +1031,16 @@ def find_correct_zeitformat(df, zeitcolumn='Zeit'):
     """
     Sometimes column 'Zeit' has seconds, sometimes not. *Sigh*.
 
-    So, find a first string (i.e. non-nan) entry in 'zeit' column, while iterating rows.
+    So, find a first string (i.e. non-nan) entry in 'zeit' column (via the string lengths of the whole column).
     That decides which format is used for the whole column.
     """
-    rows, hit = df.iterrows(), 0.0
-    while type(hit) != str:
-        row = next(rows)
-        hit = row[1][zeitcolumn]
-        print(row[0], type(hit), hit, end=" ")
+    zeit = df[zeitcolumn]
+    lengths = zeit.str.len() if zeit.dtype == object else pandas.Series(numpy.nan, index=zeit.index)
+    first = numpy.flatnonzero(lengths.notna().values)
+    if not len(first):
+        raise Exception("Column '%s' has no entry of type 'string'." % zeitcolumn)
+    label, hit = zeit.index[first[0]], zeit.iloc[first[0]]
+    print(label, type(hit), hit, end=" ")
 
     # sometimes Zeit has seconds, sometimes not, sigh:
     if len(hit)   == len("24/03/2020 09:30:00"):
@@ -520,7 +1048,7 @@ def find_correct_zeitformat(df, zeitcolumn='Zeit'):
     elif len(hit) == len("18/03/2020 20:00"):
         zeitformat=        "%d/%m/%Y %H:%M"
     else:
-        msg="Row '%s' was the first of type 'string' in column '%s' but the entry was '%s'. Please add a timeformat implementation for that." %(row[0], zeitcolumn, hit)
+        msg="Row '%s' was the first of type 'string' in column '%s' but the entry was '%s'. Please add a timeformat implementation for that." %(label, zeitcolumn, hit)
         raise Exception(msg)
 
     print ("--> zeitformat = '%s'" % zeitformat)
@@ -603,19 +1131,44 @@ def get_master_sheet_haupt(sheetID=RISKLAYER_MASTER_SHEET):
     return not existed
 
 
+def stacked_urls(df, hauptversion="v03"):
+    """
+    all web sources of all rows as one long Series (row position --> url), without nans, "" and "nn",
+    without duplicates per row, and sorted by row and then url
+    """
+    websources = QUELLEN_SPALTEN[hauptversion]
+    urls = df[websources].reset_index(drop=True).stack() # drops the nans
+    urls = urls[(urls != "") & (urls != "nn")].droplevel(1)
+    urls = urls.rename_axis("row").reset_index(name="url").drop_duplicates()
+    return urls.sort_values(["row", "url"]).set_index("row")["url"]
+
+
 def add_urls_column(df, hauptversion="v03"):
     """
     combines all web sources into one column, as list
     """
     # print (df.columns); exit()
-    websources = QUELLEN_SPALTEN[hauptversion]
-    df["urls"]= [sorted(list(set( [url
-                            for url in urllist
-                            if url!="" and url!="nn"] )))    # remove the nans
-                 for urllist in df[websources].fillna("").values.tolist()]
+    urls = stacked_urls(df, hauptversion)
+    lists = urls.groupby(level=0).agg(list)
+    df["urls"] = [lists.get(row, []) for row in range(len(df))]
     return df
 
 
+def sources_links_by_AGS(df, hauptversion="v03"):
+    """
+    AGS --> HTML links to the web sources of the district (numbered, in the order of the "urls" column);
+    "" for a district without sources. Built in one pass over all districts, for `dataMangling.sources_links()`.
+    """
+    urls = stacked_urls(df, hauptversion)
+    numbers = (urls.groupby(level=0).cumcount() + 1).astype(str)
+    links = '<a href="' + urls + '" target="_blank" title="' + urls + '">' + numbers + '</a>'
+    joined = links.groupby(level=0).agg(", ".join)
+    sources = dict()
+    for row, AGS in enumerate(df["AGS"].tolist()):
+        sources.setdefault(int(AGS), joined.get(row, "")) # the first row wins, like with `haupt.loc[AGS]`
+    return sources
+
+
 def load_master_sheet_haupt(filestump=HAUPT_FILES, timestamp="-20200520_211500", hauptversion="v03"):
     """
     load the file.
@@ -631,10 +1184,12 @@ def load_master_sheet_haupt(filestump=HAUPT_FILES, timestamp="-20200520_211500",
     print ("Sum", daysum, end=" ")
     # fix bad time entry
     zeit = df.Zeit.replace('25/10/0202 00:00', '25/10/2020 00:00')
-    lastEntry=pandas.to_datetime(zeit).max()
+    df["Zeit_datetime"] = pandas.to_datetime(zeit, format=find_correct_zeitformat(df), errors='coerce')
+    lastEntry=df["Zeit_datetime"].max()
     print ("Last entry was:", lastEntry)
     df=add_urls_column(df, hauptversion=hauptversion)
-    print ("added urls column with all websources combined")
+    df.attrs["sources_links"] = sources_links_by_AGS(df, hauptversion=hauptversion)
+    print ("added urls column with all websources combined, and their HTML links per AGS")
 
     df.index=df.AGS.tolist()
     print("index = AGS, for easier access")
@@ -771,6 +1326,7 @@ if __name__ == '__main__':
     # notEqual, ts = downloadData(andStore=False); exit()
     # newData, ts = downloadData(); print ("\ndownloaded timeseries CSV was new:", newData); exit()
 
+    # test_downloadData(); exit()
     downloadData(); # exit()
 
     load_data(); exit()
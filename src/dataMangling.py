@@ -14,13 +14,14 @@
           PERHAPS take apart, into several separate files?
           NOT yet: pretty, not at all easy to read, sorry. But it works.
 """
-import copy
 
 import datetime as dt
+import hashlib
 import numpy as np
 import os
 import pandas
-from typing import Dict, List
+import warnings
+from typing import Dict, List, Tuple
 
 import dataFiles
 import districtDistances
@@ -32,6 +33,44 @@ WEEKLY_INCIDENCE_LIMIT3_PER_100K = 100
 WEEKLY_INCIDENCE_LIMIT4_PER_100K = 150
 WEEKLY_INCIDENCE_LIMIT5_PER_100K = 165
 WEEKLY_INCIDENCE_LIMIT6_PER_100K = 200
+WEEKLY_INCIDENCE_LIMITS_PER_100K = (WEEKLY_INCIDENCE_LIMIT1_PER_100K, WEEKLY_INCIDENCE_LIMIT2_PER_100K,
+                                    WEEKLY_INCIDENCE_LIMIT3_PER_100K, WEEKLY_INCIDENCE_LIMIT4_PER_100K,
+                                    WEEKLY_INCIDENCE_LIMIT5_PER_100K, WEEKLY_INCIDENCE_LIMIT6_PER_100K)
+
+class DateAxis:
+    """the date axis of the data, parsed once out of the date column headers, in all the forms which
+    plotting, tables and pages need. Shared, so please do not modify its contents."""
+
+    __slots__ = ("labels", "labels_reversed", "datetimes", "datetime64", "_date_numbers")
+
+    labels: Tuple[str, ...]
+    """the date column headers, in German formatting, e.g. '05.03.2020'; ascending"""
+
+    labels_reversed: Tuple[str, ...]
+    """`labels`, newest first, as the HTML tables show them"""
+
+    datetimes: List[dt.datetime]
+    """`labels` as datetime objects"""
+
+    datetime64: np.ndarray
+    """`labels` as numpy datetime64[D] array, which matplotlib takes as dates without a conversion per element"""
+
+    def __init__(self, datacolumns, datetimes: List[dt.datetime] = None) -> None:
+        """`datetimes` may give the already parsed `datacolumns`"""
+        self.labels = tuple(datacolumns)
+        self.labels_reversed = self.labels[::-1]
+        self.datetimes = datetimes if datetimes is not None else [to_dt(label) for label in self.labels]
+        self.datetime64 = np.array(self.datetimes, dtype="datetime64[D]")
+        self._date_numbers = None
+
+    @property
+    def date_numbers(self) -> np.ndarray:
+        """the dates as matplotlib date numbers (whose epoch depends on the matplotlib version), calculated on first use"""
+        if self._date_numbers is None:
+            import matplotlib.dates as mp_dates
+            self._date_numbers = mp_dates.date2num(self.datetimes)
+        return self._date_numbers
+
 
 class DataMangled:
     """structure to hold the mangled overall covid data, gathered by `dataMangled()`"""
@@ -83,6 +122,9 @@ class DataMangled:
     datacolumns: pandas.Index = None
     """axis labels of dates out of `ts`"""
 
+    date_axis: DateAxis = None
+    """the dates of `datacolumns` in all needed forms, parsed once, see `DateAxis`"""
+
     haupt: pandas.DataFrame = None
     """data of the 'haupt' CSV data source, including source URLs"""
 
@@ -98,12 +140,59 @@ class DataMangled:
     districts: Dict =  dict()
     """global dictionary to cache every `District`, which once has been gotten via `get_Kreis()`"""
 
+    Reff_districts: Dict[str, np.ndarray] = dict()
+    """complete R_eff time series of all districts, see `Reff_series()`; rows like in `cases`, see `AGS_row`"""
+
+    Reff_feds: Dict[str, np.ndarray] = dict()
+    """complete R_eff time series of all federal states, see `Reff_series()`; rows like in `Bundeslaender_sorted`, see `fed_row`"""
+
+    fed_row: Dict[str, int] = dict()
+    """federal state name --> row index into `fed_cases` and the `Reff_feds` matrices (the row order of `Bundeslaender_sorted`)"""
+
+    fed_cases: np.ndarray = None
+    """matrix of the cumulative cases of all federal states (and 'Deutschland'), rows like in `Bundeslaender_sorted`, see `fed_row`"""
+
+    cases: np.ndarray = None
+    """contiguous int32 matrix of the cumulative cases, one row per district (in the row order of `ts`),
+        one column per date of `datacolumns`, see `case_matrix()`"""
+
+    AGS_row: Dict[int, int] = dict()
+    """AGS (as int) --> row index into `cases`"""
+
+    district_series: Dict[str, np.ndarray] = dict()
+    """derived series of all districts at once, see `area_series()`; rows like in `cases`; filled by `materialize_all()`"""
+
+    fed_series: Dict[str, np.ndarray] = dict()
+    """derived series of all federal states at once, see `area_series()`; rows like in `fed_cases`; filled by `materialize_all()`"""
+
+    state_names: List[str] = []
+    """names of the federal states (without 'Deutschland'), sorted like the groups of a `groupby("Bundesland")`"""
+
+    district_state: np.ndarray = None
+    """membership index: for each row of `cases`, the index of its federal state in `state_names` (-1 if none)"""
+
+    district_rankings: Dict[str, np.ndarray] = dict()
+    """rank arrays of the districts, metric --> row positions in `ts_sorted` in descending order, see `rankings()`"""
+
+    fed_rankings: Dict[str, np.ndarray] = dict()
+    """rank arrays of the federal states, metric --> row positions in `Bundeslaender_sorted` in descending order, see `rankings()`"""
+
+    center_productsums: np.ndarray = None
+    """running sums (day index * daily cases) of all districts, rows like in `cases`, see `temporal_center_sums()`"""
+
+    fed_center_productsums: np.ndarray = None
+    """running sums (day index * daily cases) of all federal states, rows like in `fed_cases`, see `temporal_center_sums()`"""
+
+    code_key: str = ""
+    """hash over the mangling code and the parameters which this has been built with, see `mangling_code_key()`"""
+
     def __init__(self, ts: pandas.DataFrame = None, bnn: pandas.DataFrame = None,
                  ts_sorted: pandas.DataFrame = None, Bundeslaender_sorted: pandas.DataFrame = None,
                  dates: List[dt.datetime] = None, datacolumns: pandas.Index = None,
                  haupt: pandas.DataFrame = None,
                  max_district_prevalence_100k: float = 0.0,  max_federal_state_prevalence_100k: float = 0.0,
-                 feds: Dict = None, districts: Dict = None) -> None:
+                 feds: Dict = None, districts: Dict = None,
+                 cases: np.ndarray = None, AGS_row: Dict[int, int] = None) -> None:
         """the parameters up to, including, `datacolumns` should not be changed in their order,
         as long as `dataMangled` initializes this directly through '*additional_column, …'"""
         self.ts = ts
@@ -112,126 +201,253 @@ class DataMangled:
         self.Bundeslaender_sorted = Bundeslaender_sorted
         self.dates = dates if dates is not None else []
         self.datacolumns = datacolumns
+        self.date_axis = DateAxis(datacolumns, self.dates or None) if datacolumns is not None else None
         self.haupt = haupt
         self.max_district_prevalence_100k = max_district_prevalence_100k
         self.max_federal_state_prevalence_100k = max_federal_state_prevalence_100k
         self.feds = feds if feds is not None else dict()
         self.districts = districts if districts is not None else dict()
+        self.cases = cases
+        self.AGS_row = AGS_row if AGS_row is not None else dict()
+        self.district_series = dict()
+        self.fed_series = dict()
+        self.state_names = []
+        self.district_rankings = dict()
+        self.fed_rankings = dict()
+
+    def state_sums(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        aggregates a matrix with rows like in `cases` (e.g. `cases` itself, or some of its columns)
+        into one row per federal state (in the order of `state_names`), plus 'Deutschland' as last row, see `segmented_sums()`
+        """
+        sums = segmented_sums(matrix, self.district_state, len(self.state_names))
+        return np.vstack([sums, sums.sum(axis=0)])
+
+    def ranked_AGSs(self, metric: str = "centerday", state: str = None) -> List[int]:
+        """the AGS of the districts (optionally only those of federal state `state`), ranked by `metric`, see `rankings()`"""
+        order = self.district_rankings[metric]
+        AGSs = self.ts_sorted.index.values[order]
+        if state is not None:
+            AGSs = AGSs[self.ts_sorted["Bundesland"].values[order] == state]
+        return AGSs.tolist()
+
+    def ranked_states(self, metric: str = "centerday") -> List[str]:
+        """the names of the federal states (and 'Deutschland'), ranked by `metric`, see `rankings()`"""
+        return self.Bundeslaender_sorted.index.values[self.fed_rankings[metric]].tolist()
+
+    def materialize_all(self) -> None:
+        """
+        builds all districts and all federal states in one go, and stores them in the caches
+        `districts` and `feds`, so that pages, tables and plots only hit the warm cache afterwards.
+
+        The series of the areas (daily, rolling means, incidence sums and values, incidence limits)
+        are calculated in one pass over all rows of `cases` and `fed_cases`, see `area_series()`.
+        """
+        if self.district_series and self.fed_series:
+            return
+        population = np.zeros(len(self.AGS_row), dtype=np.int64)
+        for AGS, row in self.AGS_row.items():
+            population[row] = bnn_record(self.bnn, AGS)["Population"]
+        self.district_series = area_series(self.cases, population)
+        self.fed_series = area_series(self.fed_cases, self.Bundeslaender_sorted["Population"].values)
+
+        # the views already in the caches get the new series as well, if they are rows of the same matrices
+        for cov_area in self.districts.values():
+            if cov_area.cases is self.cases:
+                cov_area.series = self.district_series
+        for cov_area in self.feds.values():
+            if cov_area.cases is self.fed_cases:
+                cov_area.series = self.fed_series
+
+        for AGS in self.ts_sorted.index:
+            get_Kreis(AGS)
+        for name in self.Bundeslaender_sorted.index:
+            get_BuLa(self.Bundeslaender_sorted, name, self.datacolumns)
 
 
 class CovidDataArea:
-    """structure to hold the base data fields which occur in btoh: District and FedState"""
+    """structure to hold the base data fields which occur in both: District and FedState.
 
-    center: np.array = None
-    """position of center day / 'expectation day' in the raw `daily` cases list"""
+    This is a compact view: the case numbers are not copied into it, it only knows its `row` in the
+    shared matrix `cases` (e.g. `DataMangled.cases`), and every series derived from that gets calculated
+    when accessed, and is not kept."""
 
-    center_date: np.array = None
-    """`center` as date"""
+    __slots__ = ("cases", "row", "series", "center", "center_date", "filename", "link", "max_overall_prevalence_100k",
+                 "name", "new_last7days", "population", "title", "reff_4_7")
 
-    cumulative: List[int] = None
-    """list of cumulative cases over all time, since 05.03.2020"""
+    cases: np.ndarray
+    """the shared matrix (areas x days) of cumulative cases, which holds the data of this area in its `row`"""
 
-    daily: List[int] = None
-    """list of raw daily cases over all time, since 05.03.2020"""
+    row: int
+    """row index of this area in `cases`"""
 
-    filename: str = None
-    """file name where the plot/graphs get stored"""
+    series: Dict[str, np.ndarray]
+    """the shared matrices of derived series, rows like in `cases`, see `area_series()`;
+        empty until `DataMangled.materialize_all()`, then the properties below only slice them"""
 
-    incidence_sum7_1mio: int = None
-    """incidence sum of the last 7 days of the area's cases per million `population`"""
-
-    incidence_sum7_100k: int = None
-    """incidence sum of the last 7 days of the area's casesper 100,000 `population"""
+    center: float
+    """position of center day / 'expectation day' in the raw `daily` cases list"""
 
-    link: str =None
-    """HTML link for directly jumping to area"""
+    center_date: str
+    """`center` as date"""
 
-    incidence_sums: List[int] = None
-    """list of 7 day incidence case's sums over all time, since 05.03.2020"""
+    filename: str
+    """file name where the plot/graphs get stored"""
 
-    incidence_values: List[float] = None
-    """list of 7 day incidence values over all time, since 05.03.2020"""
+    link: str
+    """HTML link for directly jumping to area"""
 
-    max_overall_prevalence_100k: float = None
+    max_overall_prevalence_100k: float
     """maximum prevalence value over all areas of this type"""
 
-    name: str = None
+    name: str
     """name of the area"""
 
-    new_last7days: int = None
+    new_last7days: int
     """sum of new cases of last 7 days"""
 
-    population: int = None
-    """population of federal state"""
-
-    prevalence_1mio: float = None
-    """prevalence for `cumulative` cases per million `population`"""
+    population: int
+    """population of the area"""
 
-    prevalence_100k: float = None
-    """prevalence for `cumulative` cases per 100,000 `population`"""
-
-    title: str = None
+    title: str
     """title of area, for e.g. plotting, including namen and population"""
 
-    total: int = None
-    """total cases over time (last entry of `cumulative`)"""
-
-    reff_4_7: float = None
+    reff_4_7: float
     """reff_4_7 value of area, calculated by `Reff_4_7()`"""
 
-    rolling_mean7: pandas.DataFrame = None
-    """rolling mean of the last 7 days of the area's cases"""
-
-    rolling_mean14: pandas.DataFrame = None
-    """rolling mean of the last 14 days of the area's cases"""
-
-    weeklyIncidenceLimit1Per100k: float = None
-    """weekly 7 day incidence border #1 (35) """
-
-    weeklyIncidenceLimit2Per100k: float = None
-    """weekly 7 day incidence border #2 (50) """
-
-    weeklyIncidenceLimit3Per100k: float = None
-    """weekly 7 day incidence border #3 (100) """
-    
-    weeklyIncidenceLimit4Per100k: float = None
-    """weekly 7 day incidence border #4 (150) """
-    
-    weeklyIncidenceLimit5Per100k: float = None
-    """weekly 7 day incidence border #4 (165) """
-    
-    weeklyIncidenceLimit6Per100k: float = None
-    """weekly 7 day incidence border #5 (200) """
+    @property
+    def cumulative(self) -> List[int]:
+        """list of cumulative cases over all time, since 05.03.2020"""
+        return self.cases[self.row].tolist()
+
+    @property
+    def daily(self) -> List[int]:
+        """list of raw daily cases over all time, since 05.03.2020"""
+        if "daily" in self.series:
+            return self.series["daily"][self.row].tolist()
+        return cumulative_to_daily(self.cases[self.row]).tolist()
+
+    @property
+    def total(self) -> int:
+        """total cases over time (last entry of `cumulative`)"""
+        return int(self.cases[self.row, -1])
+
+    @property
+    def prevalence_1mio(self) -> float:
+        """prevalence for `cumulative` cases per million `population`"""
+        return self.total / self.population * 1000000.0
+
+    @property
+    def prevalence_100k(self) -> float:
+        """prevalence for `cumulative` cases per 100,000 `population`"""
+        return self.total / self.population * 100000.0
+
+    @property
+    def rolling_mean7(self) -> pandas.DataFrame:
+        """rolling mean of the last 7 days of the area's cases"""
+        if "rolling_mean7" in self.series:
+            return pandas.DataFrame(self.series["rolling_mean7"][self.row])
+        return pandas.DataFrame(self.daily).rolling(window=7, center=True).mean()
+
+    @property
+    def rolling_mean14(self) -> pandas.DataFrame:
+        """rolling mean of the last 14 days of the area's cases"""
+        if "rolling_mean14" in self.series:
+            return pandas.DataFrame(self.series["rolling_mean14"][self.row])
+        return pandas.DataFrame(self.daily).rolling(window=14, center=True).mean()
+
+    @property
+    def incidence_sums(self) -> List[int]:
+        """list of 7 day incidence case's sums over all time, since 05.03.2020"""
+        if "incidence_sums" in self.series:
+            return self.series["incidence_sums"][self.row].tolist()
+        return rolling_sums(daily_matrix(self.cases[self.row:self.row+1]), 7)[0].tolist()
+
+    @property
+    def incidence_values(self) -> List[float]:
+        """list of 7 day incidence values over all time, since 05.03.2020"""
+        if "incidence_values" in self.series:
+            return list(self.series["incidence_values"][self.row])
+        return list(np.round(np.array(self.incidence_sums) / self.population * 100000, 2))
+
+    @property
+    def incidence_sum7_1mio(self) -> float:
+        """incidence sum of the last 7 days of the area's cases per million `population`"""
+        return self.new_last7days / self.population * 1000000
+
+    @property
+    def incidence_sum7_100k(self) -> float:
+        """incidence sum of the last 7 days of the area's cases per 100,000 `population`"""
+        return self.new_last7days / self.population * 100000
+
+    def weeklyIncidenceLimit(self, number: int) -> float:
+        """weekly 7 day incidence border #`number` (1…6, see `WEEKLY_INCIDENCE_LIMITS_PER_100K`) in cases for the area's population"""
+        if "weeklyIncidenceLimits" in self.series:
+            return self.series["weeklyIncidenceLimits"][self.row, number-1]
+        return WEEKLY_INCIDENCE_LIMITS_PER_100K[number-1] * self.population / 100000
+
+    @property
+    def weeklyIncidenceLimit1Per100k(self) -> float:
+        """weekly 7 day incidence border #1 (35) """
+        return self.weeklyIncidenceLimit(1)
+
+    @property
+    def weeklyIncidenceLimit2Per100k(self) -> float:
+        """weekly 7 day incidence border #2 (50) """
+        return self.weeklyIncidenceLimit(2)
+
+    @property
+    def weeklyIncidenceLimit3Per100k(self) -> float:
+        """weekly 7 day incidence border #3 (100) """
+        return self.weeklyIncidenceLimit(3)
+
+    @property
+    def weeklyIncidenceLimit4Per100k(self) -> float:
+        """weekly 7 day incidence border #4 (150) """
+        return self.weeklyIncidenceLimit(4)
+
+    @property
+    def weeklyIncidenceLimit5Per100k(self) -> float:
+        """weekly 7 day incidence border #5 (165) """
+        return self.weeklyIncidenceLimit(5)
+
+    @property
+    def weeklyIncidenceLimit6Per100k(self) -> float:
+        """weekly 7 day incidence border #6 (200) """
+        return self.weeklyIncidenceLimit(6)
 
 
 class District(CovidDataArea):
     """structure to hold the pandemic data of a german district ('Kreis'), which may be a single city or a region of several small once"""
-    AGS: str = None
+
+    __slots__ = ("AGS", "type_name", "infections_bnn", "fed_states_infections", "fed_states_name",
+                 "fed_states__population", "sources")
+
+    AGS: str
     """AGS of length 5 with prefixed zeroes to fill the length of 5, if necessary. 
         'AGS'=='Amtlicher Gemeindeschlüssel'=='Community Identification Number' of the district, 
         https://en.wikipedia.org/wiki/Community_Identification_Number#Germany)
     """
 
-    type_name: str = None
+    type_name: str
     """'Bezeichnung', type of district"""
 
-    infections_bnn: int = None
+    infections_bnn: int
     """infections total of district from BNN""" # TODO: does it differ from `total` == `cumulative[-1]`?
 
-    fed_states_infections: int = None # TODO: just link federal state, as soon as it has been converted into a container class
+    fed_states_infections: int # TODO: just link federal state, as soon as it has been converted into a container class
     """infections total of the federal state ('Bundesland') the district lays in"""
 
-    fed_states_name: str = None # TODO: just link federal state, as soon as it has been converted into a container class
+    fed_states_name: str # TODO: just link federal state, as soon as it has been converted into a container class
     """name of the federal state ('Bundesland') the district lays in"""
 
-    fed_states__population: int = None # TODO: just link federal state, as soon as it has been converted into a container class
+    fed_states__population: int # TODO: just link federal state, as soon as it has been converted into a container class
     """population of the federal state ('Bundesland') the district lays in"""
 
-    sources: str = None
+    sources: str
     """HTML links to the sources of the data"""
 
 
-
 mangledData = DataMangled
 """global object to store the mangled main data once"""
 
@@ -255,12 +471,41 @@ def dates_list(ts):
     # ts.values[0]
     return dates
 
+def case_matrix(ts, datacolumns):
+    """
+    turn the cumulative cases of all districts in `ts` into one dense int32 matrix (districts x days),
+    plus a dictionary AGS (as int) --> row index into that matrix.
+
+    Built once, so that every later per-district lookup is a row slice, instead of a boolean scan over the whole `ts`.
+    """
+    cases = np.ascontiguousarray(ts[datacolumns].values.astype(np.int32))
+    AGS_row = {int(AGS): row for row, AGS in enumerate(ts["AGS"].tolist())}
+    return cases, AGS_row
+
+
+def cumulative_to_daily(cumulative):
+    """
+    daily new cases out of one row of cumulative cases, with 0 for the very first day
+    (like `AGS_to_ts_daily()`, which fills the nan of the first `diff()` with 0)
+    """
+    daily = np.zeros(len(cumulative), dtype=np.int64)
+    daily[1:] = np.diff(cumulative)
+    return daily
+
+
+def daily_matrix(cumulative):
+    """like `cumulative_to_daily()`, but for all rows of a matrix (areas x days) of cumulative cases at once"""
+    daily = np.zeros(cumulative.shape, dtype=np.int64)
+    daily[:, 1:] = np.diff(cumulative, axis=1)
+    return daily
+
+
 def AGS_to_ts_total(ts, AGS):
     """
     please instead see below and use
     AGS_to_cumulative(ts_rich, datacolumns, AGS)
     """
-    AGS = ("00000"+AGS)[-5:]
+    AGS = AGS_5digits(AGS)
     row = ts.loc[ts['AGS'] == AGS]
     return row.values[0][2:].astype('int').tolist()
 
@@ -270,7 +515,7 @@ def AGS_to_ts_daily(ts, AGS):
     please instead see below and use
     AGS_to_daily(ts_rich, datacolumns, AGS)
     """
-    AGS = ("00000"+AGS)[-5:]
+    AGS = AGS_5digits(AGS)
     row = ts.loc[ts['AGS'] == AGS]
 
     # TODO: Use 'datacolumns' instead of dropping
@@ -282,21 +527,64 @@ def AGS_to_ts_daily(ts, AGS):
     return diff.values[0].tolist()
 
 
-def AGS_to_population(bnn, AGS):
-    # AGS = ("00000"+AGS)[-5:]
-    AGS = int(AGS)
-    # print(AGS)
+def AGS_key(AGS):
+    """
+    The canonical key of a district, as which the AGS is used in all indexes (`ts_sorted`, `haupt`, `distances`,
+    `bnn`, `AGS_row`, the cached districts): the plain int, e.g. 1001.
+    Also accepts the numpy ints out of those tables, and strings like "01001" or "1001" (e.g. `ts["AGS"]`).
+    """
+    return AGS if type(AGS) is int else int(AGS)
+
+
+AGS_5digits_cache = dict()
+"""AGS --> zero-padded 5 digit string, see `AGS_5digits()`"""
+
+def AGS_5digits(AGS):
+    """the zero-padded string form of the district key, e.g. 1001 --> "01001", as in `ts["AGS"]` and in the filenames"""
     try:
-        row = bnn.loc[bnn['AGS'] == AGS]
-        pop = row["Population"].values[0]
-        inf = row["Infections"].values[0]
-        gen = row["GEN"].values[0]
-        bez = row["BEZ"].values[0]
-    except IndexError as e:
+        return AGS_5digits_cache[AGS]
+    except KeyError:
+        AGS_5digits_cache[AGS] = AGS_string = "%05i" % AGS_key(AGS)
+        return AGS_string
+
+
+bnn_metadata_cache = (None, dict())
+"""the last `bnn` table, and its metadata store built by `bnn_metadata()`"""
+
+def bnn_metadata(bnn):
+    """
+    AGS-keyed metadata store of the districts in `bnn`, built once per `bnn` table (which must not be changed
+    in place afterwards): AGS (as int) --> dictionary of the row's values (GEN, BEZ, Population, Bundesland,
+    Population_Bundesland, …, with the numpy types which `bnn.loc[…]` gives), plus the 'abbrev' of the type.
+
+    So the `AGS_to_…()` lookups below are O(1), instead of a boolean scan over the whole `bnn` each time.
+    """
+    global bnn_metadata_cache
+    if bnn_metadata_cache[0] is not bnn:
+        columns = {column: bnn[column].values for column in bnn.columns}
+        metadata = dict()
+        for i, AGS in enumerate(columns["AGS"]):
+            record = {column: values[i] for column, values in columns.items()}
+            record["abbrev"] = abbrev.get(record["BEZ"])
+            metadata.setdefault(AGS_key(AGS), record) # the first row wins, like with `.values[0]`
+        bnn_metadata_cache = (bnn, metadata)
+    return bnn_metadata_cache[1]
+
+
+def bnn_record(bnn, AGS):
+    """the metadata of the district out of `bnn_metadata()`; IndexError if `bnn` does not have it"""
+    AGS = AGS_key(AGS)
+    try:
+        return bnn_metadata(bnn)[AGS]
+    except KeyError:
         # e.g. 11006 Zehlendorf does not exist in 'GermanyKreisebene_Risklayer_bnn-20200425.csv'
         print(f"error for {AGS=}, not found in BNN file")
-        raise e from e
-    return gen, bez, inf, pop
+        raise IndexError(f"{AGS=} not found in BNN file") from None
+
+
+def AGS_to_population(bnn, AGS):
+    record = bnn_record(bnn, AGS)
+    return record["GEN"], record["BEZ"], record["Infections"], record["Population"]
 
 abbrev = {'Kreis': 'KR',
           'Kreisfreie Stadt' : 'KS',
@@ -304,18 +592,13 @@ abbrev = {'Kreis': 'KR',
           'Stadtkreis': 'SK'}
 
 def AGS_to_name_and_type(bnn, AGS):
-    gen, bez, inf, pop = AGS_to_population(bnn, AGS)    # fixme: replace with get_Kreis() and values out of there
-    return "%s_%s" % (gen, abbrev[bez])
+    record = bnn_record(bnn, AGS)
+    return "%s_%s" % (record["GEN"], abbrev[record["BEZ"]])
 
 
 def AGS_to_Bundesland(bnn, AGS):
-    # AGS = ("00000"+AGS)[-5:]
-    AGS = int(AGS)
-    row = bnn.loc[bnn['AGS'] == AGS]
-    name = row["Bundesland"].values[0]
-    inf_BL = row["Infections_Bundesland"].values[0]
-    pop_BL = row["Population_Bundesland"].values[0]
-    return name, inf_BL, pop_BL
+    record = bnn_record(bnn, AGS)
+    return record["Bundesland"], record["Infections_Bundesland"], record["Population_Bundesland"]
 
 
 def bulaLink(name):
@@ -323,59 +606,83 @@ def bulaLink(name):
 
 
 def sources_links(haupt, AGS):
-    AGS = int(AGS)
-    if AGS not in haupt.index:
-        return None
+    """
+    the HTML links to the web sources of the district, out of the mapping which `dataFiles.load_master_sheet_haupt()`
+    precomputes (for a `haupt` loaded otherwise, it gets built here once); None if `haupt` does not have the district
+    """
+    if "sources_links" not in haupt.attrs:
+        haupt.attrs["sources_links"] = dataFiles.sources_links_by_AGS(haupt)
+    return haupt.attrs["sources_links"].get(AGS_key(AGS))
 
-    links = []
-    for i, url in enumerate(haupt.loc[AGS].urls):
-        links.append('<a href="%s" target="_blank" title="%s">%d</a>' % (url, url, i + 1))
-    return ", ".join(links)
 
+def temporal_center_sums(daily):
+    """
+    the two sums of which `temporal_centers()` gets the quotient, for each row of a matrix (areas x days) of daily cases:
+    the sum of (day index * daily cases), and the sum of the daily cases; both without the first day.
+    Kept by `dataMangled()`, so that `extend_mangled()` only needs to add the new days to them.
+    """
+    ddata = daily[:, 1:]
+    productsum = ddata @ np.arange(1, ddata.shape[1] + 1) # index of day 1 is 1, etc.
+    return productsum, ddata.sum(axis=1)
 
-def temporal_center(data):
+
+def centers_from_sums(productsum, total, days):
+    """
+    `temporal_centers()` out of the sums of `temporal_center_sums()`, for a matrix with `days` columns
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        centers = productsum / total
+
+    # TODO: this could also be a signal that the source data is errorenous.
+    #       perhaps let it fail instead of this workaround to keep going?
+    for center in centers[centers < 0]:
+        print ("ALERT: centerday index negative = %.2f" % center)
+    centers[centers < 0] = 0
+    too_large = np.round(centers) > days-1
+    for center in centers[too_large]:
+        print ("ALERT: int(round(centerday)) index larger than array length = %.2f" % center)
+    centers[too_large] = days-1
+
+    return centers
+
+
+def temporal_centers(daily):
     """
-    find 'center' index of data by
-    multiplying height with index, and test_Reff(ts_sorted, datacolumns)dividing by sum of heights
+    find 'center' index of each row of a matrix (areas x days) of daily cases at once, by
+    multiplying height with index, and dividing by sum of heights.
+    The first day is dropped, as it has no daily value of its own (the nan of the first diff()).
 
     TODO: what to do with the negative values?
           Cut them out before summing perhaps?
           On the other hand, they (temporarily-)LOCALLY correct over-reported cases, right?
           So perhaps better to leave them in?
     """
-    ddata = data[1:] # drop the nan in the first cell, i.e. shift left
-    # print (ddata)
-    productsum = sum([d*(i+1) for i,d in enumerate(ddata)]) # add one i.e. shift right
-    center = productsum/sum(ddata) # + 1 - 1 # shift left and right equalize each other
-    # synthetic "data" with one peak near center:
-    signal = [0]*len(data)
+    productsum, total = temporal_center_sums(daily)
+    return centers_from_sums(productsum, total, daily.shape[1])
 
-    # TODO: this could also be a signal that the source data is errorenous.
-    #       perhaps let it fail instead of this workaround to keep going?
-    if center < 0:
-        print ("ALERT: centerday index negative = %.2f" % center)
-        center = 0
-    if int(round(center)) > len(data)-1:
-        print ("ALERT: int(round(centerday)) index larger than array length = %.2f" % center)
-        center = len(data)-1
 
-    signal[int(round(center))]=max(ddata)*0.25
-    return center, signal
+def temporal_center(data):
+    """
+    `temporal_centers()` for one single list of daily cases
+    """
+    return temporal_centers(np.array([data], dtype=np.float64))[0]
     
     
 def get_Kreis(AGS):
+    """
+    For the district with the given AGS, all data needed for plotting and/or data tables is gathered.
+    """
     global mangledData, max_overall_prevalence_100k
-    ags_int = int(AGS)
-    AGS = str(AGS)
+    AGS = AGS_key(AGS)
 
     # use cached version it it exists already
-    if ags_int in mangledData.districts:
-        cov_area = mangledData.districts[ags_int]
+    if AGS in mangledData.districts:
+        cov_area = mangledData.districts[AGS]
         # print('*'*12 + " returning known district from cache:", dstr.title)
     else:
 
         cov_area = District()
-        cov_area.AGS = "%05i" % ags_int
+        cov_area.AGS = AGS_5digits(AGS)
 
         # set max prevalence over all districts
         cov_area.max_overall_prevalence_100k = mangledData.max_district_prevalence_100k
@@ -383,45 +690,20 @@ def get_Kreis(AGS):
          # get data and names and base data
         cov_area.name, cov_area.type_name, cov_area.infections_bnn, cov_area.population = AGS_to_population(mangledData.bnn, AGS)
         cov_area.fed_states_name, cov_area.fed_states_infections, cov_area.fed_states__population = AGS_to_Bundesland(mangledData.bnn, AGS)
-        cov_area.daily = AGS_to_ts_daily(mangledData.ts, cov_area.AGS)
-        cov_area.cumulative = AGS_to_ts_total(mangledData.ts, cov_area.AGS)
-        cov_area.total = cov_area.cumulative[-1]
-
-        # calculate prevalence per 1 million population, 100,000 population
-        cov_area.prevalence_1mio = cov_area.total / cov_area.population * 1000000.0
-        cov_area.prevalence_100k = cov_area.total / cov_area.population * 100000.0
-
-        # calculate rolling means
-        cov_area.rolling_mean7 = pandas.DataFrame(cov_area.daily).rolling(window=7, center=True).mean()
-        cov_area.rolling_mean14 = pandas.DataFrame(cov_area.daily).rolling(window=14, center=True).mean()
-
-        # calculate 7-day incindence sums
-        incidences = pandas.DataFrame(cov_area.daily).rolling(window=7).sum()
-        cov_area.incidence_sums = list(map(int, incidences.fillna(0).values))
-        cov_area.incidence_values = [round(elm, 2) for elm in (incidences / cov_area.population * 100000).fillna(0).values.ravel()]
+        # the case numbers stay in the shared matrix, the district only refers to its row
+        cov_area.cases = mangledData.cases
+        cov_area.row = mangledData.AGS_row[AGS]
+        cov_area.series = mangledData.district_series
 
-        # calculate expectation day as center position and as date
-        cov_area.center, _ = temporal_center(cov_area.daily)
-        cov_area.center_date = mangledData.datacolumns.values[int(round(cov_area.center))]
+        # get expectation day as center position out of `mangledData`, and as date
+        cov_area.center = float(mangledData.ts_sorted["centerday"][AGS])
+        cov_area.center_date = mangledData.date_axis.labels[int(round(cov_area.center))]
 
         # get newest Reff_4_7 out of `mangledData`
-        cov_area.reff_4_7 = mangledData.ts_sorted["Reff_4_7_last"][ags_int]
+        cov_area.reff_4_7 = mangledData.ts_sorted["Reff_4_7_last"][AGS]
 
         # get sum of new cases of last 7 days out of `mangledData`
-        cov_area.new_last7days = mangledData.ts_sorted["new_last7days"][ags_int]
-
-        # calculate last 7 days' incidence per 1 million population, 100,000 population
-        cov_area.incidence_sum7_1mio = cov_area.new_last7days / cov_area.population * 1000000
-        cov_area.incidence_sum7_100k = cov_area.new_last7days / cov_area.population * 100000
-
-        # 7 day incidence borders
-        cov_area.weeklyIncidenceLimit1Per100k = WEEKLY_INCIDENCE_LIMIT1_PER_100K * cov_area.population / 100000
-        cov_area.weeklyIncidenceLimit2Per100k = WEEKLY_INCIDENCE_LIMIT2_PER_100K * cov_area.population / 100000
-        cov_area.weeklyIncidenceLimit3Per100k = WEEKLY_INCIDENCE_LIMIT3_PER_100K * cov_area.population / 100000
-        cov_area.weeklyIncidenceLimit4Per100k = WEEKLY_INCIDENCE_LIMIT4_PER_100K * cov_area.population / 100000
-        cov_area.weeklyIncidenceLimit5Per100k = WEEKLY_INCIDENCE_LIMIT5_PER_100K * cov_area.population / 100000
-        cov_area.weeklyIncidenceLimit6Per100k = WEEKLY_INCIDENCE_LIMIT6_PER_100K * cov_area.population / 100000
-
+        cov_area.new_last7days = mangledData.ts_sorted["new_last7days"][AGS]
 
         # get HTML links of district and data sources
         cov_area.link = districtDistances.kreis_link(mangledData.bnn, AGS)[2]
@@ -434,22 +716,58 @@ def get_Kreis(AGS):
 
         # TODO: add data source's name, description, license
 
-        mangledData.districts[ags_int] = cov_area
+        mangledData.districts[AGS] = cov_area
     return cov_area
 
 
-def join_tables_for_and_aggregate_Bundeslaender(ts, bnn):
+def state_membership(states):
+    """
+    membership index of districts in the federal states, out of the 'Bundesland' of each district:
+    returns the sorted names of the federal states (like the groups of a `groupby()`), and an array with
+    the index of each district's federal state in those names, -1 for a district without one (nan).
+    """
+    names = sorted(set(state for state in states if isinstance(state, str)))
+    index = {name: i for i, name in enumerate(names)}
+    return names, np.array([index.get(state, -1) for state in states], dtype=np.int64)
+
+
+def segmented_sums(matrix, segment, n_segments):
+    """
+    sums of the rows of `matrix` per segment, with `segment` giving the segment index of each row (-1: in none):
+    the rows get ordered by segment once, then one `np.add.reduceat()` sums each contiguous run; as int64.
+    """
+    order = np.argsort(segment, kind="stable")
+    order = order[segment[order] >= 0]
+    present, starts = np.unique(segment[order], return_index=True)
+    sums = np.zeros((n_segments, matrix.shape[1]), dtype=np.int64)
+    if len(order):
+        sums[present] = np.add.reduceat(matrix[order].astype(np.int64), starts, axis=0)
+    return sums
 
-    # careful, there might be more fields with nan (currently just the 3 copyright rows)
-    ts_int = copy.deepcopy(ts.dropna())
-    
-    ts_int["AGS"]=pandas.to_numeric(ts_int["AGS"]) # must transform string to int, for merge:
-    ts_BuLa = pandas.merge(ts_int, bnn[["AGS", "Bundesland", "Population"]], how="left", on=["AGS"])
 
-    Bundeslaender=ts_BuLa.drop(["AGS"], axis=1).groupby(["Bundesland"]).sum()
+def join_tables_for_and_aggregate_Bundeslaender(ts, bnn, cases, AGS_row):
+    """
+    `ts` with AGS as int, plus 'Bundesland' and 'Population' out of `bnn`; and the sums of the federal states (and 'Deutschland').
+    The date columns of both come out of the case matrix `cases` as one int block, the federal states get
+    summed up via the `state_membership()` of the districts.
+    """
+    # careful, there might be more fields with nan (currently just the 3 copyright rows)
+    ts_BuLa = ts.dropna()
+    AGS = [AGS_key(AGS) for AGS in ts_BuLa["AGS"].tolist()]
+    rows = [AGS_row[AGS] for AGS in AGS]
+    districts = bnn.drop_duplicates("AGS").set_index("AGS").reindex(AGS) # like a left merge on AGS
+    ts_BuLa = pandas.concat([pandas.DataFrame({"AGS": AGS, "ADMIN": ts_BuLa["ADMIN"].values}),
+                             pandas.DataFrame(cases[rows].astype(int), columns=ts.columns[2:]),
+                             pandas.DataFrame({"Bundesland": districts["Bundesland"].values, "Population": districts["Population"].values})],
+                            axis=1)
+
+    names, district_state = state_membership(ts_BuLa["Bundesland"].tolist())
+    values = np.hstack([cases[rows], ts_BuLa[["Population"]].values])
+    sums = segmented_sums(values, district_state, len(names))
+    Bundeslaender = pandas.DataFrame(sums, index=pandas.Index(names, name="Bundesland"), columns=ts.columns[2:].tolist() + ["Population"])
     print("consistency check, does this look like Germany's population? ", Bundeslaender["Population"].sum())
 
-    Bundeslaender.loc['Deutschland'] = Bundeslaender.sum().astype('int32').values.tolist()
+    Bundeslaender.loc['Deutschland'] = sums.sum(axis=0)
 
     return ts_BuLa, Bundeslaender
 
@@ -473,31 +791,18 @@ def get_BuLa(Bundeslaender: pandas.DataFrame, name, datacolumns):
             cov_area.filename = cov_area.filename.replace("bundesland_", "")
         cov_area.population = Bundeslaender.loc[name, "Population"]
 
-        row = Bundeslaender[datacolumns].loc[[name]]
-
-        cov_area.cumulative=row.values[0].astype('int').tolist()
-        diff = row.diff(axis=1).fillna(0).astype('int')
-        cov_area.daily = diff.values[0].tolist()
+        # the case numbers stay in the shared matrix of all federal states, the area only refers to its row
+        if name in mangledData.fed_row:
+            cov_area.cases, cov_area.row = mangledData.fed_cases, mangledData.fed_row[name]
+            cov_area.series = mangledData.fed_series
+        else: # e.g. for a `Bundeslaender` table which has not been mangled via `dataMangled()`
+            cov_area.cases, cov_area.row = Bundeslaender.loc[[name], datacolumns].values.astype(np.int64), 0
+            cov_area.series = dict()
 
         cov_area.title = name + " Population=%i" % cov_area.population
 
-        cov_area.total = cov_area.cumulative[-1]
-
-        # calculate prevalence per 1 million population, 100,000 population
-        cov_area.prevalence_1mio = cov_area.total / cov_area.population * 1000000.0
-        cov_area.prevalence_100k = cov_area.total / cov_area.population * 100000.0
-
-        # calculate rolling means
-        cov_area.rolling_mean7 = pandas.DataFrame(cov_area.daily).rolling(window=7, center=True).mean()
-        cov_area.rolling_mean14 = pandas.DataFrame(cov_area.daily).rolling(window=14, center=True).mean()
-
-        # calculate 7-day incindence sums
-        incidences = pandas.DataFrame(cov_area.daily).rolling(window=7).sum()
-        cov_area.incidence_sums = list(map(int, incidences.fillna(0).values))
-        cov_area.incidence_values = [round(elm, 2) for elm in (incidences / cov_area.population * 100000).fillna(0).values.ravel()]
-
-        # calculate expectation day as center position and as date
-        cov_area.center, _ = temporal_center(cov_area.daily)
+        # get expectation day as center position out of `Bundeslaender`, and as date
+        cov_area.center = float(Bundeslaender["centerday"][name])
         cov_area.center_date = datacolumns.values[int(round(cov_area.center))]
     
         # get newest Reff_4_7 out of `mangledData`
@@ -506,18 +811,6 @@ def get_BuLa(Bundeslaender: pandas.DataFrame, name, datacolumns):
         # get sum of new cases of last 7 days out of `mangledData`
         cov_area.new_last7days = Bundeslaender["new_last7days"][name]
 
-        # calculate last 7 days' incidence per 1 milllion population, 100,000 population
-        cov_area.incidence_sum7_1mio = cov_area.new_last7days / cov_area.population * 1000000
-        cov_area.incidence_sum7_100k = cov_area.new_last7days / cov_area.population * 100000
-
-        # 7 day incidence borders
-        cov_area.weeklyIncidenceLimit1Per100k = WEEKLY_INCIDENCE_LIMIT1_PER_100K * cov_area.population / 100000
-        cov_area.weeklyIncidenceLimit2Per100k = WEEKLY_INCIDENCE_LIMIT2_PER_100K * cov_area.population / 100000
-        cov_area.weeklyIncidenceLimit3Per100k = WEEKLY_INCIDENCE_LIMIT3_PER_100K * cov_area.population / 100000
-        cov_area.weeklyIncidenceLimit4Per100k = WEEKLY_INCIDENCE_LIMIT4_PER_100K * cov_area.population / 100000
-        cov_area.weeklyIncidenceLimit5Per100k = WEEKLY_INCIDENCE_LIMIT5_PER_100K * cov_area.population / 100000
-        cov_area.weeklyIncidenceLimit6Per100k = WEEKLY_INCIDENCE_LIMIT6_PER_100K * cov_area.population / 100000
-
         # get HTML link of federal state
         cov_area.link = bulaLink(name)
 
@@ -528,21 +821,6 @@ def get_BuLa(Bundeslaender: pandas.DataFrame, name, datacolumns):
 
 
 
-def add_centerday_column(ts, ts_BuLa):
-
-    ts_BuLa["centerday"] = [ temporal_center( AGS_to_ts_daily(ts, "%s" % AGS) )[0]
-                            for AGS in ts_BuLa["AGS"].tolist() ]
-    ts_sorted = ts_BuLa.sort_values("centerday", ascending=False).set_index("AGS")
-
-    return ts_sorted
-
-def add_centerday_column_Bundeslaender(Bundeslaender, datacolumns):
-    Bundeslaender["centerday"] = [get_BuLa(Bundeslaender, name, datacolumns).center
-                                  for name in Bundeslaender.index.tolist() ]
-    Bundeslaender.sort_values("centerday", ascending=False, inplace=True)
-    return Bundeslaender
-
-
 # def maxdata(ts_sorted):
 #     maxvalue = max(ts_sorted[ts.columns[2:]].max())
 #     digits=int(1 + numpy.log10(maxvalue))
@@ -600,14 +878,6 @@ def multiDayNewCases(cumulative, daysBack=7):
     return newCases
 
 
-def add_weekly_columns(ts_rich, datacolumns):
-
-    for days in (14, 7):
-        ts_rich["new_last%ddays" % days] = [multiDayNewCases( AGS_to_cumulative(ts_rich, datacolumns, AGS), days)
-                                           for AGS in ts_rich.index.values.tolist() ]
-    return ts_rich
-
-
 def BL_to_cumulative(Bundeslaender_rich, datacolumns, BL_name):
     """
     now also accepts tables with additional columns
@@ -688,16 +958,84 @@ def Reff_7_4(cumulative, i=None):
 
 
 
+def rolling_sums(data, window):
+    """
+    sums over the `window` days up to and including each day, for all rows of a matrix (areas x days) at once.
+    That is the convolution with a box window of length `window`, done as difference of cumulative sums.
+    The first `window`-1 days, which have no complete window, are 0.
+    """
+    cs = np.zeros((data.shape[0], data.shape[1] + 1), dtype=data.dtype)
+    np.cumsum(data, axis=1, out=cs[:, 1:])
+    sums = np.zeros(data.shape, dtype=data.dtype)
+    sums[:, window-1:] = cs[:, window:] - cs[:, :-window]
+    return sums
+
+
+def shifted(data, days):
+    """matrix (areas x days) shifted by `days` to the right, i.e. day i holds the value of day i-`days`; padded with 0"""
+    result = np.zeros(data.shape, dtype=data.dtype)
+    result[:, days:] = data[:, :-days]
+    return result
+
+
+def lagged_quotient(now, before, first_day):
+    """quotient now/before for every day from `first_day` on, where `before` is not 0; nan otherwise"""
+    quotient = np.full(now.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        quotient[:, first_day:] = np.where(before[:, first_day:] != 0,
+                                           now[:, first_day:] / before[:, first_day:], np.nan)
+    return quotient
+
+
+def Reff_4_4_series(daily):
+    """`Reff_4_4()` for all days of all rows of a matrix (areas x days) of daily cases at once"""
+    sums4 = rolling_sums(daily, 4)
+    return lagged_quotient(sums4, shifted(sums4, 4), first_day=7)
+
+
+def Reff_4_window_series(daily, window=7):
+    """like `Reff_4_7_series()`, but smoothed over `window` days instead of 7"""
+    avg_gen_size = rolling_sums(daily.clip(min=0), window) / float(window)
+    return lagged_quotient(avg_gen_size, shifted(avg_gen_size, 4), first_day=window+3)
+
+
+def Reff_4_7_series(daily):
+    """`Reff_4_7()` for all days of all rows of a matrix (areas x days) of daily cases at once"""
+    return Reff_4_window_series(daily, window=7)
+
+
+def Reff_7_4_series(cumulative):
+    """
+    `Reff_7_4()` for all days of all rows of a matrix (areas x days) of cumulative cases at once.
+    Where the weekly differences have opposite signs, this gives nan (and not a complex number like `Reff_7_4()`).
+    """
+    weekly = np.zeros(cumulative.shape, dtype=np.int64)
+    weekly[:, 7:] = cumulative[:, 7:] - cumulative[:, :-7]
+    with np.errstate(invalid='ignore'):
+        return lagged_quotient(weekly, shifted(weekly, 7), first_day=14) ** (4/7)
+
+
+def Reff_series(cumulative):
+    """
+    complete R_eff time series of all rows of a matrix (areas x days) of cumulative cases.
+    returns dictionary 'Reff_4_4', 'Reff_4_7', 'Reff_7_4' --> matrix of the same shape as `cumulative`
+    """
+    daily = daily_matrix(cumulative)
+    return {"Reff_4_4": Reff_4_4_series(daily),
+            "Reff_4_7": Reff_4_7_series(daily),
+            "Reff_7_4": Reff_7_4_series(cumulative)}
+
 
 def Reff_comparison(daily, cumulative, title, filename=None):
     daily_SMA=pandas.DataFrame(daily).rolling(window=7, center=True).mean()[0].values.tolist()
     # daily_SMA
     # list(zip(cumulative,daily, daily_SMA))
 
-    R1=[Reff_4_4(daily, i) for i, _ in enumerate(daily)]
-    R2=[Reff_4_7(daily, i) for i, _ in enumerate(daily)]
+    Reffs = Reff_series(np.array([cumulative], dtype=np.int64))
+    R1=Reffs["Reff_4_4"][0]
+    R2=Reffs["Reff_4_7"][0]
     R3=[Reff_4_4(daily_SMA, i) for i, _ in enumerate(daily_SMA)]
-    R4=[Reff_7_4(cumulative, i) for i, _ in enumerate(cumulative)]
+    R4=Reffs["Reff_7_4"][0]
 
     from matplotlib import pyplot as plt
     # matplotlib.pyplot.plot(R1)
@@ -714,7 +1052,7 @@ def Reff_comparison(daily, cumulative, title, filename=None):
     else:
         fig.savefig(os.path.join(dataFiles.PICS_PATH, "R_experiments_" + filename),  bbox_inches='tight')
 
-    print (Reff_4_7(daily), list(reversed(R2)))
+    print (Reff_4_7(daily), list(reversed(R2.tolist())))
 
 
 def test_Reff_Kreis(ts_sorted, datacolumns):
@@ -782,7 +1120,7 @@ def test_some_mangling():
     dailyIncrease = AGS_to_ts_daily(ts, "00000")
     print (len(dailyIncrease))
 
-    center, signal = temporal_center(dailyIncrease)
+    center = temporal_center(dailyIncrease)
     print ("expectation value at day %.2f" % center)
     # exit()
 
@@ -795,8 +1133,7 @@ def test_some_mangling():
     print (dstr.title, dstr.filename, dstr.population)
 
     print ("\nBundesländer")
-    ts_BuLa, Bundeslaender = join_tables_for_and_aggregate_Bundeslaender(ts, bnn)
-
+    Bundeslaender = dm.Bundeslaender_sorted
 
     fed = get_BuLa(Bundeslaender, "Hessen", dm.datacolumns)
     print (fed.daily, fed.cumulative)
@@ -831,65 +1168,412 @@ def test_some_mangling():
         test_Reff_BL(dm.Bundeslaender_sorted, dm.datacolumns, BL=BL, filename=BL+".png")
     
     
-def additionalColumns(ts,bnn):
+def Reff_4_window_last(daily, window=7):
+    """
+    `Reff_4_7()` of the very last day, but smoothed over `window` days instead of 7,
+    for all rows of a matrix (areas x days) of daily cases at once (or for any array with the days on its last axis)
+    """
+    if daily.shape[-1] < window + 4:
+        return np.full(daily.shape[:-1], np.nan)
+    d = daily[..., -(window+4):].clip(min=0)
+    avg_gen_size_now = d[..., -window:].sum(axis=-1) / float(window)
+    avg_gen_size_before = d[..., :window].sum(axis=-1) / float(window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(avg_gen_size_before != 0, avg_gen_size_now / avg_gen_size_before, np.nan)
+
+
+def Reff_4_7_last(daily):
+    """
+    `Reff_4_7()` of the very last day, for all rows of a matrix (areas x days) of daily cases at once
+    """
+    return Reff_4_window_last(daily, window=7)
+
+
+REFF_ENSEMBLE_WINDOWS = (3, 5, 7, 9, 11)
+"""smoothing window sizes (in days) of the R_eff ensemble, see `Reff_ensemble_last()`"""
+
+def Reff_ensemble_last(daily, windows=REFF_ENSEMBLE_WINDOWS, samples=500, confidence=95, seed=0):
+    """
+    the R_eff ensemble of the very last day, for all rows of a matrix (areas x days) of daily cases at once:
+    `Reff_4_window_last()` for each of the smoothing `windows`, each with a bootstrap confidence interval.
+
+    The bootstrap is parametric: each (clipped) daily value of the last days is redrawn `samples` times as
+    Poisson count with that value as mean, for all areas and days in one go; the percentiles of the
+    quotients over all those draws give the interval. Fixed `seed`, so the same data always gives the same intervals.
+
+    returns dictionary column name --> array with one value per area (row of `daily`), with the columns
+        'Reff_4_<w>_last', 'Reff_4_<w>_low', 'Reff_4_<w>_high' for each window size w
+    """
+    span = min(max(windows) + 4, daily.shape[1])
+    d = daily[:, -span:].clip(min=0)
+    draws = np.random.RandomState(seed).poisson(d, size=(samples,) + d.shape)
+    percentiles = [(100 - confidence) / 2, 100 - (100 - confidence) / 2]
+
+    columns = dict()
+    for window in windows:
+        columns["Reff_4_%d_last" % window] = Reff_4_window_last(daily, window)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning) # all-nan areas just get nan intervals
+            low, high = np.nanpercentile(Reff_4_window_last(draws, window), percentiles, axis=0)
+        columns["Reff_4_%d_low" % window], columns["Reff_4_%d_high" % window] = low, high
+    return columns
+
+
+TRAILING_DAYS = 32
+"""the derived columns of `trailing_columns()` only depend on (less than) this many last days"""
+
+def trailing_columns(cumulative, withReffEnsemble=False):
+    """
+    the part of `derived_columns()` which only looks at the last `TRAILING_DAYS` days, so
+    `extend_mangled()` can update it without going through the whole history.
+    """
+    cumulative = cumulative[:, -TRAILING_DAYS:]
+    daily = daily_matrix(cumulative)
+    columns = dict()
+    for days in (14, 7):
+        columns["new_last%ddays" % days] = cumulative[:, -1] - cumulative[:, -days-1]
+    columns["Reff_4_7_last"] = Reff_4_7_last(daily)
+    if withReffEnsemble:
+        columns.update(Reff_ensemble_last(daily))
+    return columns
+
+
+def derived_columns(cumulative, withReffEnsemble=False):
+    """
+    batched engine for the derived columns of many areas (districts, or federal states) at once.
+
+    :param cumulative: matrix (areas x days) of cumulative cases, e.g. `DataMangled.cases`
+    :param withReffEnsemble: also add the columns of `Reff_ensemble_last()`
+    :returns: dictionary of column name --> array with one value per area (i.e. per row of `cumulative`),
+              same values as the one-area-at-a-time `temporal_center()`, `multiDayNewCases()` and `Reff_4_7()`
+    """
+    columns = dict()
+    columns["centerday"] = temporal_centers(daily_matrix(cumulative))
+    columns.update(trailing_columns(cumulative, withReffEnsemble))
+    return columns
+
+
+def with_derived_columns(table, cumulative, withReffEnsemble=False, centerdayLast=False):
+    """
+    `table` plus the `derived_columns()` of the `cumulative` cases of its rows, with the new case sums as int,
+    concatenated in one go into one consolidated frame, i.e. one block per dtype, for fast row access.
+    With `centerdayLast`, "centerday" comes after the other derived columns, as the federal states table always had it.
+    """
+    columns = derived_columns(cumulative, withReffEnsemble)
+    columns["new_last14days"] = columns["new_last14days"].astype(int)
+    columns["new_last7days"] = columns["new_last7days"].astype(int)
+    if centerdayLast:
+        columns["centerday"] = columns.pop("centerday")
+    return pandas.concat([table, pandas.DataFrame(columns, index=table.index)], axis=1).copy()
+
+
+def area_series(cumulative, population):
+    """
+    batched engine for the series which the `CovidDataArea` views show, for many areas at once.
+
+    :param cumulative: matrix (areas x days) of cumulative cases, e.g. `DataMangled.cases`
+    :param population: array with the population of each area (i.e. of each row of `cumulative`)
+    :returns: dictionary of series name --> matrix with one row per area, same values as the
+              one-area-at-a-time properties of `CovidDataArea`
+    """
+    population = np.asarray(population)
+    daily = daily_matrix(cumulative)
+    series = {"daily": daily}
+    # pandas rolls each column on its own, so transpose, to get the whole matrix done in one call
+    for window in (7, 14):
+        series["rolling_mean%d" % window] = np.ascontiguousarray(
+            pandas.DataFrame(daily.T).rolling(window=window, center=True).mean().values.T)
+    series["incidence_sums"] = rolling_sums(daily, 7)
+    series["incidence_values"] = np.round(series["incidence_sums"] / population[:, np.newaxis] * 100000, 2)
+    series["weeklyIncidenceLimits"] = np.array(WEEKLY_INCIDENCE_LIMITS_PER_100K) * population[:, np.newaxis] / 100000
+    return series
+
+
+def additionalColumns(ts, bnn, cases=None, AGS_row=None, withReffEnsemble=False):
     """
     this can operate on data in RAM
+
+    `cases` and `AGS_row` are the result of `case_matrix()`; if not given, they get built here.
+    `withReffEnsemble` adds the R_eff ensemble columns with confidence intervals, see `Reff_ensemble_last()`.
     """
     dates = dates_list(ts)
     datacolumns = ts.columns[2:]
     print ("\nNewest column = '%s'" % datacolumns[-1])
-    ts_BuLa, Bundeslaender = join_tables_for_and_aggregate_Bundeslaender(ts, bnn)
+    if cases is None or AGS_row is None:
+        cases, AGS_row = case_matrix(ts, datacolumns)
+    ts_BuLa, Bundeslaender = join_tables_for_and_aggregate_Bundeslaender(ts, bnn, cases, AGS_row)
+
+    # the date columns are int already, so only the derived columns get added, all in one go
+    ts_BuLa = ts_BuLa.set_index("AGS")
+    rows = [AGS_row[AGS] for AGS in ts_BuLa.index.tolist()]
+    ts_sorted = with_derived_columns(ts_BuLa, cases[rows], withReffEnsemble)
+    ts_sorted.sort_values("centerday", ascending=False, inplace=True)
+
+    Bundeslaender_sorted = with_derived_columns(Bundeslaender, Bundeslaender[datacolumns].values, withReffEnsemble, centerdayLast=True)
+    Bundeslaender_sorted.sort_values("centerday", ascending=False, inplace=True)
+
+    return  ts, bnn, ts_sorted, Bundeslaender_sorted, dates, datacolumns
+
+RANKING_METRICS = ("new cases", "incidence_1mio_last7days", "incidence_1mio_last14days", "Reff_4_7_last", "prevalence_1mio", "centerday")
+"""the measures by which districts and federal states get ranked, see `rankings()`"""
+
+def ranking_metrics(table, datacolumns):
+    """
+    the measures of a mangled table (`ts_sorted` or `Bundeslaender_sorted`) which are not columns of it:
+    new cases of the newest day, incidences of the last 7 and 14 days, and prevalence; per 1 million population.
+    Returns a dictionary of Series, in the row order of `table`.
+    """
+    metrics = dict()
+    metrics["incidence_1mio_last14days"] = 1000000*table["new_last14days"]/table["Population"]
+    metrics["incidence_1mio_last7days"] = 1000000*table["new_last7days"]/table["Population"]
+    metrics["prevalence_1mio"] = 1000000*table[datacolumns[-1]]/table["Population"]
+    metrics["new cases"] = table[datacolumns[-1]] - table[datacolumns[-2]]
+    return metrics
+
+
+def rankings(table, datacolumns):
+    """
+    rank arrays for all `RANKING_METRICS`: metric --> row positions of `table`, by descending metric (nan last,
+    ties in the row order of `table`). So top n queries and sorted orders are index gathers like
+    `table.iloc[ranks[metric][:n]]`, instead of sorting the whole frame.
+    """
+    metrics = ranking_metrics(table, datacolumns)
+    ranks = dict()
+    for metric in RANKING_METRICS:
+        values = table[metric] if metric in table.columns else metrics[metric]
+        ranks[metric] = np.argsort(-values.values.astype(np.float64), kind="stable")
+    return ranks
+
+
+def mangling_code_key(withSynthetic=False, withReffEnsemble=False):
+    """
+    hash over the code which loads and mangles the data, the libraries which pickle it, and the parameters.
+    Two `DataMangled` with the same code key differ only by their input data.
+    """
+    parts = [dataFiles.hash_file(__file__), dataFiles.hash_file(dataFiles.__file__)]
+    parts += [pandas.__version__, np.__version__, "withSynthetic=%s" % withSynthetic, "withReffEnsemble=%s" % withReffEnsemble]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+def mangled_cache_key(withSynthetic=False, haupt=None, haupt_timestamp="", withReffEnsemble=False):
+    """
+    the key under which `dataMangled()` caches its result on disk: a hash over the content of
+    the input files (ts, bnn, haupt), plus the `mangling_code_key()`.
+    Returns None if an input file is missing, then there is nothing to cache.
+    """
+    try:
+        parts = [dataFiles.hash_file(dataFiles.TS_NEWEST), dataFiles.hash_file(dataFiles.BNN_FILE)]
+        if haupt is None:
+            parts.append(dataFiles.hash_file(dataFiles.HAUPT_FILES % haupt_timestamp))
+        else:
+            parts.append(hashlib.sha256(haupt.to_csv().encode()).hexdigest())
+    except OSError as e:
+        print ("not caching the mangled data:", type(e), e)
+        return None
+    parts.append(mangling_code_key(withSynthetic, withReffEnsemble))
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+def add_federal_state_matrices_and_maxima(dm: DataMangled):
+    """the parts of `DataMangled` which follow from its tables, once `ts_sorted` and `Bundeslaender_sorted` are final"""
+    Bundeslaender = dm.Bundeslaender_sorted
+    dm.fed_row = {name: row for row, name in enumerate(Bundeslaender.index.tolist())}
+    dm.fed_cases = np.ascontiguousarray(Bundeslaender[dm.datacolumns].values.astype(np.int64))
+    dm.state_names, states = state_membership(dm.ts_sorted["Bundesland"].tolist())
+    dm.district_state = np.full(len(dm.AGS_row), -1, dtype=np.int64)
+    dm.district_state[[dm.AGS_row[AGS] for AGS in dm.ts_sorted.index]] = states
+    dm.district_rankings = rankings(dm.ts_sorted, dm.datacolumns)
+    dm.fed_rankings = rankings(dm.Bundeslaender_sorted, dm.datacolumns)
+
+    max_date = dm.datacolumns[-1]
+    data = dm.ts_sorted
+    dm.max_district_prevalence_100k = max(data[max_date] / data['Population']) * 100000
+    data = dm.Bundeslaender_sorted
+    dm.max_federal_state_prevalence_100k = max(data[max_date] / data['Population']) * 100000
 
-    ts_sorted = add_centerday_column(ts, ts_BuLa)
-    ts_sorted = add_weekly_columns(ts_sorted, datacolumns)
-    ts_sorted = add_column_Kreise(ts_sorted, datacolumns, inputseries=AGS_to_daily, operatorname="Reff_4_7_last", operator=Reff_4_7)
 
-    Bundeslaender_sorted = add_weekly_columns_Bundeslaender(Bundeslaender, datacolumns)
-    Bundeslaender_sorted = add_column_Bundeslaender(Bundeslaender_sorted , datacolumns, inputseries=BL_to_daily, operatorname="Reff_4_7_last", operator=Reff_4_7)
+def mangle(ts, bnn, haupt, withReffEnsemble=False):
+    """
+    the full build of a `DataMangled` out of the loaded data, see `dataMangled()`
+    """
+    cases, AGS_row = case_matrix(ts, ts.columns[2:])
+    dm = DataMangled(*additionalColumns(ts, bnn, cases, AGS_row, withReffEnsemble), haupt, cases=cases, AGS_row=AGS_row)
+    add_federal_state_matrices_and_maxima(dm)
+
+    # complete R_eff time series, for districts and federal states
+    dm.Reff_districts = Reff_series(cases)
+    dm.Reff_feds = Reff_series(dm.fed_cases)
+
+    # kept for `extend_mangled()`
+    dm.center_productsums = temporal_center_sums(daily_matrix(cases))[0]
+    dm.fed_center_productsums = temporal_center_sums(daily_matrix(dm.fed_cases))[0]
+    return dm
+
+
+def extend_mangled(previous: DataMangled, ts, bnn, haupt, withReffEnsemble=False):
+    """
+    incremental update: if `ts` is the data of `previous`, with the same districts and unchanged history,
+    just with some new days at the end, then the new days get appended to `previous` (not changing it),
+    and only the derived columns which depend on the last days get recalculated; the center days
+    are continued via their running sums. Same result as `mangle()`, just faster.
 
+    returns the new `DataMangled`, or None if the data is not such an extension (then a full rebuild is needed)
+    """
+    datacolumns = ts.columns[2:]
+    old_columns = previous.datacolumns
+    days = len(datacolumns) - len(old_columns)
+    reason = None
+    if days < 1 or ts.columns[:len(previous.ts.columns)].tolist() != previous.ts.columns.tolist():
+        reason = "not just new days appended"
+    elif ts["AGS"].tolist() != previous.ts["AGS"].tolist() or ts["ADMIN"].tolist() != previous.ts["ADMIN"].tolist():
+        reason = "districts differ"
+    elif not bnn.equals(previous.bnn):
+        reason = "bnn differs"
+    else:
+        cases, AGS_row = case_matrix(ts, datacolumns)
+        if not np.array_equal(cases[:, :-days], previous.cases):
+            reason = "history has been revised"
+    if reason is not None:
+        print ("incremental update not possible (%s), full rebuild." % reason)
+        return None
+    print ("\nNewest column = '%s', %d new day(s) appended incrementally" % (datacolumns[-1], days))
+    new_columns = datacolumns[-days:]
+    day_indices = np.arange(len(datacolumns) - days, len(datacolumns))
+
+    # districts, in the row order of `ts`, like before sorting in `additionalColumns()`
+    ts_sorted = previous.ts_sorted.iloc[np.argsort([AGS_row[AGS] for AGS in previous.ts_sorted.index])]
+    rows = [AGS_row[AGS] for AGS in ts_sorted.index]
+    position = ts_sorted.columns.get_loc(old_columns[-1]) + 1
+    new_values = pandas.DataFrame(cases[rows, -days:].astype(int), index=ts_sorted.index, columns=new_columns)
+    ts_sorted = pandas.concat([ts_sorted.iloc[:, :position], new_values, ts_sorted.iloc[:, position:]], axis=1)
+
+    center_productsums = previous.center_productsums + daily_matrix(cases[:, -days-1:])[:, 1:] @ day_indices
+    total = cases[rows, -1].astype(np.int64) - cases[rows, 0]
+    columns = {"centerday": centers_from_sums(center_productsums[rows], total, len(datacolumns))}
+    columns.update(trailing_columns(cases[rows], withReffEnsemble))
+    for column, values in columns.items():
+        ts_sorted[column] = values
     ts_sorted["new_last14days"] = ts_sorted["new_last14days"].astype(int)
     ts_sorted["new_last7days"] = ts_sorted["new_last7days"].astype(int)
-    Bundeslaender_sorted["new_last14days"] = Bundeslaender_sorted["new_last14days"].astype(int)
-    Bundeslaender_sorted["new_last7days"] = Bundeslaender_sorted["new_last7days"].astype(int)
+    ts_sorted = ts_sorted.sort_values("centerday", ascending=False).copy() # the copy is consolidated, see `with_derived_columns()`
+
+    # federal states, in the order of `join_tables_for_and_aggregate_Bundeslaender()`; same districts, same membership index
+    names = previous.state_names + ["Deutschland"]
+    Bundeslaender = previous.Bundeslaender_sorted.loc[names]
+    fed_rows = {name: row for row, name in enumerate(names)}
+    new_fed_values = previous.state_sums(cases[:, -days:])
+    position = Bundeslaender.columns.get_loc(old_columns[-1]) + 1
+    new_values = pandas.DataFrame(new_fed_values, index=Bundeslaender.index, columns=new_columns)
+    Bundeslaender = pandas.concat([Bundeslaender.iloc[:, :position], new_values, Bundeslaender.iloc[:, position:]], axis=1)
+
+    fed_cases = Bundeslaender[datacolumns].values.astype(np.int64)
+    previous_fed_rows = [previous.fed_row[name] for name in names]
+    fed_center_productsums = previous.fed_center_productsums[previous_fed_rows] + daily_matrix(fed_cases[:, -days-1:])[:, 1:] @ day_indices
+    columns = {"centerday": centers_from_sums(fed_center_productsums, fed_cases[:, -1] - fed_cases[:, 0], len(datacolumns))}
+    columns.update(trailing_columns(fed_cases, withReffEnsemble))
+    for column, values in columns.items():
+        Bundeslaender[column] = values
+    Bundeslaender["new_last14days"] = Bundeslaender["new_last14days"].astype(int)
+    Bundeslaender["new_last7days"] = Bundeslaender["new_last7days"].astype(int)
+    Bundeslaender.sort_values("centerday", ascending=False, inplace=True)
 
-    for datecol in datacolumns:
-        ts_sorted[datecol]=ts_sorted[datecol].astype(int)
-        Bundeslaender_sorted[datecol]=Bundeslaender_sorted[datecol].astype(int)
+    dm = DataMangled(ts, bnn, ts_sorted, Bundeslaender, dates_list(ts), datacolumns, haupt, cases=cases, AGS_row=AGS_row)
+    add_federal_state_matrices_and_maxima(dm)
 
-    Bundeslaender_sorted = add_centerday_column_Bundeslaender(Bundeslaender_sorted, datacolumns)
+    # the R_eff series only need the last days before each new day, see `TRAILING_DAYS`
+    trailing = Reff_series(cases[:, -(days + TRAILING_DAYS):])
+    dm.Reff_districts = {name: np.hstack([series, trailing[name][:, -days:]]) for name, series in previous.Reff_districts.items()}
+    sorted_rows = [fed_rows[name] for name in dm.Bundeslaender_sorted.index]
+    trailing = Reff_series(dm.fed_cases[:, -(days + TRAILING_DAYS):])
+    dm.Reff_feds = {name: np.hstack([series[previous_fed_rows][sorted_rows], trailing[name][:, -days:]])
+                    for name, series in previous.Reff_feds.items()}
 
-    return  ts, bnn, ts_sorted, Bundeslaender_sorted, dates, datacolumns
+    dm.center_productsums = center_productsums
+    dm.fed_center_productsums = fed_center_productsums[sorted_rows]
+    return dm
 
-def dataMangled(withSynthetic=False, ifPrint=True, haupt=None, haupt_timestamp=""):
+
+def dataMangled(withSynthetic=False, ifPrint=True, haupt=None, haupt_timestamp="", withReffEnsemble=False, useCache=True):
     """
     this loads from disk first
 
     Notes:
         * if `haupt` is None, `dataFiles.load_master_sheet_haupt(timestamp=haupt_timestamp)` is used for it
         * haupt_timestamp=="" means newest
+        * withReffEnsemble=True adds the R_eff ensemble columns, see `Reff_ensemble_last()`
+        * with useCache=True, the result is stored on disk (`dataFiles.MANGLED_CACHE_FILE`), and as long
+          as the inputs and the code do not change (see `mangled_cache_key()`), it is loaded from there.
+          If the inputs did change, but the new data only appends days to the cached, the cached
+          gets extended, see `extend_mangled()`
 
     """
     global mangledData
     if mangledData.ts is not None:
         return mangledData
 
-    ts, bnn = dataFiles.data(withSynthetic=withSynthetic, ifPrint=ifPrint)
+    cache_key = mangled_cache_key(withSynthetic, haupt, haupt_timestamp, withReffEnsemble) if useCache else None
+    if cache_key is not None:
+        cached = dataFiles.load_cached(cache_key)
+        if cached is not None:
+            print ("mangled data loaded from cache, newest column = '%s'" % cached.datacolumns[-1])
+            mangledData = cached
+            return mangledData
 
-    # set max prevalence over all district, fed states
+    ts, bnn = dataFiles.data(withSynthetic=withSynthetic, ifPrint=ifPrint)
 
     if haupt is None:
         haupt = dataFiles.load_master_sheet_haupt(timestamp=haupt_timestamp)
-    mangledData = DataMangled(*additionalColumns(ts, bnn), haupt)
 
-    max_date = mangledData.datacolumns[-1]
-    data = mangledData.ts_sorted
-    mangledData.max_district_prevalence_100k = max(data[max_date] / data['Population']) * 100000
-    data = mangledData.Bundeslaender_sorted
-    mangledData.max_federal_state_prevalence_100k = max(data[max_date] / data['Population']) * 100000
+    dm = None
+    if cache_key is not None:
+        previous = dataFiles.load_cached()
+        code_key = mangling_code_key(withSynthetic, withReffEnsemble)
+        if previous is not None and getattr(previous, "code_key", "") == code_key:
+            dm = extend_mangled(previous, ts, bnn, haupt, withReffEnsemble)
+    if dm is None:
+        dm = mangle(ts, bnn, haupt, withReffEnsemble)
+    dm.code_key = mangling_code_key(withSynthetic, withReffEnsemble)
+    mangledData = dm
+
+    if cache_key is not None:
+        dataFiles.store_cached(cache_key, mangledData)
 
     return mangledData
 
 
+def test_state_sums():
+    """compares the segmented sums of `DataMangled.state_sums()` with a pandas `groupby("Bundesland").sum()`"""
+    dm = dataMangled(ifPrint=False)
+    grouped = dm.ts_sorted.groupby("Bundesland")[dm.datacolumns].sum()
+    expected = np.vstack([grouped.loc[dm.state_names].values, grouped.values.sum(axis=0)])
+    print ("state sums equal:", np.array_equal(dm.state_sums(dm.cases), expected))
+    print ("same as fed_cases:", np.array_equal(dm.state_sums(dm.cases), dm.fed_cases[[dm.fed_row[name] for name in dm.state_names + ["Deutschland"]]]))
+
+
+def test_extend_mangled(days=1):
+    """
+    compares `extend_mangled()` with the full `mangle()`, for the newest data with the last `days` days held back
+    """
+    ts, bnn = dataFiles.data(withSynthetic=False, ifPrint=False)
+    haupt = dataFiles.load_master_sheet_haupt(timestamp="")
+    previous = mangle(ts.drop(columns=ts.columns[-days:]), bnn, haupt)
+    extended = extend_mangled(previous, ts, bnn, haupt)
+    full = mangle(ts, bnn, haupt)
+    for name in ("ts_sorted", "Bundeslaender_sorted"):
+        print (name, "equal:", getattr(extended, name).equals(getattr(full, name)))
+    for name in ("cases", "fed_cases", "center_productsums", "fed_center_productsums"):
+        print (name, "equal:", np.array_equal(getattr(extended, name), getattr(full, name)))
+    def equal_with_nan(a, b): # np.array_equal(..., equal_nan=True) needs numpy 1.19
+        nan = np.isnan(a)
+        return a.shape == b.shape and np.array_equal(nan, np.isnan(b)) and np.array_equal(a[~nan], b[~nan])
+    for name in full.Reff_districts:
+        print (name, "equal:", equal_with_nan(extended.Reff_districts[name], full.Reff_districts[name]),
+                              equal_with_nan(extended.Reff_feds[name], full.Reff_feds[name]))
+
+    revised = ts.copy()
+    revised[revised.columns[3]] += 1
+    print ("revised history gets rejected:", extend_mangled(previous, revised, bnn, haupt) is None)
+
 
 if __name__ == '__main__':
     test_some_mangling(); exit()
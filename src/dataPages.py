@@ -57,10 +57,25 @@ SPONSORS_IMG_ABOUT_PAGE = """
 CHOICES_ITEMS_JS_STUB = """<span id="{choice_id}">
         <script>
             document.getElementById("{choice_id}").insertAdjacentHTML("afterbegin", 
-            '<big>&rarr;</big>&nbsp;<a target="_blank" href="choice.html?cols={cols}&title={title}&loc={locs}">{linktext}</a><br>');
+            '<big>&rarr;</big>&nbsp;<a target="_blank" href="choice.html?cols={cols}&title={title}&loc={locs}{charts}">{linktext}</a><br>');
         </script>
         </span>"""
 
+CHARTS_SCRIPT = '<script type="text/javascript" src="charts.js"></script>\n'
+
+def plot_HTML(png_filename, charts=False):
+    """
+    the plot of an area: its PNG, or in the client side chart mode (`charts`), a placeholder which `pages/charts.js`
+    draws the chart into, out of the area's data, see `dataPlotting.write_all_chart_data()`
+    """
+    if charts:
+        return '<div class="covviz-chart" data-src="../pics/%s"></div><p/>' % dataPlotting.chart_filename(png_filename)
+    return '<img src="%s"/><p/>' % ("../pics/" + png_filename)
+
+def choice_charts(charts=False):
+    """URL parameter which lets choice.html draw charts instead of showing the PNGs"""
+    return "&charts=1" if charts else ""
+
 def search_URLs(kreis, kreissitz):
     text="search last week, "
     if kreis==kreissitz:
@@ -105,16 +120,16 @@ def wikipedia_link(wp, AGS, base_url=dataFiles.WP_URL):
     return text, kreis, kreissitz 
 
 
-def bundesland(fed, filename_HTML, dm: dataMangling.DataMangled, distances, cmap, km):
+def bundesland(fed, filename_HTML, dm: dataMangling.DataMangled, distances, cmap, km, charts=False):
     page = dataTable.PAGE % fed.name
-    district_AGSs = dm.ts_sorted[dm.ts_sorted.Bundesland==fed.name].index.tolist()
+    district_AGSs = dm.ranked_AGSs("centerday", state=fed.name)
     
     page +='<a name="top">'
     page +='Up to <a href="about.html">about.html</a> or to overview of <a href="Deutschland.html">Germany</a>\n'
     page +='Or down to <a href="#Kreise">Kreise (districts)</a> ' + SPONSORS_IMG_ABOUT_PAGE
     flagimg = dataTable.flag_image(fed.name, fed.population, height=20)
     page +="<hr><h1>%s %s, and its %d districts (%s)</h1>\n" % (flagimg, fed.name, len(district_AGSs), dm.datacolumns[-1])
-    page +='<img src="%s"/><p/>' % ("../pics/" + fed.filename)
+    page += plot_HTML(fed.filename, charts)
     page += "population: {:,}".format(fed.population)
     page += " <big>&rarr;</big>&nbsp;current prevalence: {:.2f} known infected per 100,000 population (over all time).<br/> ".format(fed.prevalence_100k)
     page += "(The plot's background color gradient for a {singular} indicates how large its prevalence value is, " \
@@ -123,8 +138,7 @@ def bundesland(fed, filename_HTML, dm: dataMangling.DataMangled, distances, cmap
             "<br/>\n".format(singular="Bundesland (federal state)", plural="Bundeslaender (federal states)")
 
     # add table with rows for some plotted values
-    date_columns_reversed = dm.datacolumns.tolist()
-    date_columns_reversed.reverse()
+    date_columns_reversed = dm.date_axis.labels_reversed
     labels = ["total cases", "daily cases", "7&nbsp;days mean"]
     data = [fed.cumulative[::-1], fed.daily[::-1], fed.rolling_mean7.fillna('-').values.ravel().tolist()[::-1]]
     page += dataTable.plot_values_to_HTML_table(labels=labels, data_rows=data, date_columns=date_columns_reversed)
@@ -136,9 +150,9 @@ def bundesland(fed, filename_HTML, dm: dataMangling.DataMangled, distances, cmap
     page +='Click on name of Kreis to see detailed data. If not all visible, '
     page +='<a href="javascript:expand_table_div(\'tablediv_kreise\');">expand table area</a>, or use scrollbar.<p/>\n'
     
-    AGS_str_list = dm.ts_sorted[dm.ts_sorted.Bundesland==fed.name].index.astype('str').to_list()
+    AGS_str_list = [str(AGS) for AGS in district_AGSs]
     locs=",".join(AGS_str_list[:])
-    page += CHOICES_ITEMS_JS_STUB.format(choice_id="all_district_plots", locs=locs, cols=4,
+    page += CHOICES_ITEMS_JS_STUB.format(choice_id="all_district_plots", locs=locs, cols=4, charts=choice_charts(charts),
                                          title="covviz plots of all %d %s\\'s Kreise \(districts\), sorted by expectation day" % (len(AGS_str_list), fed.name),
                                          linktext="Open overview of (only) the plots of all %d %s\\'s Kreise \(districts\) in a new window." % (len(AGS_str_list), fed.name))
 
@@ -170,12 +184,10 @@ def bundesland(fed, filename_HTML, dm: dataMangling.DataMangled, distances, cmap
             locs += f"{fed.name},"
         locs += f"{AGS},{nearby_AGS}"
         cols = 3 # if nearby_AGS.count(',') < 12 else 4
-        page += CHOICES_ITEMS_JS_STUB.format(choice_id=f"{anchor}_choice", locs=locs, cols=cols, title=f"covviz plots of {dstr.name} and neighbours within {km}km",
+        page += CHOICES_ITEMS_JS_STUB.format(choice_id=f"{anchor}_choice", locs=locs, cols=cols, charts=choice_charts(charts), title=f"covviz plots of {dstr.name} and neighbours within {km}km",
                                              linktext="Open all plots of these neighbours in a new window.")
 
-        filename_kreis_PNG = "Kreis_" + ("00000"+str(AGS))[-5:] + ".png"
-
-        page +='<img src="%s"/><p/>' % ("../pics/" + dstr.filename)
+        page += plot_HTML(dstr.filename, charts)
         
         page += ("%s %s" % (dstr.type_name, dstr.name)) + " population: {:,}".format(dstr.population)
         page += " <big>&rarr;</big>&nbsp;current prevalence: {:.2f} known infected per 100,000 population (over all time). ".format(dstr.prevalence_100k)
@@ -190,7 +202,7 @@ def bundesland(fed, filename_HTML, dm: dataMangling.DataMangled, distances, cmap
 
         page += "sources: %s; " % dstr.sources
         page +='other sites: %s' % (TU_DORTMUND % (dstr.AGS, dstr.AGS) )
-        wpl, kreis, kreissitz = wikipedia_link(wp, int(AGS))
+        wpl, kreis, kreissitz = wikipedia_link(wp, dataMangling.AGS_key(AGS))
         if wpl: 
             page +=', %s' % (wpl)
         else:
@@ -207,6 +219,8 @@ def bundesland(fed, filename_HTML, dm: dataMangling.DataMangled, distances, cmap
         page +='<a href="#">Back to top</a> or: Up to <a href="about.html">about.html</a>\n'
     
     page += footerlink()
+    if charts:
+        page += CHARTS_SCRIPT
     page += dataTable.PAGE_END
     
     fn=os.path.join(dataFiles.PAGES_PATH, filename_HTML)
@@ -215,12 +229,12 @@ def bundesland(fed, filename_HTML, dm: dataMangling.DataMangled, distances, cmap
     
     return fn
 
-def Bundeslaender_alle(dm: dataMangling.DataMangled, distances, cmap, km):
+def Bundeslaender_alle(dm: dataMangling.DataMangled, distances, cmap, km, charts=False):
     print ("Creating HTML files for all 'Bundeslaender'")
     filenames, population = [], 0
     rootpath = os.path.abspath(dataFiles.REPO_PATH)
     Bundeslaender = dm.Bundeslaender_sorted
-    for BL_name in Bundeslaender.index.tolist():
+    for BL_name in dm.ranked_states("centerday"):
         if BL_name == "Deutschland":
             continue
         print (BL_name, end=" ")
@@ -228,7 +242,7 @@ def Bundeslaender_alle(dm: dataMangling.DataMangled, distances, cmap, km):
         filename_HTML = fed.filename.replace(".png", ".html")
         filename_HTML = filename_HTML.replace("bundesland_", "")
 
-        fn = bundesland(fed, filename_HTML, dm, distances, cmap, km)
+        fn = bundesland(fed, filename_HTML, dm, distances, cmap, km, charts=charts)
         fn_abs = os.path.abspath(fn).replace(rootpath, "")
         
         filenames.append((BL_name, fn_abs ))
@@ -239,13 +253,13 @@ def Bundeslaender_alle(dm: dataMangling.DataMangled, distances, cmap, km):
     return filenames
     
     
-def Deutschland_simple(Bundeslaender_filenames, filename_HTML="Deutschland_simple.html"):
+def Deutschland_simple(Bundeslaender_filenames, filename_HTML="Deutschland_simple.html", charts=False):
     page = dataTable.PAGE
     page +='<a name="#top">'
     page +='Up to <a href="about.html">about.html</a>\n'
     
     page +="<h1>Germany and its 16 countries</h1>\n"
-    page +='<img src="%s"/><p/>' % ("../pics/Deutschland.png")
+    page += plot_HTML("Deutschland.png", charts)
     page +="total cases: %s<br>\n" #  % (list(map(int, cumulative)))
     # prevalence = cumulative[-1] / pop_BL * 1000000
     # page += "population: {:,}".format(pop_BL)
@@ -261,6 +275,8 @@ def Deutschland_simple(Bundeslaender_filenames, filename_HTML="Deutschland_simpl
     page +="</ul>\n"
         
     page +="<p/>TODO: Insert long 401 districts table"
+    if charts:
+        page += CHARTS_SCRIPT
     fn=os.path.join(dataFiles.PAGES_PATH, filename_HTML)
     with open(fn, "w") as f:
         f.write(page)
@@ -289,7 +305,7 @@ that googlesheet --&gt; <a href="http://tiny.cc/kreise">tiny.cc/kreise</a><p/>
 """
 # width="583" height="320"
 
-def bloverview(Bundeslaender_sorted, ifPrint=False):
+def bloverview(Bundeslaender_sorted, ifPrint=False, charts=False):
     print("\ngenerating overview of 16 Bundeslaender in Germany:")
     BLs = sorted(Bundeslaender_sorted.index.tolist())
     BLs = [BL for BL in BLs if BL not in ("Dummyland", "Deutschland")]
@@ -304,15 +320,19 @@ def bloverview(Bundeslaender_sorted, ifPrint=False):
     for BL in BLs:
         print(BL)
         imgprop = 'src="../pics/bundesland_%s.png" alt="bundesland_%s.png"' % (BL, BL)
+        if charts:
+            plot = '<div class="covviz-chart" data-src="../pics/%s"></div>' % dataPlotting.chart_filename("bundesland_%s.png" % BL)
+        else:
+            plot = '<img %s>' % imgprop
         p.a("<figure>")
-        p.a('<a href="%s.html"><figcaption>%s</figcaption><img %s></a>' % (BL, BL, imgprop))
+        p.a('<a href="%s.html"><figcaption>%s</figcaption>%s</a>' % (BL, BL, plot))
         p.a("</figure>")
     if ifPrint:
         print(p.page)
     return p.page
 
 
-def Deutschland(dm: dataMangling.DataMangled, cmap, filename_HTML="Deutschland.html"):
+def Deutschland(dm: dataMangling.DataMangled, cmap, filename_HTML="Deutschland.html", charts=False):
     page = dataTable.PAGE % "Deutschland"
     page +='<a name="top">'
     page +='UP to <a href="about.html">about.html</a> \n'
@@ -320,7 +340,7 @@ def Deutschland(dm: dataMangling.DataMangled, cmap, filename_HTML="Deutschland.h
     page +='or 401 Kreise sorted by <a href="#googlesheet">mortality</a> (googlesheet table). ' + SPONSORS_IMG_ABOUT_PAGE
     
     page +='<hr><h1 id="de">Germany</h1>\n' 
-    page +='<img src="%s"/><p/>' % ("../pics/Deutschland.png")
+    page += plot_HTML("Deutschland.png", charts)
     
     DE=dm.Bundeslaender_sorted.drop(["Deutschland", "Dummyland"], errors='ignore').sum() # errors='ignore' in case Dummyland is not part of the dataset anyways
     cumulative = DE[dm.datacolumns].astype(int).tolist()
@@ -352,14 +372,14 @@ def Deutschland(dm: dataMangling.DataMangled, cmap, filename_HTML="Deutschland.h
     # alphabetically sorted, comma separated list of fed state names
     locs=",".join(sorted(dm.Bundeslaender_sorted.drop(["Deutschland", "Dummyland"], errors='ignore').index.tolist())[:])
     # link to choice page for fed states
-    page += CHOICES_ITEMS_JS_STUB.format(choice_id="all_fed_states_plots", locs=locs, cols=4,
+    page += CHOICES_ITEMS_JS_STUB.format(choice_id="all_fed_states_plots", locs=locs, cols=4, charts=choice_charts(charts),
                                          title="covviz plots of all 16 german Bundeslaender \(federal states\)",
                                          linktext="Open overview of (only) the plots of all 16 german Bundeslaender \(federal states\) in a new window.")
 
 
     page += '<div class="bloverview">'
 
-    page += bloverview(dm.Bundeslaender_sorted)
+    page += bloverview(dm.Bundeslaender_sorted, charts=charts)
     page += '</div>'
     
     page +="<p style='clear:both'>Click on the image of a Bundesland to enter its page, with all its districts.</p>"
@@ -371,13 +391,13 @@ def Deutschland(dm: dataMangling.DataMangled, cmap, filename_HTML="Deutschland.h
     page +="Click on name of Kreis (or Bundesland) to see detailed data. To see all of them, "
     page +='<a href="javascript:expand_table_div(\'tablediv_kreise\');">expand table area</a>, or use scrollbar.<p/>\n'
 
-    AGS_str_list = dm.ts_sorted.index.astype('str').to_list()
+    district_AGSs = dm.ranked_AGSs("centerday")
+    AGS_str_list = [str(AGS) for AGS in district_AGSs]
     locs=",".join(AGS_str_list[:])
-    page += CHOICES_ITEMS_JS_STUB.format(choice_id="all_district_plots", locs=locs, cols=4,
+    page += CHOICES_ITEMS_JS_STUB.format(choice_id="all_district_plots", locs=locs, cols=4, charts=choice_charts(charts),
                                          title="covviz plots of all 401 german Kreise \(districts\), sorted by expectation day",
                                          linktext="Open overview of (only) the plots of all 401 german Kreise \(districts\) in a new window.")
 
-    district_AGSs = dm.ts_sorted.index.tolist()
     fn, kreiseHTML = dataTable.Districts_to_HTML_table(dm, district_AGSs, cmap, filename="kreise_Germany.html", header="\n", footer="\n")
     page += kreiseHTML 
     
@@ -388,6 +408,8 @@ def Deutschland(dm: dataMangling.DataMangled, cmap, filename_HTML="Deutschland.h
 
     
     page +=footerlink()
+    if charts:
+        page += CHARTS_SCRIPT
     
     page += dataTable.PAGE_END
     
@@ -398,10 +420,11 @@ def Deutschland(dm: dataMangling.DataMangled, cmap, filename_HTML="Deutschland.h
     return os.path.abspath(fn)
 
 
-def neighbour_districts_table(neighbours, ifPrint=False):
+def neighbour_districts_table(neighbours, ifPrint=False, charts=False):
     """
     takes neighbours dataframe with columns [title, img, link]
     create HTML table - square or rectangular
+    with `charts`, the cells get drawn in the browser instead of the PNGs, see `plot_HTML()`
     returns HTML code 
     """
     
@@ -430,8 +453,13 @@ def neighbour_districts_table(neighbours, ifPrint=False):
                 p.a('<td></td>')
             else:
                 # print (row)
-                imgprop='src="%s" alt="%s" title="%s"'%(row.img, row.title, row.title)
-                p.a('<td>%s<br/><a href="%s"><img %s width="366" height="214"/></a></td>' % (row.title, row.link, imgprop))
+                if charts:
+                    chart = '<div class="covviz-chart" data-src="../pics/%s" title="%s" style="width:366px"></div>' % (
+                            dataPlotting.chart_filename(os.path.basename(row.img)), row.title)
+                    p.a('<td>%s<br/><a href="%s">%s</a></td>' % (row.title, row.link, chart))
+                else:
+                    imgprop='src="%s" alt="%s" title="%s"'%(row.img, row.title, row.title)
+                    p.a('<td>%s<br/><a href="%s"><img %s width="366" height="214"/></a></td>' % (row.title, row.link, imgprop))
             c+=1
         p.a("</tr>")
     # p.a("<caption>test</caption>")
@@ -454,25 +482,24 @@ def prepare_list_of_neighbour_districts(AGS, distances, km, bnn):
     neighbours.loc[-1, "AGS1"] = AGS
     neighbours.loc[-1, "AGS2"] = AGS
     neighbours.loc[-1, "km"] = 0
+    neighbours = neighbours.astype({"AGS1": "int64", "AGS2": "int64"}) # the new row made them float, back to the AGS key
     neighbours.sort_values("km", ascending=True, inplace=True)
     # TODO: insert itself at km 0
-    imgs, titles = [],[]
-    for index, row in neighbours[["AGS2", "km"]].iterrows():
-        AGS2 = int(row["AGS2"])
-        #print (AGS2, row["km"])
+    links, imgs, titles = [],[],[]
+    for AGS2, km2 in zip(neighbours["AGS2"].tolist(), neighbours["km"].tolist()):
+        #print (AGS2, km2)
         filename, nameAndType, link = districtDistances.kreis_link(bnn, AGS2)
-        neighbours.loc[index, "link"] = filename
-        filepath_kreis_PNG = "../pics/Kreis_" + ("00000"+str(AGS2))[-5:] + ".png"
+        links += [filename]
+        filepath_kreis_PNG = "../pics/Kreis_" + dataMangling.AGS_5digits(AGS2) + ".png"
         #print (filepath_kreis_PNG, filename, nameAndType, link )
-        neighbours.loc[index, "img"] = filepath_kreis_PNG
-        title = "%s (%.1f km)" % (nameAndType, row["km"])
+        imgs += [filepath_kreis_PNG]
+        title = "%s (%.1f km)" % (nameAndType, km2)
         #print (title)
-        neighbours.loc[index, "title"] = title
-        # imgs += [filepath_kreis_PNG]
-        # titles += [title]
+        titles += [title]
+    neighbours["link"]=links
+    neighbours["img"]=imgs
+    neighbours["title"]=titles
     # print (neighbours)
-    # neighbours["img"]=imgs
-    # neighbours["title"]=titles
     
     #print (neighbours.to_string())
     return neighbours
@@ -513,15 +540,15 @@ SIMPLEPAGE_END="""
 """
 
 
-def neighbour_districts_table_page(AGS, distances, km, bnn):
+def neighbour_districts_table_page(AGS, distances, km, bnn, charts=False):
     """
     select neighbours within distance km=...
     create additional columns, as prep for table
-    make HTML table, square or rectangular
+    make HTML table, square or rectangular (with `charts` drawn in the browser)
     write page to HTML file
     """
     neighbours = prepare_list_of_neighbour_districts(AGS, distances, km, bnn)
-    table = neighbour_districts_table(neighbours)
+    table = neighbour_districts_table(neighbours, charts=charts)
 
     gen, bez, _,_ = dataMangling.AGS_to_population(bnn, AGS)
     _, nameAndType, _= districtDistances.kreis_link(bnn, AGS)
@@ -530,18 +557,19 @@ def neighbour_districts_table_page(AGS, distances, km, bnn):
     page = page. replace('onload="scroll_rightmost()"', '')
     page += table
     page += '<p>All plots are regenerated with new data every night. Beware this temporary <a href="hotspots.html">hotspot</a> is an experimental page - it might get removed, so please do not link to it. Instead link to project <a href="http://tiny.cc/cov19de">http://tiny.cc/cov19de</a>.</p>'
+    if charts:
+        page += CHARTS_SCRIPT
     page += SIMPLEPAGE_END
     # print (page)
-    AGS_5digits = ("00000"+str(AGS))[-5:]
-    filename = os.path.join(dataFiles.PAGES_PATH, "kreis_%s_plus_%skm.html" % (AGS_5digits, km))
+    filename = os.path.join(dataFiles.PAGES_PATH, "kreis_%s_plus_%skm.html" % (dataMangling.AGS_5digits(AGS), km))
     with open(filename, "w") as f:
         f.write(page)
     print (filename)
     return filename
 
 
-def generate_hotspot_files():
-    
+def generate_hotspot_files(charts=False):
+    """the neighbour tables around the hotspots; with `charts`, drawn in the browser, see `neighbour_districts_table()`"""
     dm = dataMangling.dataMangled(ifPrint=False)
     distances = districtDistances.load_distances()
     print ("50 km, relative threshold; or absolute threshold, and not already among relative threshold:")
@@ -549,14 +577,14 @@ def generate_hotspot_files():
                 4012, 3352, 16052, 9473, 7315, 3159, 9771, 5754, 3361, 15003, 5570, 3103, 6632, 3458, 3401, 5170, 5111, 5915, 5112,
                 9188, 9279, 7334, 9173,5366,5158,7312, 11000, 5112, 3241, 9162, 5913, 4011, 5315, 6412, 9761, 5958, 
                 16055, 1051, 5122, 3460, 8128, 7232, 5113, 2000, 5911, 8136, 5562):
-        neighbour_districts_table_page(AGS=AGS, distances=distances, km=50, bnn=dm.bnn)
+        neighbour_districts_table_page(AGS=AGS, distances=distances, km=50, bnn=dm.bnn, charts=charts)
     
     print ("\n100 km:")
     for AGS in (5754,):
-        neighbour_districts_table_page(AGS=AGS, distances=distances, km=100, bnn=dm.bnn)
+        neighbour_districts_table_page(AGS=AGS, distances=distances, km=100, bnn=dm.bnn, charts=charts)
     print ("\n150 km")
     for AGS in ():
-        neighbour_districts_table_page(AGS=AGS, distances=distances, km=150, bnn=dm.bnn)
+        neighbour_districts_table_page(AGS=AGS, distances=distances, km=150, bnn=dm.bnn, charts=charts)
 
 
 
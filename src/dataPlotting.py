@@ -12,13 +12,15 @@
           See: todo.md for ideas what else to do. 
           NOT yet: pretty. But it works.
 """
-from typing import Union
+from typing import Dict, List, NamedTuple, Union
 
 import datetime
+import hashlib
+import json
 import os
+import time
 
 import matplotlib
-import matplotlib.dates as mp_dates
 import numpy as np
 import pandas
 
@@ -27,7 +29,8 @@ if not os.getenv('WALYAND_DISPLAY') and not os.getenv('DISPLAY') and not os.gete
     matplotlib.use('Agg')  # to be able to plot without GUI (e.g. on a headless server), this must be set before importing pyplot
 
 from matplotlib import pyplot as plt
-from matplotlib.ticker import MultipleLocator as mpl_MultipleLocator, MaxNLocator as mpl_MaxNLocator, StrMethodFormatter
+import matplotlib.figure, matplotlib.dates
+from matplotlib.ticker import MultipleLocator as mpl_MultipleLocator, MaxNLocator as mpl_MaxNLocator, AutoLocator as mpl_AutoLocator, StrMethodFormatter
 from matplotlib.collections import LineCollection
 from matplotlib.offsetbox import AnchoredOffsetbox, TextArea, VPacker
 
@@ -118,317 +121,302 @@ def hsv2rgb(h, s, v):
     return hsv_to_rgb((h/360, s/100, v/100))
 
 
-def plot_timeseries(dm: dataMangling.DataMangled, cov_area: dataMangling.CovidDataArea, ifShow=True, ifCleanup=True):
-    """Creates the image with the different statistic graph plots for the covid-19 cases of a country, Bundesland or Kreis"""
-
-    dates = dm.dates
-    daily = cov_area.daily
-    isDistrict = type(cov_area) == dataMangling.District
-
-    # label rotations
-    lrotation = -40
-
-    # enlarger for y-limits of axis' tick ranges to not plot too close to top
-    PLOT_YLIM_ENLARGER_DAILYS = 1.2  # if this is too low (e.g. 1.2), chances are good that some daily graphs go beyond the top, due to below manual changes to automatic ticks
-    PLOT_YLIM_ENLARGER_CUMU = 1.02
-    # plotting color for 7-daily sums graph
-    COLOR_INCID_SUMS = '#2020D0'
-
-    lns0, lns1, lns1_0, lns3, lns3_0, lns3_1, lns4_1, lns4_2, lns5, lns6_1, lns6_2, lns6_3, lns6_4, lns6_5, lns6_6 = [], [], [], [], [], [], [], [], [], [], [], [], [], [], []
-
-    ax: plt.Axes # type hint for better IDE auto-completion
-    fig, ax = plt.subplots(figsize=(10, 6))  # , constrained_layout=True)
-    ax.name = "dailys"
-    ax.yaxis.set_major_formatter(StrMethodFormatter('{x:,.0f}')) # no scientific '1e6' notations please
-
-    # add axis for cumulative total cases (with seperate y-axis), and background gradient
-    ax_cumu: plt.Axes = ax.twinx()
-    ax_cumu.name = "cumulative"
-    ax_cumu.yaxis.set_major_formatter(StrMethodFormatter('{x:,.0f}')) # no scientific '1e6' notations please
-
-    # ax for background gradient
-    ax_bg: plt.Axes = ax.twinx()
-    ax_bg.name = "background"
-    ax_bg.set_ylim(0, cov_area.cumulative[-1] * PLOT_YLIM_ENLARGER_DAILYS)
-    ax_bg.grid(False)
-    ax_bg.tick_params(axis='y', width=0)
-    ax_bg.set_yticklabels([])
-
-    # take care for not plotting background gradient over the rest, and not plot ax white background over the rest
-    ax_bg.set_zorder(1)
-    ax.set_zorder(2)
-    ax.set_frame_on(False) # let lower zorder ax shine through
-    ax_cumu.set_zorder(3)
-
-    # default ax to plot expactation day marker on (should be over all others)
-    ax_for_marker = ax
-
-    # if isKreis, add axis for daily sums (with seperate y-axis), set z-order, use for marker
-        #if isDistrict:
-    ax_sum: plt.Axes = ax.twinx()
-    ax_sum.name = "sum incidences"
-    ax_sum.set_zorder(4)
-    ax_for_marker = ax_sum
-    ax_sum.yaxis.set_major_formatter(StrMethodFormatter('{x:,.0f}')) # no scientific '1e6' notations please
-        #else:
-        #    ax_sum = ax # just a dummy to stop IDEs from crying about maybe uninitialized variable
-
-
-    # set grids
-    ax.grid(True, which='major', axis='x', ls='-', alpha=0.9)  # if not set here above, major ticks of x axis won't be visible
-    ax.grid(True, which='minor', axis='x', ls='--', alpha=0.5)  # if not set here above, minor ticks of x axis won't be visible
-        # ax.grid(True, which='major', axis='y', ls='-', alpha=0.7)  # if not set here above, ticks of left side y axis won't be visible
-        # ax.grid(True, which='minor', axis='y', ls='--', alpha=0.5)
-
-    # set x axis minor tick interval to only each 5 days one tick, as compromise between being exact and easily readable
-    fig.autofmt_xdate(rotation=lrotation, ha='left')
-    ax.xaxis_date()
-    ax.xaxis.set_minor_locator(matplotlib.dates.DayLocator(bymonthday=range(1, 30, 5)))
-    ax.tick_params(axis='x', length=8)
-
-    #
-    # plot background gradient, indicating relative prevalence
-    if not "Deutschland" in cov_area.name:
-        # backgroud gradient indicating local max prevalence values compared with global
-        mid = mp_dates.date2num(dates)[int(len(dates) / 2)]  # get middle point of the dates as plot start point
-        # create some artificially plotting points, at the x-middle point of the dates, from zero up the y-axis' maximum
-        points = np.array([[mid] * len(dates), np.linspace(0, cov_area.total * PLOT_YLIM_ENLARGER_DAILYS, len(dates))]).T.reshape(-1, 1, 2)
-        segments = np.concatenate([points[:-1], points[1:]], axis=1) # create lines from neighbour to neighbour of elements in 'points'
-        # set proportion for colors, matching plot item's own 100k prevalence
-        proportion = np.linspace(0, cov_area.prevalence_100k * PLOT_YLIM_ENLARGER_DAILYS, len(dates))
-        # set norm to match global max, shooting the colors over the plot item's max, if it is not the global prevalence max itself
-        #   this norm together with the max of 'proportion' is basically the core, to indicate the relative prevalence
-        norm = plt.Normalize(0, cov_area.max_overall_prevalence_100k)
-        cmap = 'YlOrRd' if isDistrict else 'Reds'
-        lc = LineCollection(segments, cmap=cmap, norm=norm, alpha=0.4)
-        lc.set_array(proportion)
-        lc.set_linewidth(6 * fig.dpi) # plot with enough width to fill the background horizontally
-
-        # TODO: place color bar for prevalence background gradient in cumu axe?
-        # axcb = plt.colorbar(lc)
-        # axcb.set_label('prevalence indicator')
-        ax_bg.add_collection(lc)
-
-    #
-    # plot raw daily cases
-    if not isDistrict:
-        ax.plot(dates, daily, color='w', linewidth=7, alpha=0.1) # plot white background for next line
-    red_days = 5 # '5' matches the minor ticks on x-axis
-    lns1 = ax.plot(dates, daily, label=f"raw daily cases (weekend-flawed), red: last {red_days}", color='#B0B0B0', zorder=1)
-    ax.plot(dates[-red_days:], daily[-red_days:], color='#FF8080')
-        # lns1 = ax.plot(dates, daily, label="daily cases (weekend-flawed), 2 weeks: red", color='#AAAAAA')
-        # lns1_2 = ax.plot(dates[-14:], daily[-14:], label="daily cases, last 14 days dark gray", color='red')
-        # print (len(dates[-14:]))
-
-    # set y1 axis tick automatic interval and range restrictions, allow no 'half daily cases' (no floating point numbers)
-    yloc = mpl_MaxNLocator(integer=True)
-    ax.yaxis.set_major_locator(yloc)
-    ax.set_ylim(0, max(daily[1:]) * PLOT_YLIM_ENLARGER_DAILYS)
-
-
-    #
-    # plot cumulative cases data for the 2nd y axis
-    ax_cumu.plot(dates, cov_area.cumulative, color='w', linewidth=7, alpha=0.1) # plot white background for next line
-    lns5 = ax_cumu.plot(dates, cov_area.cumulative, label="cumulative total cases reported at RiskLayer", color='#50C0FF', linestyle='dotted', linewidth=2)
-
-    ax_cumu.set_ylim(0, max(cov_area.cumulative) * PLOT_YLIM_ENLARGER_CUMU)
-    ax_cumu.set_ylabel("cumulative total cases", color=lns5[0].get_color())
+# enlarger for y-limits of axis' tick ranges to not plot too close to top
+PLOT_YLIM_ENLARGER_DAILYS = 1.2  # if this is too low (e.g. 1.2), chances are good that some daily graphs go beyond the top, due to below manual changes to automatic ticks
+PLOT_YLIM_ENLARGER_CUMU = 1.02
+# plotting color for 7-daily sums graph
+COLOR_INCID_SUMS = '#2020D0'
+# label rotations
+LROTATION = -40
+# for the incidence border lines #1…6: (color as HSV, linestyle), the higher the border, the darker and more solid
+INCIDENCE_BORDER_STYLES = (((15, 50, 90), (0, (2, 7))), ((12, 55, 86), (0, (3, 6))), ((9, 60, 82), (0, (4, 5))),
+                           ((6, 75, 78), (0, (4, 3))), ((3, 85, 74), (0, (6, 3))), ((0, 95, 70), (0, (7, 1))))
+RED_DAYS = 5 # '5' matches the minor ticks on x-axis
+
+
+def shown_incidence_borders(cov_area: dataMangling.CovidDataArea) -> List[int]:
+    """
+    the numbers (1…6) of the incidence borders which get drawn: the 1st one always, the higher ones only if nearly reached,
+    to have no unneeded large y1 numbers which would worsen the view
+    """
+    incidence_max_sum = max(cov_area.incidence_sums)
+    return [number for number in range(1, len(dataMangling.WEEKLY_INCIDENCE_LIMITS_PER_100K) + 1)
+            if number == 1 or incidence_max_sum > cov_area.weeklyIncidenceLimit(number) * 0.8]
+
 
+class FigureTemplate(object):
+    """
+    the figure of `plot_timeseries()`: the 4 axes, their grids, locators, formatters, the multi-colored y-label,
+    and all the lines, get built only once. Then `render()` swaps in the data, limits, ticks and labels of one area.
+    """
+    __slots__ = ("date_axis", "fig", "ax", "ax_cumu", "ax_bg", "ax_sum", "lines", "borders", "gradient", "fill")
+
+    def __init__(self, dm: dataMangling.DataMangled, fig=None):
+        """
+        without a `fig`, the figure is not known to pyplot, so neither `plt.show()` nor `plt.close("all")` touch it,
+        that is what the process wide `figure_template()` wants.
+        """
+        self.date_axis = dm.date_axis
+        # the dates as one datetime64 array, which matplotlib converts at once, instead of each datetime object on every plot call
+        dates = self.date_axis.datetime64
+        zeros = np.zeros(len(dates))
+
+        self.fig = fig = fig if fig is not None else matplotlib.figure.Figure(figsize=(10, 6))
+        ax: plt.Axes = fig.add_subplot() # type hint for better IDE auto-completion
+        ax.name = "dailys"
+        ax.yaxis.set_major_formatter(StrMethodFormatter('{x:,.0f}')) # no scientific '1e6' notations please
+
+        # add axis for cumulative total cases (with seperate y-axis), and background gradient
+        ax_cumu: plt.Axes = ax.twinx()
+        ax_cumu.name = "cumulative"
+        ax_cumu.yaxis.set_major_formatter(StrMethodFormatter('{x:,.0f}')) # no scientific '1e6' notations please
+
+        # ax for background gradient
+        ax_bg: plt.Axes = ax.twinx()
+        ax_bg.name = "background"
+        ax_bg.grid(False)
+        ax_bg.tick_params(axis='y', width=0)
+        ax_bg.set_yticklabels([])
+
+        # take care for not plotting background gradient over the rest, and not plot ax white background over the rest
+        ax_bg.set_zorder(1)
+        ax.set_zorder(2)
+        ax.set_frame_on(False) # let lower zorder ax shine through
+        ax_cumu.set_zorder(3)
+
+        # axis for daily sums (with seperate y-axis), also used for the expectation day marker (should be over all others)
+        ax_sum: plt.Axes = ax.twinx()
+        ax_sum.name = "sum incidences"
+        ax_sum.set_zorder(4)
+        ax_sum.yaxis.set_major_formatter(StrMethodFormatter('{x:,.0f}')) # no scientific '1e6' notations please
+
+        # set grids
+        ax.grid(True, which='major', axis='x', ls='-', alpha=0.9)  # if not set here above, major ticks of x axis won't be visible
+        ax.grid(True, which='minor', axis='x', ls='--', alpha=0.5)  # if not set here above, minor ticks of x axis won't be visible
+
+        # set x axis minor tick interval to only each 5 days one tick, as compromise between being exact and easily readable
+        fig.autofmt_xdate(rotation=LROTATION, ha='left')
+        ax.xaxis_date()
+        ax.xaxis.set_minor_locator(matplotlib.dates.DayLocator(bymonthday=range(1, 30, 5)))
+        ax.tick_params(axis='x', length=8)
+
+        # all lines get plotted over the whole date range already, which fixes the x-axis; `render()` then only swaps the y-data.
+        lines = self.lines = {}
+        # raw daily cases, with white background for next line (only for the federal states)
+        lines["daily_bg"], = ax.plot(dates, zeros, color='w', linewidth=7, alpha=0.1)
+        lines["daily"], = ax.plot(dates, zeros, label=f"raw daily cases (weekend-flawed), red: last {RED_DAYS}", color='#B0B0B0', zorder=1)
+        lines["daily_red"], = ax.plot(dates[-RED_DAYS:], zeros[-RED_DAYS:], color='#FF8080')
+
+        # cumulative cases data for the 2nd y axis
+        lines["cumulative_bg"], = ax_cumu.plot(dates, zeros, color='w', linewidth=7, alpha=0.1) # plot white background for next line
+        lines["cumulative"], = ax_cumu.plot(dates, zeros, label="cumulative total cases reported at RiskLayer", color='#50C0FF', linestyle='dotted', linewidth=2)
+        ax_cumu.set_ylabel("cumulative total cases", color=lines["cumulative"].get_color())
+
+        # rolling average, white background on top border, and top border line additional to filling, for easier legend
+        lines["rolling_bg"], = ax.plot(dates, zeros, color='white', zorder=0, linewidth=7, alpha=0.1)
+        lines["rolling"], = ax.plot(dates, zeros, label="centered moving average, %s days cases" % 14, color='#FFD010', linewidth=3, zorder=0)
+        self.fill, self.gradient = None, None # both are made new for each area, in `render()`
 
         #
-        # plot rolling average
-        # rolling averages for daily cases, over two weeks
-        # if not isDistrict:
-        #     # plot simple line
-        #     ax.plot(dates, cov_area.rolling_mean14, color='w', linewidth=11, alpha=0.1)  # plot white background for next line
-        #     lns3 = ax.plot(dates, cov_area.rolling_mean14, label="centered moving average, %s days cases" % 14, color='#FFD010', linewidth=3, zorder=2)
-        # else:
+        # y-axis label multi colored
+        ybox1 = TextArea("raw daily cases", textprops=dict(color=lines["daily"].get_color(), rotation='vertical'))
+        ybox2 = TextArea(" / ", textprops=dict(color="black", rotation='vertical'))
+        ybox3 = TextArea("moving average", textprops=dict(color=lines["rolling"].get_color(), rotation='vertical'))
+        ybox = VPacker(children=[ybox3, ybox2, ybox1], align="center", pad=0, sep=5)
+        anchored_ybox = AnchoredOffsetbox(loc=8, child=ybox, pad=0., frameon=False,
+                                          bbox_to_anchor=(-0.09, 0.2),  # if first value smaller than -0.08 we get in trouble with graph for country
+                                          bbox_transform=ax.transAxes, borderpad=0.)
+        ax.add_artist(anchored_ybox)
+
+        # 7 day sums, and according grid for it
+        ax_sum.grid(True, which='major', axis='y', ls='-', alpha=0.6, color=COLOR_INCID_SUMS)  # if not set here above, ticks of left side y axis won't be visible
+        ax_sum.grid(True, which='minor', axis='y', ls='--', alpha=0.2, color=COLOR_INCID_SUMS)
+
+        # move total cases y axis away to outside
+        ax_cumu.spines["right"].set_position(("axes", 1.12))
+
+        # incidences graph, yellow background for sum graph, then graph over it
+        label = 'Inicid. per 100k pop. for prior 7 days of date'
+        lines["incidences_bg"], = ax_sum.plot(dates, zeros, label=label, color='yellow', linewidth=7, alpha=0.4)
+        lines["incidences"], = ax_sum.plot(dates, zeros, label=label, color=COLOR_INCID_SUMS)
+        # also yellow background for label
+        ax_sum.set_ylabel(label, color=COLOR_INCID_SUMS, bbox=dict(color='yellow', alpha=0.3, boxstyle='round', mutation_aspect=0.5))
+        ax_sum.tick_params(axis='y', colors=COLOR_INCID_SUMS, size=8)
+
+        # adjust sum y axis visibilities
+        ax_sum.set_frame_on(True)
+        ax_sum.patch.set_visible(False)
+        for sp in ax_sum.spines.values():
+            sp.set_visible(False)
+        ax_sum.spines["right"].set_visible(True)
+
+        # incidence border lines, `render()` shows only those which are nearly reached
+        self.borders = [ax_sum.plot([dates[0]] + [dates[-1]], [0, 0], color=hsv2rgb(*hsv), linestyle=linestyle)[0]
+                        for hsv, linestyle in INCIDENCE_BORDER_STYLES]
+
+        # marker for temporal center date,
+        # (first a dummy marker just for later showing in legend with smaller symbol, gets plotted over with 2nd one)
+        lines["marker_legend"], = ax_sum.plot(dates[:1], [0], marker="v", color='green', markersize=8, linestyle="")
+        # (side note: if markersize here would be an odd number, the triangle would be skewed)
+        lines["marker"], = ax_sum.plot(dates[:1], [0], marker="v", color='green', markersize=16, zorder=4)
+
+        # set x axis major ticks to month starts
+        ax.xaxis.set_major_locator(matplotlib.dates.DayLocator(bymonthday=range(1, 32, 31)))  # if placing this setting above all other, major ticks won't appear
+        ax.xaxis.set_major_formatter(matplotlib.dates.DateFormatter("%m/%Y"))  # its date formatter must be set, if setting major locator
+
+        # set below here as else will not work for districts if setting above with rest of ax_cumu stuff
+        ax_cumu.tick_params(axis='y', colors=lines["cumulative"].get_color(), labelrotation=LROTATION, length=8)
+        ax.tick_params(axis='y', labelrotation=-LROTATION, length=8)
+
+        self.ax, self.ax_cumu, self.ax_bg, self.ax_sum = ax, ax_cumu, ax_bg, ax_sum
+
+    def render(self, cov_area: dataMangling.CovidDataArea):
+        """draws `cov_area` into the figure, and saves it as PNG if the area has a filename"""
+        ax, ax_cumu, ax_bg, ax_sum, lines = self.ax, self.ax_cumu, self.ax_bg, self.ax_sum, self.lines
+        dates = self.date_axis.datetime64
+        # the area's series are calculated on each access, so fetch them once
+        daily = cov_area.daily
+        cumulative = cov_area.cumulative
+        rolling_mean14 = cov_area.rolling_mean14
+        isDistrict = type(cov_area) == dataMangling.District
+
+        ax_bg.set_ylim(0, cumulative[-1] * PLOT_YLIM_ENLARGER_DAILYS)
+
         #
-    # plot rolling average
-    # plot filled area ~~for districts~~
-    rmean_data = cov_area.rolling_mean14[0]
-    # plot white background on top border
-    _ = ax.plot(dates, cov_area.rolling_mean14, color='white', zorder=0, linewidth=7, alpha=0.1)
-    # plot top border line additional to filling, for easier legend
-    lns3 = ax.plot(dates, cov_area.rolling_mean14, label="centered moving average, %s days cases" % 14, color='#FFD010', linewidth=3, zorder=0)
-    # fill with zorder above white background
-    ax.fill_between(dates, rmean_data, [0] * len(dates), label="centered moving average, %s days cases" % 14,
-                             color=lns3[0].get_color(), linewidth=0, zorder=1)
-
-    #
-    # y-axis label multi colored
-    ybox1 = TextArea("raw daily cases", textprops=dict(color=lns1[0].get_color(), rotation='vertical'))
-    ybox2 = TextArea(" / ", textprops=dict(color="black", rotation='vertical'))
-    ybox3 = TextArea("moving average", textprops=dict(color=lns3[0].get_color(), rotation='vertical'))
-    ybox = VPacker(children=[ybox3, ybox2, ybox1], align="center", pad=0, sep=5)
-    anchored_ybox = AnchoredOffsetbox(loc=8, child=ybox, pad=0., frameon=False,
-                                      bbox_to_anchor=(-0.09, 0.2),  # if first value smaller than -0.08 we get in trouble with graph for country
-                                      bbox_transform=ax.transAxes, borderpad=0.)
-    ax.add_artist(anchored_ybox)
-
-    #
-    # plot rolling sum of prior 7 days cases for date, ~~if it is a district, where the according incidence borders are of interest~~
-    yminor = 0
-        #if isDistrict:
-
-    # plot 7 day sums, only if incidence borders can be calculated via population
-    # according grid for it
-    ax_sum.grid(True, which='major', axis='y', ls='-', alpha=0.6, color=COLOR_INCID_SUMS)  # if not set here above, ticks of left side y axis won't be visible
-    ax_sum.grid(True, which='minor', axis='y', ls='--', alpha=0.2, color=COLOR_INCID_SUMS)
-
-    yloc2 = mpl_MaxNLocator(integer=True)
-    ax_sum.yaxis.set_major_locator(yloc2)
-
-    #
-    # move total cases y axis away to outside
-    ## if isDistrict:
-    ##     ax_cumu.spines["right"].set_position(("axes", 1.15))
-    ## else:
-    ##     ax_cumu.spines["right"].set_position(("axes", 1.18))
-    ax_cumu.spines["right"].set_position(("axes", 1.12))
-
-    # incidences graph plotting
-    incidences = np.array(cov_area.incidence_values)
-    incidence_max_value = max(incidences)
-    ## label = 'sum of daily cases, for prior %s days of date' % 7
-    label = 'Inicid. per 100k pop. for prior 7 days of date'
-    # plot yellow background for sum graph, then graph over it
-    ax_sum.plot(dates, incidences, label=label, color='yellow', linewidth=7, alpha=0.4)
-    lns0 = ax_sum.plot(dates, incidences, label=label, color=COLOR_INCID_SUMS)
-    # set axis properties
-    incidence_max_sum = max(cov_area.incidence_sums)
-    ax_sum.set_ylim(0, incidence_max_sum * PLOT_YLIM_ENLARGER_DAILYS)
-    # also yellow background for label
-    ## ax_sum.set_ylabel(label + "\n(shows incidence border under-/overshooting)", color=COLOR_INCID_SUMS,
-    ax_sum.set_ylabel(label, color=COLOR_INCID_SUMS, bbox=dict(color='yellow', alpha=0.3, boxstyle='round', mutation_aspect=0.5))
-    ax_sum.tick_params(axis='y', colors=COLOR_INCID_SUMS, size=8)
-
-    # adjust sum y axis visibilities
-    ax_sum.set_frame_on(True)
-    ax_sum.patch.set_visible(False)
-    for sp in ax_sum.spines.values():
-        sp.set_visible(False)
-    ax_sum.spines["right"].set_visible(True)
-
-    # calculate some good value for minor ticks
-    yticks = yloc2()
-    ydiff = yticks[1]
-    yminor = int(ydiff / 5 + 0.5) if ydiff >= 8 else 1
-    ax_sum.yaxis.set_minor_locator(mpl_MultipleLocator(yminor))
-
-    # plot incidence border lines
-    inc = cov_area.weeklyIncidenceLimit1Per100k
-    inc_plot_line = dataMangling.WEEKLY_INCIDENCE_LIMIT1_PER_100K
-    label = f"incid. border  {dataMangling.WEEKLY_INCIDENCE_LIMIT1_PER_100K:3}/week/100k pop.: {inc:,.2f}"
-    lns6_1 = ax_sum.plot([dates[0]] + [dates[-1]], [inc_plot_line, inc_plot_line], label=label, color=hsv2rgb(15, 50, 90), linestyle=(0, (2, 7)))
-
-    # plot second incidence border only if it is nearly reached, to have no unneeded large y1 numbers which would worsen the view
-    inc = cov_area.weeklyIncidenceLimit2Per100k
-    if incidence_max_sum > inc * 0.8:
-        inc_plot_line = dataMangling.WEEKLY_INCIDENCE_LIMIT2_PER_100K 
-        label = f"incid. border  {dataMangling.WEEKLY_INCIDENCE_LIMIT2_PER_100K:3}/week/100k pop.: {inc:,.2f}"
-        lns6_2 = ax_sum.plot([dates[0]] + [dates[-1]], [inc_plot_line, inc_plot_line], label=label, color=hsv2rgb(12, 55, 86), linestyle=(0, (3, 6)))
-
-    # plot 3rd incidence border only if it is nearly reached, to have no unneeded large y1 numbers which would worsen the view
-    inc = cov_area.weeklyIncidenceLimit3Per100k
-    if incidence_max_sum > inc * 0.8:
-        inc_plot_line = dataMangling.WEEKLY_INCIDENCE_LIMIT3_PER_100K 
-        label = f"incid. border {dataMangling.WEEKLY_INCIDENCE_LIMIT3_PER_100K:3}/week/100k pop.: {inc:,.2f}"
-        lns6_3 = ax_sum.plot([dates[0]] + [dates[-1]], [inc_plot_line, inc_plot_line], label=label, color=hsv2rgb(9, 60, 82), linestyle=(0, (4, 5)))
-
-    # plot 4th incidence border only if it is nearly reached, to have no unneeded large y1 numbers which would worsen the view
-    inc = cov_area.weeklyIncidenceLimit4Per100k
-    if incidence_max_sum > inc * 0.8:
-        inc_plot_line = dataMangling.WEEKLY_INCIDENCE_LIMIT4_PER_100K 
-        label = f"incid. border {dataMangling.WEEKLY_INCIDENCE_LIMIT4_PER_100K:3}/week/100k pop.: {inc:,.2f}"
-        lns6_4 = ax_sum.plot([dates[0]] + [dates[-1]], [inc_plot_line, inc_plot_line], label=label, color=hsv2rgb(6, 75, 78), linestyle=(0, (4, 3)))
-
-    # plot 5th incidence border only if it is nearly reached, to have no unneeded large y1 numbers which would worsen the view
-    inc = cov_area.weeklyIncidenceLimit5Per100k
-    if incidence_max_sum > inc * 0.8:
-        inc_plot_line = dataMangling.WEEKLY_INCIDENCE_LIMIT5_PER_100K 
-        label = f"incid. border {dataMangling.WEEKLY_INCIDENCE_LIMIT5_PER_100K:3}/week/100k pop.: {inc:,.2f}"
-        lns6_5 = ax_sum.plot([dates[0]] + [dates[-1]], [inc_plot_line, inc_plot_line], label=label, color=hsv2rgb(3, 85, 74), linestyle=(0, (6, 3)))
-
-    # plot 6th incidence border only if it is nearly reached, to have no unneeded large y1 numbers which would worsen the view
-    inc = cov_area.weeklyIncidenceLimit6Per100k
-    if incidence_max_sum > inc * 0.8:
-        inc_plot_line = dataMangling.WEEKLY_INCIDENCE_LIMIT6_PER_100K 
-        label = f"incid. border {dataMangling.WEEKLY_INCIDENCE_LIMIT6_PER_100K:3}/week/100k pop.: {inc:,.2f}"
-        lns6_6 = ax_sum.plot([dates[0]] + [dates[-1]], [inc_plot_line, inc_plot_line], label=label, color=hsv2rgb(0, 95, 70), linestyle=(0, (7, 1)))
-
-    ax_sum.set_ylim(0, max(incidence_max_value, inc_plot_line) * PLOT_YLIM_ENLARGER_DAILYS)
-
-
-    # set new ax limit for daily cases / averaging, trying to have evenly distributed major ticks for both y axes
-    #   in preparation (? still needed?) for equalize_axes_ticks()
-    ax.set_ylim(0, yloc()[-2])
-    ax_sum.set_ylim(0, yloc2()[-2])
-    yticks = yloc2()
-    ydiff = yticks[1]
-    yminor = int(ydiff / 5 + 0.5) if ydiff >= 8 else 1  # '+0.5' to round up for '8'
-    ax_sum.yaxis.set_minor_locator(mpl_MultipleLocator(yminor))
-
-    #
-    #  plot rolling averages for daily cases, over a week, if not a district
-    # if not isDistrict:
-    #     ax.plot(dates, cov_area.rolling_mean7, color='w', linewidth=7, alpha=0.1)  # plot white background for next line
-    #     lns6_1 = ax.plot(dates, cov_area.rolling_mean7, label="centered moving average, %s days cases" % 7, color='#900090', zorder=3)
-    #
-    #     ax.grid(True, which='major', axis='y', ls='-', alpha=0.9)  # if not set here above, ticks of left side y axis won't be visible
-    #     ax.grid(True, which='minor', axis='y', ls='--', alpha=0.7)
-    #
-    #     # determine some meaningfull y1 minor tick value, also used for setting center bar's y position
-    #     yticks = yloc()
-    #     ydiff = yticks[1]
-    #     yminor = int(ydiff / 5 + 0.5) if ydiff >= 8 else 1  # '+0.5' to round up for '8'
-    #     ax.yaxis.set_minor_locator(matplotlib.ticker.MultipleLocator(yminor))
-
-    #
-    # plot marker for temporal center date
-    # the '1.3'-multiplier below, for setting the y-position of the marker, is a none-deterministic evaluated value which lets the
-    #   triangle marker's bottom point be placed nearly at the x-axis, for all of the 16 Bundeslaender with their different case numbers
-    # if yminor <= 1:     print(f"***  {yminor=}")
-    marker_y = yminor * 1.3 if yminor > 1 else 0.8
-    center = cov_area.center
-    center_date = cov_area.center_date
-    # (first a dummy marker just for later showing in legend with smaller symbol, gets plotted over with 2nd one)
-    lns4_1 = ax_for_marker.plot(dates[int(round(center))], [marker_y], marker="v", color='green', markersize=8, label="marker for 'expectation day': " + center_date,
-                                linestyle="")
-    # (side note: if markersize here would be an odd number, the triangle would be skewed)
-    ax_for_marker.plot(dates[int(round(center))], [marker_y], marker="v", color='green', markersize=16, zorder=4)
-
-    #
-    # build legend
-    # collect lines which shall get a label in legend
-    lines = lns4_1 + lns5 + lns1 + lns3 + lns0 + lns6_6 + lns6_5 + lns6_4 + lns6_3 + lns6_2 + lns6_1
-    labs = [l.get_label() for l in lines]
-
-    # text for legend
-    text = "source data: ©RiskLayer up to " + ("%s" % max(dates))[:10]
-    text += " – plot:\n©DrAndreasKruger (+contrib.) " + ("%s" % datetime.datetime.now())[:16]
-    # text += "\ndaily: (GREEN) 'expectation day' = " + center_date
-
-    # plot legend on top axis, and title
-    ax_for_marker.legend(lines, labs, loc='upper left', facecolor="#fafafa", framealpha=0.7, title=text, prop={'size': 8}, title_fontsize=8)
-    plt.title(cov_area.title)
-
-    # set x axis major ticks to month starts
-    ax.xaxis.set_major_locator(matplotlib.dates.DayLocator(bymonthday=range(1, 32, 31)))  # if placing this setting above all other, major ticks won't appear
-    ax.xaxis.set_major_formatter(matplotlib.dates.DateFormatter("%m/%Y"))  # its date formatter must be set, if setting major locator
-
-    # set below here as else will not work for districts if setting above with rest of ax_cumu stuff
-    ax_cumu.tick_params(axis='y', colors=lns5[0].get_color(), labelrotation=lrotation, length=8)
-    ax.tick_params(axis='y', labelrotation=-lrotation, length=8)
-
-    # print(title)
-    # if isDistrict:
-    equalize_axes_ticks(base_ax=ax_sum, adjust_axs=[ax, ax_cumu])
-    # else:
-    #     equalize_axes_ticks(base_ax=ax, adjust_axs=[ax_cumu])
-
-    if cov_area.filename:
-        fig.savefig(os.path.join(dataFiles.PICS_PATH, cov_area.filename), bbox_inches='tight')
+        # plot background gradient, indicating relative prevalence
+        if self.gradient is not None:
+            self.gradient.remove()
+            self.gradient = None
+        if not "Deutschland" in cov_area.name:
+            # backgroud gradient indicating local max prevalence values compared with global
+            mid = self.date_axis.date_numbers[int(len(dates) / 2)]  # get middle point of the dates as plot start point
+            # create some artificially plotting points, at the x-middle point of the dates, from zero up the y-axis' maximum
+            points = np.array([[mid] * len(dates), np.linspace(0, cov_area.total * PLOT_YLIM_ENLARGER_DAILYS, len(dates))]).T.reshape(-1, 1, 2)
+            segments = np.concatenate([points[:-1], points[1:]], axis=1) # create lines from neighbour to neighbour of elements in 'points'
+            # set proportion for colors, matching plot item's own 100k prevalence
+            proportion = np.linspace(0, cov_area.prevalence_100k * PLOT_YLIM_ENLARGER_DAILYS, len(dates))
+            # set norm to match global max, shooting the colors over the plot item's max, if it is not the global prevalence max itself
+            #   this norm together with the max of 'proportion' is basically the core, to indicate the relative prevalence
+            norm = plt.Normalize(0, cov_area.max_overall_prevalence_100k)
+            cmap = 'YlOrRd' if isDistrict else 'Reds'
+            lc = LineCollection(segments, cmap=cmap, norm=norm, alpha=0.4)
+            lc.set_array(proportion)
+            lc.set_linewidth(6 * self.fig.dpi) # plot with enough width to fill the background horizontally
+            self.gradient = ax_bg.add_collection(lc)
+
+        #
+        # raw daily cases, with the last days in red
+        lines["daily_bg"].set_visible(not isDistrict)
+        lines["daily_bg"].set_ydata(daily)
+        lines["daily"].set_ydata(daily)
+        lines["daily_red"].set_ydata(daily[-RED_DAYS:])
+
+        # set y1 axis tick automatic interval and range restrictions, allow no 'half daily cases' (no floating point numbers)
+        yloc = mpl_MaxNLocator(integer=True)
+        ax.yaxis.set_major_locator(yloc)
+        ax.set_ylim(0, max(daily[1:]) * PLOT_YLIM_ENLARGER_DAILYS)
+
+        #
+        # cumulative cases data for the 2nd y axis
+        lines["cumulative_bg"].set_ydata(cumulative)
+        lines["cumulative"].set_ydata(cumulative)
+        ax_cumu.yaxis.set_major_locator(mpl_AutoLocator()) # `equalize_axes_ticks()` had fixed the ticks of the previous area
+        ax_cumu.set_ylim(0, max(cumulative) * PLOT_YLIM_ENLARGER_CUMU)
+
+        #
+        # rolling average, filled area with zorder above white background
+        lines["rolling_bg"].set_ydata(rolling_mean14)
+        lines["rolling"].set_ydata(rolling_mean14)
+        if self.fill is not None:
+            self.fill.remove()
+        self.fill = ax.fill_between(dates, rolling_mean14[0], [0] * len(dates), label="centered moving average, %s days cases" % 14,
+                                    color=lines["rolling"].get_color(), linewidth=0, zorder=1)
+
+        #
+        # 7 day sums, as incidences
+        yloc2 = mpl_MaxNLocator(integer=True)
+        ax_sum.yaxis.set_major_locator(yloc2)
+        incidences = np.array(cov_area.incidence_values)
+        incidence_max_value = max(incidences)
+        lines["incidences_bg"].set_ydata(incidences)
+        lines["incidences"].set_ydata(incidences)
+
+        # incidence borders, see `shown_incidence_borders()`
+        shown, shown_borders = shown_incidence_borders(cov_area), []
+        for number, (border, inc_line) in enumerate(zip(self.borders, dataMangling.WEEKLY_INCIDENCE_LIMITS_PER_100K), start=1):
+            inc = cov_area.weeklyIncidenceLimit(number)
+            border.set_visible(number in shown)
+            if border.get_visible():
+                inc_plot_line = inc_line
+                border.set_ydata([inc_plot_line, inc_plot_line])
+                border.set_label(f"incid. border{' ' if inc_line >= 100 else '  '}{inc_line:3}/week/100k pop.: {inc:,.2f}")
+                shown_borders.insert(0, border)
+
+        ax_sum.set_ylim(0, max(incidence_max_value, inc_plot_line) * PLOT_YLIM_ENLARGER_DAILYS)
+
+        # set new ax limit for daily cases / averaging, trying to have evenly distributed major ticks for both y axes
+        #   in preparation (? still needed?) for equalize_axes_ticks()
+        ax.set_ylim(0, yloc()[-2])
+        ax_sum.set_ylim(0, yloc2()[-2])
+        # calculate some good value for minor ticks
+        yticks = yloc2()
+        ydiff = yticks[1]
+        yminor = int(ydiff / 5 + 0.5) if ydiff >= 8 else 1  # '+0.5' to round up for '8'
+        ax_sum.yaxis.set_minor_locator(mpl_MultipleLocator(yminor))
+
+        #
+        # marker for temporal center date
+        # the '1.3'-multiplier below, for setting the y-position of the marker, is a none-deterministic evaluated value which lets the
+        #   triangle marker's bottom point be placed nearly at the x-axis, for all of the 16 Bundeslaender with their different case numbers
+        marker_y = yminor * 1.3 if yminor > 1 else 0.8
+        center = int(round(cov_area.center))
+        for marker in (lines["marker_legend"], lines["marker"]):
+            marker.set_data(dates[center:center + 1], [marker_y])
+        lines["marker_legend"].set_label("marker for 'expectation day': " + cov_area.center_date)
+
+        #
+        # build legend
+        # collect lines which shall get a label in legend
+        legend_lines = [lines["marker_legend"], lines["cumulative"], lines["daily"], lines["rolling"], lines["incidences"]] + shown_borders
+        labs = [l.get_label() for l in legend_lines]
+
+        # text for legend
+        text = "source data: ©RiskLayer up to " + ("%s" % max(self.date_axis.datetimes))[:10]
+        text += " – plot:\n©DrAndreasKruger (+contrib.) " + ("%s" % datetime.datetime.now())[:16]
+
+        # plot legend on top axis (which replaces the previous area's legend), and title
+        ax_sum.legend(legend_lines, labs, loc='upper left', facecolor="#fafafa", framealpha=0.7, title=text, prop={'size': 8}, title_fontsize=8)
+        ax_sum.set_title(cov_area.title)
+
+        equalize_axes_ticks(base_ax=ax_sum, adjust_axs=[ax, ax_cumu])
+
+        if cov_area.filename:
+            self.fig.savefig(os.path.join(dataFiles.PICS_PATH, cov_area.filename), bbox_inches='tight')
+
+
+figure_template_cache: Union[FigureTemplate, None] = None
+"""the `FigureTemplate` of this process, see `figure_template()`"""
+
+def figure_template(dm: dataMangling.DataMangled) -> FigureTemplate:
+    """the figure of this process, built once and then reused for each plot, as long as the dates stay the same"""
+    global figure_template_cache
+    if figure_template_cache is None or figure_template_cache.date_axis is not dm.date_axis:
+        figure_template_cache = FigureTemplate(dm)
+    return figure_template_cache
+
+
+def plot_timeseries(dm: dataMangling.DataMangled, cov_area: dataMangling.CovidDataArea, ifShow=True, ifCleanup=True):
+    """
+    Creates the image with the different statistic graph plots for the covid-19 cases of a country, Bundesland or Kreis
+
+    In batch mode (not `ifShow`, and `ifCleanup`) the figure of this process gets reused, see `figure_template()`,
+    otherwise a new pyplot figure gets built.
+    """
+    if ifShow or not ifCleanup:
+        template = FigureTemplate(dm, fig=plt.figure(figsize=(10, 6)))
+    else:
+        template = figure_template(dm)
+    template.render(cov_area)
 
     if ifShow:
         if plt.get_backend() in  matplotlib.rcsetup.interactive_bk:# ['qt5agg', 'tkagg']:
@@ -436,11 +424,105 @@ def plot_timeseries(dm: dataMangling.DataMangled, cov_area: dataMangling.CovidDa
             plt.tight_layout()
         plt.show()
 
-    if ifCleanup:
-        plt.clf()
-        plt.close("all")
+    if ifCleanup and template is not figure_template_cache:
+        plt.close(template.fig)
+
+    return plt, template.fig, template.ax, template.ax_cumu # TODO: do we need to return?
+
+
+class PlotRecord(NamedTuple):
+    """what plotting one area reports back, see `plot_area()`"""
+    title: str
+    filename: str
+    seconds: float
+    """wall time of `plot_timeseries()` for the area"""
+    skipped: bool = False
+    """True if the PNG was left as it was, because the area did not change, see `plot_skipping_unchanged()`"""
+
+
+def plot_area(dm: dataMangling.DataMangled, cov_area: dataMangling.CovidDataArea, ifShow=False, ifCleanup=True) -> PlotRecord:
+    """plots one area with `plot_timeseries()`, and times that"""
+    started = time.perf_counter()
+    plot_timeseries(dm, cov_area, ifShow=ifShow, ifCleanup=ifCleanup)
+    return PlotRecord(cov_area.title, cov_area.filename, time.perf_counter() - started)
+
+
+PLOTS_MANIFEST = "plots_manifest.json"
+"""filename (in `dataFiles.PICS_PATH`) of the fingerprints of the PNGs there, see `plot_skipping_unchanged()`"""
+
+
+def plotting_code_key(dm: dataMangling.DataMangled) -> str:
+    """hash over this plotting code, the library which draws, and the dates axis, which all plots have in common"""
+    parts = [dataFiles.hash_file(__file__), matplotlib.__version__, np.__version__] + list(dm.date_axis.labels)
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+def plot_fingerprint(code_key: str, cov_area: dataMangling.CovidDataArea) -> str:
+    """
+    hash over everything which `FigureTemplate.render()` draws of `cov_area`, plus the `plotting_code_key()`:
+    if it is the same as for the PNG on disk, plotting the area again would make the same image (apart from the plot timestamp).
+    """
+    hasher = hashlib.sha256(code_key.encode())
+    texts = [type(cov_area).__name__, cov_area.name, cov_area.title, cov_area.filename, cov_area.center_date]
+    numbers = [cov_area.center, cov_area.total, cov_area.prevalence_100k, cov_area.max_overall_prevalence_100k]
+    numbers += [cov_area.weeklyIncidenceLimit(number) for number in range(1, len(dataMangling.WEEKLY_INCIDENCE_LIMITS_PER_100K) + 1)]
+    hasher.update("|".join(texts + [repr(float(number)) for number in numbers]).encode())
+    for series in (cov_area.cumulative, cov_area.daily, cov_area.rolling_mean14, cov_area.incidence_sums, cov_area.incidence_values):
+        hasher.update(np.ascontiguousarray(series, dtype=np.float64).tobytes())
+    return hasher.hexdigest()
+
+
+def load_plot_manifest() -> Dict[str, Dict]:
+    """PNG filename --> {"fingerprint": `plot_fingerprint()`, "size": of the PNG, "seconds": it took}; empty if there is none yet"""
+    try:
+        with open(os.path.join(dataFiles.PICS_PATH, PLOTS_MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return dict()
+
+
+def store_plot_manifest(manifest: Dict[str, Dict]):
+    """writes the manifest atomically, so that an interrupted run cannot leave half of it behind"""
+    filename = os.path.join(dataFiles.PICS_PATH, PLOTS_MANIFEST)
+    with open(filename + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=0, sort_keys=True)
+    os.replace(filename + ".tmp", filename)
+
+
+def png_matches(manifest: Dict[str, Dict], filename: str, fingerprint: str) -> bool:
+    """True if the PNG `filename` exists, and is the one which the manifest recorded for `fingerprint`"""
+    entry = manifest.get(filename)
+    if entry is None or entry.get("fingerprint") != fingerprint:
+        return False
+    try:
+        return os.path.getsize(os.path.join(dataFiles.PICS_PATH, filename)) == entry.get("size")
+    except OSError:
+        return False
 
-    return plt, fig, ax, ax_cumu # TODO: do we need to return?
+
+def plot_skipping_unchanged(dm: dataMangling.DataMangled, cov_areas: List[dataMangling.CovidDataArea], plot) -> List[PlotRecord]:
+    """
+    calls `plot(areas)` (which must return the `PlotRecord`s) only for those of the `cov_areas` whose PNG on disk
+    does not match their `plot_fingerprint()`, and records the fingerprints of the new PNGs in the manifest.
+    The unchanged areas only cost their hash, they come back as skipped `PlotRecord`s.
+    """
+    manifest = load_plot_manifest()
+    code_key = plotting_code_key(dm)
+    fingerprints = {cov_area.filename: plot_fingerprint(code_key, cov_area) for cov_area in cov_areas}
+    changed, skipped = [], []
+    for cov_area in cov_areas:
+        if png_matches(manifest, cov_area.filename, fingerprints[cov_area.filename]):
+            skipped.append(PlotRecord(cov_area.title, cov_area.filename, 0.0, True))
+        else:
+            changed.append(cov_area)
+    print ("%d plots unchanged (same fingerprint as their PNG), not plotting those again" % len(skipped))
+
+    done = plot(changed) if changed else []
+    for record in done:
+        manifest[record.filename] = {"fingerprint": fingerprints[record.filename], "seconds": round(record.seconds, 3),
+                                     "size": os.path.getsize(os.path.join(dataFiles.PICS_PATH, record.filename))}
+    store_plot_manifest(manifest)
+    return done + skipped
 
 
 def test_plot_Kreis(dm):
@@ -452,12 +534,11 @@ def test_plot_Kreis(dm):
 
     plot_Kreise(dm, [AGS], ifPrint=False, ifShow=True, ifCleanup=False)
 
-def plot_Kreise(dm, Kreise_AGS, ifPrint=True, ifShow=False, ifCleanup=True):
+def plot_Kreise(dm, Kreise_AGS, ifPrint=True, ifShow=False, ifCleanup=True) -> List[PlotRecord]:
     done = []
     for AGS in Kreise_AGS:
         dstr = dataMangling.get_Kreis(AGS)
-        plot_timeseries(dm, dstr, ifShow=ifShow, ifCleanup=ifCleanup)
-        done.append((dstr.title, dstr.filename))
+        done.append(plot_area(dm, dstr, ifShow=ifShow, ifCleanup=ifCleanup))
         if ifPrint:
             print (dstr.title, dstr.filename)
         else:
@@ -469,60 +550,228 @@ def plot_Kreise(dm, Kreise_AGS, ifPrint=True, ifShow=False, ifCleanup=True):
     return done
 
 
-def plot_Kreise_parallel(dm, Kreise_AGS, ifPrint=True):
-    import multiprocessing as mp
+plot_worker_print = True
+"""`ifPrint` of a plotting worker process, see `plot_worker_init()`"""
 
-    # one CPU should be left free for the system, and multiprocessing makes only sense for at least 2 free CPUs,
-    # so just call the non-parallel version if not enough CPUs are in the system
-    available_cpus = mp.cpu_count()
-    leave_alone_cpus = 1
-    wanted_cpus = available_cpus - leave_alone_cpus
+def plot_worker_init(dm: Union[dataMangling.DataMangled, None], ifPrint=True):
+    """
+    initializer of each plotting worker process, run once when the worker starts.
+    With the 'fork' start method, `dm` is None: the worker has inherited the whole dataset in `dataMangling.mangledData`,
+    including its warm `District` and `FedState` caches, copy-on-write from the parent, so nothing of it gets pickled.
+    Other start methods get `dm` pickled once per worker, not once per task.
+    """
+    global plot_worker_print
+    if dm is not None:
+        dataMangling.mangledData = dm
+    plot_worker_print = ifPrint
+
+
+def area_key(cov_area: dataMangling.CovidDataArea) -> Union[int, str]:
+    """what goes over the pipe to a plotting worker for an area: the AGS (as int) of a district, the name of a federal state"""
+    return dataMangling.AGS_key(cov_area.AGS) if type(cov_area) == dataMangling.District else cov_area.name
 
-    if available_cpus < wanted_cpus or wanted_cpus < 2:
-        return plot_Kreise(dm, Kreise_AGS, ifPrint=ifPrint)
 
+def area_of_key(dm: dataMangling.DataMangled, key: Union[int, str]) -> dataMangling.CovidDataArea:
+    """the area for an `area_key()`, out of the caches of `dm` (a plotting worker has made `dm` its `dataMangling.mangledData`)"""
+    if isinstance(key, str):
+        return dm.feds.get(key) or dataMangling.get_BuLa(dm.Bundeslaender_sorted, key, dm.datacolumns)
+    return dm.districts.get(key) or dataMangling.get_Kreis(key)
+
+
+def plot_chunk(keys: List[Union[int, str]]) -> List[PlotRecord]:
+    """the task of a plotting worker: only a few `area_key()`s go over the pipe, the dataset is there already, see `plot_worker_init()`"""
+    dm = dataMangling.mangledData
     done = []
+    for key in keys:
+        done.append(plot_area(dm, area_of_key(dm, key)))
+        if plot_worker_print:
+            print (done[-1].title, done[-1].filename)
+    return done
 
-    # setup process pool
-    pool = mp.Pool(wanted_cpus)
+
+def plotting_pool(dm: dataMangling.DataMangled, processes: int, ifPrint=True):
+    """
+    a pool of plotting worker processes, which stay alive for all their tasks (so each builds its `figure_template()` once),
+    with the dataset given once per worker, see `plot_worker_init()`
+    """
+    import multiprocessing as mp
+    inherited = mp.get_start_method() == "fork" and dm is dataMangling.mangledData
+    return mp.Pool(processes, initializer=plot_worker_init, initargs=(None if inherited else dm, ifPrint))
+
+
+def available_cpus() -> int:
+    """the number of cores this process may run on"""
     try:
-        done = pool.starmap(plot_Kreise, [(dm, [AGS], ifPrint) for AGS in Kreise_AGS])
-    except KeyboardInterrupt:
-        # without catching this here we will never be able to manually stop running in a sane way
-        pool.terminate()
-    finally:
-        pool.close()
-        pool.join()
+        return len(os.sched_getaffinity(0))
+    except AttributeError: # not on all platforms
+        return os.cpu_count() or 1
+
 
+PLOT_SECONDS_GUESS = {"FedState": 1.0, "District": 0.8}
+"""seconds per plot, by type of area, for the areas which have no timing from an earlier run yet, see `estimated_seconds()`"""
+
+STRAGGLER_FACTOR = 2.0
+"""plots which take longer than this times the median get reported, see `report_stragglers()`"""
+
+def estimated_seconds(manifest: Dict[str, Dict], cov_area: dataMangling.CovidDataArea) -> float:
+    """how long plotting `cov_area` will take: as long as last time, according to the manifest, see `plot_skipping_unchanged()`"""
+    entry = manifest.get(cov_area.filename) or dict()
+    return entry.get("seconds", PLOT_SECONDS_GUESS.get(type(cov_area).__name__, 1.0))
+
+
+def report_stragglers(done: List[PlotRecord], wall_seconds: float, processes: int, n=5):
+    """prints the total time, and the slowest plots, if they took much longer than the median one"""
+    seconds = sorted(record.seconds for record in done)
+    median = seconds[len(seconds) // 2]
+    print ("%d plots in %.1f s, with %d processes, %.2f s per plot on average (median %.2f s), ideal would be %.1f s" % (
+           len(done), wall_seconds, processes, sum(seconds) / len(done), median, sum(seconds) / processes))
+    stragglers = sorted((record for record in done if record.seconds > STRAGGLER_FACTOR * median), key=lambda record: -record.seconds)
+    if stragglers:
+        print ("stragglers: " + ", ".join("%s %.2f s" % (record.filename, record.seconds) for record in stragglers[:n]))
+
+
+def plot_areas_parallel(dm: dataMangling.DataMangled, cov_areas: List[dataMangling.CovidDataArea], ifPrint=True, chunksize=2, processes=None) -> List[PlotRecord]:
+    """
+    the plot scheduler: all `cov_areas` go into one work queue, longest first (see `estimated_seconds()`), which all
+    `processes` (default: all available cores) of a `plotting_pool()` work off in chunks of `chunksize`; so the few expensive
+    plots start at once, and the many short ones fill the gaps at the end.
+    The `PlotRecord`s come back in the order of `cov_areas`; the slowest ones get reported, see `report_stragglers()`.
+    """
+    processes = processes or available_cpus()
+    manifest = load_plot_manifest()
+    queue = sorted(cov_areas, key=lambda cov_area: -estimated_seconds(manifest, cov_area))
+    keys = [area_key(cov_area) for cov_area in queue]
+    chunks = [keys[i:i + chunksize] for i in range(0, len(keys), chunksize)]
+
+    started = time.perf_counter()
+    done = []
+    if processes < 2: # nothing to gain from a pool with a single worker; plots the given areas of `dm`, whether that is the global one or not
+        for cov_area in queue:
+            done.append(plot_area(dm, cov_area))
+            if ifPrint:
+                print (done[-1].title, done[-1].filename)
+    else:
+        pool = plotting_pool(dm, processes, ifPrint=ifPrint)
+        try:
+            for records in pool.imap_unordered(plot_chunk, chunks):
+                done.extend(records)
+        except KeyboardInterrupt:
+            # without catching this here we will never be able to manually stop running in a sane way
+            pool.terminate()
+        finally:
+            pool.close()
+            pool.join()
+
+    if done:
+        report_stragglers(done, time.perf_counter() - started, processes)
+    order = {cov_area.filename: i for i, cov_area in enumerate(cov_areas)}
+    return sorted(done, key=lambda record: order[record.filename])
+
+
+def plot_Kreise_parallel(dm, Kreise_AGS, ifPrint=True, skipUnchanged=False) -> List[PlotRecord]:
+    """
+    like `plot_Kreise()`, but through the scheduler, see `plot_areas_parallel()`.
+    With `skipUnchanged`, only the districts which changed get plotted, the skipped ones come last, see `plot_skipping_unchanged()`.
+    """
+    districts = [dataMangling.get_Kreis(AGS) for AGS in Kreise_AGS]
+    plot = lambda changed: plot_areas_parallel(dm, changed, ifPrint=ifPrint)
+    return plot_skipping_unchanged(dm, districts, plot) if skipUnchanged else plot(districts)
+
+
+def all_areas(dm: dataMangling.DataMangled) -> List[dataMangling.CovidDataArea]:
+    """the federal states, Germany, and all districts"""
+    cov_areas = [dataMangling.get_BuLa(dm.Bundeslaender_sorted, BL, dm.datacolumns) for BL in dm.state_names + ["Deutschland"]]
+    return cov_areas + [dataMangling.get_Kreis(AGS) for AGS in dm.AGS_row]
+
+
+def plot_all(dm: dataMangling.DataMangled, ifPrint=True, skipUnchanged=False) -> List[PlotRecord]:
+    """
+    all plots in one go: the federal states, Germany, and all districts, scheduled together, see `plot_areas_parallel()`.
+    With `skipUnchanged`, only the areas which changed get plotted, see `plot_skipping_unchanged()`.
+    """
+    cov_areas = all_areas(dm)
+    plot = lambda changed: plot_areas_parallel(dm, changed, ifPrint=ifPrint)
+    return plot_skipping_unchanged(dm, cov_areas, plot) if skipUnchanged else plot(cov_areas)
+
+
+CHARTS_FOLDER = "charts"
+"""subfolder of `dataFiles.PICS_PATH` with the data of the client side chart mode, see `write_all_chart_data()`"""
+
+def chart_filename(png_filename: str) -> str:
+    """the chart data file (relative to `dataFiles.PICS_PATH`) of the area whose plot is `png_filename`"""
+    return CHARTS_FOLDER + "/" + png_filename.replace(".png", ".json")
+
+
+def rounded(values, digits=1) -> List[Union[float, None]]:
+    """floats rounded for a compact JSON, NaN as null"""
+    return [None if np.isnan(value) else round(float(value), digits) for value in np.asarray(values, dtype=np.float64).ravel()]
+
+
+def chart_data(dm: dataMangling.DataMangled, cov_area: dataMangling.CovidDataArea) -> Dict:
+    """what `pages/charts.js` needs for drawing the plot of `cov_area` in the browser, like `FigureTemplate.render()` draws the PNG"""
+    dates = dm.date_axis.datetime64
+    data = {"title": cov_area.title, "district": type(cov_area) == dataMangling.District, "gradient": not "Deutschland" in cov_area.name,
+            "start": str(dates[0])[:10],
+            "cumulative": cov_area.cumulative, "daily": cov_area.daily,
+            "rolling_mean14": rounded(cov_area.rolling_mean14), "incidence": rounded(cov_area.incidence_values),
+            "center": round(float(cov_area.center), 2), "center_date": cov_area.center_date,
+            "limits": [[number, dataMangling.WEEKLY_INCIDENCE_LIMITS_PER_100K[number - 1], round(float(cov_area.weeklyIncidenceLimit(number)), 2)]
+                       for number in shown_incidence_borders(cov_area)],
+            "prevalence_100k": round(cov_area.prevalence_100k, 2), "max_overall_prevalence_100k": round(cov_area.max_overall_prevalence_100k, 2),
+            "source_up_to": ("%s" % max(dm.date_axis.datetimes))[:10], "generated": ("%s" % datetime.datetime.now())[:16]}
+    if not np.all(np.diff(dates) == np.timedelta64(1, "D")): # gaps, so the days cannot simply be counted from "start"
+        data["dates"] = [str(date)[:10] for date in dates]
+    return data
+
+
+def write_chart_data(dm: dataMangling.DataMangled, cov_area: dataMangling.CovidDataArea) -> PlotRecord:
+    """the chart data of `cov_area` into its `chart_filename()`, as compact JSON"""
+    started = time.perf_counter()
+    filename = chart_filename(cov_area.filename)
+    with open(os.path.join(dataFiles.PICS_PATH, filename), "w") as f:
+        json.dump(chart_data(dm, cov_area), f, separators=(",", ":"))
+    return PlotRecord(cov_area.title, filename, time.perf_counter() - started)
+
+
+def write_all_chart_data(dm: dataMangling.DataMangled) -> List[PlotRecord]:
+    """
+    the client side chart mode: instead of all the PNGs, only one small JSON per area (see `chart_data()`),
+    from which the pages draw their charts with `pages/charts.js`, see `dataPages.plot_HTML()`
+    """
+    os.makedirs(os.path.join(dataFiles.PICS_PATH, CHARTS_FOLDER), exist_ok=True)
+    started = time.perf_counter()
+    done = [write_chart_data(dm, cov_area) for cov_area in all_areas(dm)]
+    size = sum(os.path.getsize(os.path.join(dataFiles.PICS_PATH, record.filename)) for record in done)
+    print ("%d chart data files, %.1f kB, written in %.1f s" % (len(done), size / 1000, time.perf_counter() - started))
     return done
 
 
 def test_plot_Bundesland(dm, Bundesland="Bayern", ifShow=True):
     ## Bundesland
     # Bundesland = "Dummyland"
-    ts_BuLa, _, _, Bundeslaender, _, _ = dataMangling.additionalColumns(dm.ts, dm.bnn)
-    fed = dataMangling.get_BuLa(Bundeslaender, Bundesland, dm.datacolumns)
+    fed = dataMangling.get_BuLa(dm.Bundeslaender_sorted, Bundesland, dm.datacolumns)
     plot_timeseries(dm, fed, ifShow=ifShow)
 
 
-def plot_all_Bundeslaender(dm: dataMangling.DataMangled, ifPrint=True):
-    ts_BuLa, _, _, Bundeslaender, _, _ = dataMangling.additionalColumns(dm.ts, dm.bnn)
-    filenames, population = [], 0
-    done = []
+def plot_all_Bundeslaender(dm: dataMangling.DataMangled, ifPrint=True, skipUnchanged=False) -> List[PlotRecord]:
+    """with `skipUnchanged`, the PNGs of the unchanged federal states are kept, see `plot_skipping_unchanged()`"""
 
-    BL = Bundeslaender.drop(labels=['Deutschland'])
+    # the federal states, and Germany, straight out of the aggregation cached in `dm`
+    feds = [dataMangling.get_BuLa(dm.Bundeslaender_sorted, BL, dm.datacolumns) for BL in dm.state_names + ["Deutschland"]]
 
-    for BL in Bundeslaender.index.tolist():
-        print (BL, end=" ")
-        fed = dataMangling.get_BuLa(Bundeslaender, BL, dm.datacolumns)
-        plot_timeseries(dm, fed, ifShow=False)
-        filenames.append(fed.filename)
-        population += fed.population
-        if ifPrint:
-            print (fed.title, fed.filename)
-        done.append((fed.title, fed.filename))
-    print ("\nTotal population covered:", population)
-    if ifPrint:    
+    def plot_feds(feds):
+        done = []
+        for fed in feds:
+            print (fed.name, end=" ")
+            done.append(plot_area(dm, fed))
+            if ifPrint:
+                print (fed.title, fed.filename)
+        return done
+
+    done = plot_skipping_unchanged(dm, feds, plot_feds) if skipUnchanged else plot_feds(feds)
+    print ("\nTotal population covered:", sum(fed.population for fed in feds))
+    if ifPrint:
+        filenames = [record.filename for record in done if not record.skipped]
         print ("%d filenames written: %s" % (len(filenames), filenames))
     return done
 
@@ -541,6 +790,6 @@ if __name__ == '__main__':
 
     longrunner=False
     if longrunner:
-        plot_Kreise(dm, dm.ts["AGS"].tolist())
+        plot_Kreise(dm, list(dm.AGS_row))
         plot_all_Bundeslaender(dm)
         
@@ -25,14 +25,18 @@ import dataFiles, dataMangling, districtDistances
 from dataMangling import bulaLink
 
 
-def toHTMLRow(frame, row_index, datacolumns, cmap, labels, rolling_window_size=7):
-    row = frame[datacolumns].loc[row_index].astype('int')
+def toHTMLRow(cumulative, cmap, labels, rolling_window_size=7):
+    """
+    one HTML table row, for the given labels plus the cumulative cases (newest first), colored by the smoothed daily increase.
+    `cumulative` is the row of cumulative cases, e.g. a slice out of `DataMangled.cases`.
+    """
+    row = pandas.Series(cumulative).astype('int')
     # return row
 
     window=rolling_window_size
     rolling_mean_cum = row.rolling(window=window, center=True).mean()
 
-    diff_rolling_mean = pandas.DataFrame(rolling_mean_cum).diff(axis=0).clip(lower=0)[row_index].tolist()
+    diff_rolling_mean = rolling_mean_cum.diff().clip(lower=0).tolist()
     diffmax = numpy.nanmax(diff_rolling_mean)
     
     row = row.iloc[::-1]
@@ -124,8 +128,7 @@ def Districts_to_HTML_table(dm, district_AGSs, cmap, filename="kreise_Germany.ht
     page += '<caption id="caption_kreise" style="text-align:left;">%s</caption>\n' % caption
     page +="<tr>"
 
-    dc_head = dm.datacolumns.tolist()
-    dc_head.reverse()
+    dc_head = dm.date_axis.labels_reversed
 
     colcount=len(dm.datacolumns)
     # print (datacolumns, colcount); exit()
@@ -179,7 +182,7 @@ def Districts_to_HTML_table(dm, district_AGSs, cmap, filename="kreise_Germany.ht
         labels += [bulaLink(dstr.fed_states_name)]
         labels += [flag_image(dstr.fed_states_name, dstr.fed_states__population)]
         # labels += [nearby_links]
-        page += toHTMLRow(dm.ts_sorted, int(AGS), dm.datacolumns, cmap, labels, rolling_window_size=rolling_window_size) + "\n"
+        page += toHTMLRow(dm.cases[dstr.row], cmap, labels, rolling_window_size=rolling_window_size) + "\n"
         
     page += "</table>"
     if divEnveloped:
@@ -199,7 +202,7 @@ def BuLas_to_HTML_table(dm: dataMangling.DataMangled, cmap, table_filename="bund
 
     # total_max_cum, digits = maxdata(ts_sorted)
     Bundeslaender= dm.Bundeslaender_sorted
-    BL_names = Bundeslaender.index.tolist()
+    BL_names = dm.ranked_states("centerday")
 
     tid="table_bundeslaender"
     page = header
@@ -210,8 +213,7 @@ def BuLas_to_HTML_table(dm: dataMangling.DataMangled, cmap, table_filename="bund
     page += '<caption style="text-align:left;">%s</caption>' % caption
     page +="<tr>"
 
-    dc_head = dm.datacolumns.tolist()
-    dc_head.reverse()
+    dc_head = dm.date_axis.labels_reversed
 
     cols = [
         "Fed. state flag",
@@ -248,7 +250,7 @@ def BuLas_to_HTML_table(dm: dataMangling.DataMangled, cmap, table_filename="bund
         labels += ['{:,}'.format(fed.population)]
         labels += ["%.2f" % fed.center]
         labels += ["%.2f" % fed.reff_4_7]
-        page += toHTMLRow(Bundeslaender, name_BL, dm.datacolumns, cmap, labels, rolling_window_size=rolling_window_size) + "\n"
+        page += toHTMLRow(Bundeslaender.loc[name_BL, dm.datacolumns].values, cmap, labels, rolling_window_size=rolling_window_size) + "\n"
         
     page += "</table>"
     if divEnveloped:
@@ -320,10 +322,10 @@ if __name__ == '__main__':
 
     cmap = colormap()  
     
-    print ( toHTMLRow(dm.ts_sorted, AGS, dm.datacolumns, cmap, labels=["%s" % AGS]) )
+    print ( toHTMLRow(dm.cases[dm.AGS_row[AGS]], cmap, labels=["%s" % AGS]) )
 
     district_AGSs = [1001, 1002, 5370, 9377]
-    district_AGSs = dm.ts_sorted.index.tolist()
+    district_AGSs = dm.ranked_AGSs("centerday")
     
     distances = districtDistances.load_distances()
     print (Districts_to_HTML_table(dm, district_AGSs, cmap, divEnveloped=False)[0])
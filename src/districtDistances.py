@@ -149,20 +149,23 @@ def make_distances_table(AGS_to_geopoint, all_AGS, filename=DISTANCES_PATH):
     return distances, filename
 
 def load_distances(filename = DISTANCES_PATH):
-    distances = pandas.read_csv(filename)
+    distances = pandas.read_csv(filename, dtype={"AGS1": "int64", "AGS2": "int64"}) # the canonical AGS key, see dataMangling.AGS_key()
     return distances
 
 def number_of_pairs_max_dist(distances, km):
     return len( distances[(distances.km<=km)] ) / 2
 
 def nearby(distances, AGS, km):
-    return distances[(distances.km<=km) & (distances.AGS1==AGS)]
+    return distances[(distances.km<=km) & (distances.AGS1==dataMangling.AGS_key(AGS))]
     
 def kreis_link(bnn, AGS: str):
     nameAndType = dataMangling.AGS_to_name_and_type(bnn, AGS)
     name_BL, inf_BL, pop_BL = dataMangling.AGS_to_Bundesland(bnn, AGS)
-    AGS_5digits = ("00000%s" % AGS) [-5:]
-    filename = "%s.html#AGS%s" % (name_BL, AGS_5digits)
+    return kreis_link_to(name_BL, AGS, nameAndType)
+
+def kreis_link_to(name_BL, AGS, nameAndType):
+    """like `kreis_link()`, but with the Bundesland name and the district's 'name_type' already known"""
+    filename = "%s.html#AGS%s" % (name_BL, dataMangling.AGS_5digits(AGS))
     link='<a id="{nameAndType}" title="{nameAndType}" href="{filename}">{nameAndType}</a>'.format(nameAndType=nameAndType, filename=filename) # also give it an id, so sorting alphabetically works even though the filename starts with bundesland
     return filename, nameAndType, link
 